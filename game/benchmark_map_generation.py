@@ -0,0 +1,47 @@
+import sys
+import os
+import time
+
+# Add the game directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from dark_fantasy_game.src.terrain_generator import TerrainGenerator
+
+SIZES = [(800, 800), (2000, 2000), (4000, 4000)]
+SEED = 12345
+REPEATS = 3
+CHUNK_SIZE = 64
+CHUNK_COUNT = 200
+
+def benchmark(width, height):
+    """Return the best generation time for a map of the given size"""
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        TerrainGenerator(SEED).generate(width, height)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def benchmark_chunks():
+    """Return the average time to generate one streamed chunk"""
+    generator = TerrainGenerator(SEED)
+    start = time.perf_counter()
+    for i in range(CHUNK_COUNT):
+        generator.generate_chunk(i, -i, CHUNK_SIZE)
+    return (time.perf_counter() - start) / CHUNK_COUNT
+
+def check_determinism():
+    """Generating twice from the same seed must give identical maps"""
+    first = TerrainGenerator(SEED).generate(500, 500)
+    second = TerrainGenerator(SEED).generate(500, 500)
+    other = TerrainGenerator(SEED + 1).generate(500, 500)
+    return (first == second).all() and not (first == other).all()
+
+if __name__ == "__main__":
+    print(f"Deterministic: {check_determinism()}")
+    for width, height in SIZES:
+        elapsed = benchmark(width, height)
+        print(f"{width}x{height}: {elapsed * 1000:.1f} ms (best of {REPEATS})")
+    print(f"{CHUNK_SIZE}x{CHUNK_SIZE} chunk: {benchmark_chunks() * 1000:.2f} ms (average of {CHUNK_COUNT})")
@@ -0,0 +1,95 @@
+import sys
+import os
+import json
+import shutil
+import tempfile
+import time
+
+# Add the game directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from dark_fantasy_game.src.game_state import GameState, State
+
+SLOT_ID = 1
+SAVES = 20
+WARMUP_FRAMES = 200
+FRAME_TIMEOUT = 5.0  # seconds to wait for a background save to be reported
+
+def make_game(screen, save_directory):
+    """Start a game that has been running for a while, saving into save_directory"""
+    game_state = GameState()
+    game_state.state = State.PLAYING
+    game_state.start_game()
+    game_state.save_system.save_directory = save_directory
+    game_state.save_system.autosave.enabled = False
+    for _ in range(WARMUP_FRAMES):
+        game_state.update()
+        game_state.draw(screen)
+    # Keep the player alive so every save is taken while playing
+    game_state.player.stats.current_health = game_state.player.stats.max_health
+    game_state.state = State.PLAYING
+    return game_state
+
+def legacy_save(save_system, game_state):
+    """The old synchronous save_game: JSON dump, full screen copy, 200x150 PNG and metadata"""
+    save_file = os.path.join(save_system.save_directory, f"slot_{SLOT_ID}.json")
+    screenshot_file = os.path.join(save_system.save_directory, f"slot_{SLOT_ID}_screenshot.png")
+    with open(save_file, 'w') as f:
+        json.dump(save_system.snapshot_progress(game_state), f, indent=2)
+    screen = pygame.display.get_surface()
+    screenshot = pygame.Surface((screen.get_width(), screen.get_height()))
+    screenshot.blit(screen, (0, 0))
+    thumbnail = pygame.transform.scale(screenshot, (200, 150))
+    pygame.image.save(thumbnail, screenshot_file)
+    save_system.save_slots[SLOT_ID].screenshot = thumbnail
+    metadata = [slot.to_dict() for slot in save_system.save_slots.values()]
+    with open(os.path.join(save_system.save_directory, "save_slots.json"), 'w') as f:
+        json.dump(metadata, f, indent=2)
+
+def benchmark_legacy(game_state):
+    """Return the average and worst game-thread time of the old save, in seconds"""
+    times = []
+    for _ in range(SAVES):
+        start = time.perf_counter()
+        legacy_save(game_state.save_system, game_state)
+        times.append(time.perf_counter() - start)
+    return sum(times) / len(times), max(times)
+
+def benchmark_async(game_state):
+    """Return the average and worst game-thread time of save_game and the average time until the slot shows it"""
+    save_system = game_state.save_system
+    call_times = []
+    done_times = []
+    for _ in range(SAVES):
+        save_system.save_slots[SLOT_ID].screenshot = None
+        start = time.perf_counter()
+        save_system.save_game(SLOT_ID, game_state)
+        call_times.append(time.perf_counter() - start)
+        # Poll like the game loop would until the save and its thumbnail are in the slot
+        while SLOT_ID in save_system.pending_slots or save_system.save_slots[SLOT_ID].screenshot is None:
+            if time.perf_counter() - start > FRAME_TIMEOUT:
+                raise RuntimeError("Save was not reported in time")
+            save_system.update()
+            time.sleep(0.0005)
+        done_times.append(time.perf_counter() - start)
+    return sum(call_times) / len(call_times), max(call_times), sum(done_times) / len(done_times)
+
+if __name__ == "__main__":
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    save_directory = tempfile.mkdtemp(prefix="dfg_saves_")
+    try:
+        game_state = make_game(screen, save_directory)
+        average, worst = benchmark_legacy(game_state)
+        print(f"Before (synchronous JSON + PNG): {average * 1000:.2f} ms average, {worst * 1000:.2f} ms worst on the game thread")
+        average, worst, done = benchmark_async(game_state)
+        print(f"After (snapshot + background writes): {average * 1000:.2f} ms average, {worst * 1000:.2f} ms worst on the game thread")
+        print(f"After: slot updated with thumbnail {done * 1000:.2f} ms after save_game (average of {SAVES})")
+        game_state.save_system.writer.stop_worker()
+        game_state.save_system.thumbnail_encoder.stop_worker()
+    finally:
+        shutil.rmtree(save_directory, ignore_errors=True)
@@ -2,6 +2,7 @@ import pygame
 import math
 import random
 from enum import Enum
+from dark_fantasy_game.src.collision import is_area_free
 
 class AbilityType(Enum):
     # Warrior abilities
@@ -200,7 +201,7 @@ class TeleportAbility(Ability):
             new_y = player.y + dy
             
             # Kiểm tra vị trí mới có hợp lệ không
-            if game_map and game_map.is_passable(new_x, new_y):
+            if game_map and is_area_free(game_map, new_x, new_y, player.width, player.height):
                 player.x = new_x
                 player.y = new_y
                 self.is_active = True
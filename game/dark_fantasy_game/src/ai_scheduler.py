@@ -0,0 +1,108 @@
+import numpy as np
+from dark_fantasy_game.src.collision import resolve_moves
+from dark_fantasy_game.src.monster_behaviors import run_behaviors
+from dark_fantasy_game.src.steering import steer_crowd
+
+# Tầng cập nhật AI theo khoảng cách tới người chơi
+TIER_NEAR = 0  # Cập nhật đầy đủ mỗi frame
+TIER_MID = 1  # Cập nhật đầy đủ mỗi vài frame, bù theo số frame bỏ qua
+TIER_FAR = 2  # Chỉ di chuyển thô, thưa
+
+class AIScheduler:
+    """Lập lịch cập nhật AI quái vật theo mức chi tiết (LOD) dựa trên khoảng cách
+    
+    Quái vật gần người chơi chạy AI đầy đủ mỗi frame. Quái vật ở tầm trung
+    chạy mỗi mid_interval frame, cooldown và quãng đường được bù theo số
+    frame đã bỏ qua. Quái vật ở xa chỉ di chuyển thô mỗi far_interval frame.
+    Mỗi tầng có hàm riêng (update_near, update_mid, update_far) để thấy rõ
+    trong profiler; tier_counts/update_counts ghi lại công việc của frame gần nhất.
+    """
+    def __init__(self, near_distance=700, far_distance=1400, mid_interval=3, far_interval=8):
+        self.near_distance = near_distance  # Trong khoảng này: cập nhật mỗi frame (pixel)
+        self.far_distance = far_distance  # Ngoài khoảng này: chỉ di chuyển thô (pixel)
+        self.mid_interval = mid_interval
+        self.far_interval = far_interval
+        self.tick = 0  # Frame gần nhất được lưu trên từng quái vật (monster.ai_tick)
+        self.tier_counts = [0, 0, 0]  # Số quái vật ở mỗi tầng trong frame gần nhất
+        self.update_counts = [0, 0, 0]  # Số quái vật thực sự được cập nhật ở mỗi tầng
+        self.alignment = 0.0  # Hệ số căn hàng khi tách đàn (0 = chỉ tách)
+        
+    def forget(self, monster):
+        """Bỏ lịch cập nhật của quái vật đã bị loại (quái vật tái sử dụng từ kho được cập nhật ngay)"""
+        monster.ai_tick = None
+        
+    def assign_tiers(self, monsters, player):
+        """Xếp tầng cho tất cả quái vật theo khoảng cách từ tâm quái vật tới tâm người chơi"""
+        if not monsters:
+            return np.zeros(0, dtype=np.int8)
+        centers_x = np.array([monster.x + monster.width / 2 for monster in monsters])
+        centers_y = np.array([monster.y + monster.height / 2 for monster in monsters])
+        distance_sq = ((centers_x - (player.x + player.width / 2)) ** 2 +
+                       (centers_y - (player.y + player.height / 2)) ** 2)
+        tiers = np.full(len(monsters), TIER_MID, dtype=np.int8)
+        tiers[distance_sq <= self.near_distance ** 2] = TIER_NEAR
+        tiers[distance_sq > self.far_distance ** 2] = TIER_FAR
+        # Boss luôn chạy AI đầy đủ (ít nhất ở tầng giữa)
+        bosses = np.array([monster.is_boss for monster in monsters])
+        tiers[bosses & (tiers == TIER_FAR)] = TIER_MID
+        return tiers
+        
+    def get_due(self, monsters, interval):
+        """Các quái vật đã đến lượt cập nhật, kèm số frame cần bù
+        
+        Quái vật chưa từng được lập lịch (mới xuất hiện, triệu hồi, nạp từ save,
+        lấy lại từ kho) được cập nhật ngay ở bất kỳ tầng nào; vì quái vật xuất
+        hiện ở các frame khác nhau nên công việc của tầng giữa/xa tự rải đều qua
+        các frame. Mọi quái vật đến lượt đều được đánh dấu frame hiện tại, kể cả
+        khi không hoạt động (đang chuyển phase), để số frame bù không dồn lại.
+        """
+        due = []
+        for monster in monsters:
+            if monster.ai_tick is None:
+                due.append((monster, 1))
+                monster.ai_tick = self.tick
+                continue
+            ticks = self.tick - monster.ai_tick
+            if ticks >= interval:
+                # Quái vật vừa chuyển từ tầng thưa hơn sang được bù phần còn thiếu
+                due.append((monster, min(ticks, self.far_interval)))
+                monster.ai_tick = self.tick
+        return due
+        
+    def update_near(self, monsters, player, game_map, all_monsters):
+        """Tầng gần: AI đầy đủ mỗi frame"""
+        return run_behaviors(self.get_due(monsters, 1), player, game_map, all_monsters)
+                
+    def update_mid(self, monsters, player, game_map, all_monsters):
+        """Tầng giữa: AI đầy đủ mỗi mid_interval frame, bù theo số frame bỏ qua"""
+        return run_behaviors(self.get_due(monsters, self.mid_interval), player, game_map, all_monsters)
+                
+    def update_far(self, monsters, player):
+        """Tầng xa: chỉ di chuyển thô mỗi far_interval frame"""
+        return [(monster, ticks) for monster, ticks in self.get_due(monsters, self.far_interval)
+                if monster.update_coarse(player, ticks)]
+                
+    def update(self, monsters, player, game_map):
+        """Chạy AI một frame cho tất cả quái vật, tách đàn rồi giải quyết va chạm địa hình cho cả nhóm"""
+        self.tick += 1
+        tiers = self.assign_tiers(monsters, player)
+        groups = [[], [], []]
+        for monster, tier in zip(monsters, tiers.tolist()):
+            groups[tier].append(monster)
+        self.tier_counts = [len(group) for group in groups]
+        
+        near = self.update_near(groups[TIER_NEAR], player, game_map, monsters)
+        mid = self.update_mid(groups[TIER_MID], player, game_map, monsters)
+        coarse = self.update_far(groups[TIER_FAR], player)
+        self.update_counts = [len(near), len(mid), len(coarse)]
+        full = near + mid
+        
+        # Tách đàn sau khi di chuyển theo hành vi, trước khi xét va chạm địa hình
+        steer_crowd(monsters, full + coarse, alignment=self.alignment)
+        
+        moved = [monster for monster, _ in full + coarse]
+        blocked = resolve_moves(game_map, moved, [(monster.prev_x, monster.prev_y) for monster in moved])
+        for monster, was_blocked in zip(moved, blocked):
+            monster.resolve_collision(was_blocked)
+        for monster, _ in full:
+            monster.update_state(player)
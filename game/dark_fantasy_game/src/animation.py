@@ -1,6 +1,9 @@
 import pygame
 import os
 
+# (sprite sheet path, frame width, frame height, frame count) -> sliced frames shared by all animations
+FRAME_CACHE = {}
+
 class Animation:
     def __init__(self, sprite_sheet_path, frame_width, frame_height, frame_count, loop=True):
         self.frames = []
@@ -17,6 +20,15 @@ class Animation:
         self.load_frames(sprite_sheet_path)
         
     def load_frames(self, sprite_sheet_path):
+        # Sprite sheets are loaded and sliced once, later animations reuse the frames
+        key = (sprite_sheet_path, self.frame_width, self.frame_height, self.frame_count)
+        frames = FRAME_CACHE.get(key)
+        if frames is None:
+            frames = FRAME_CACHE[key] = self.slice_frames(sprite_sheet_path)
+        self.frames = frames
+        
+    def slice_frames(self, sprite_sheet_path):
+        frames = []
         try:
             # Ensure path exists
             if not os.path.exists(sprite_sheet_path):
@@ -24,8 +36,8 @@ class Animation:
                 placeholder = pygame.Surface((self.frame_width, self.frame_height), pygame.SRCALPHA)
                 placeholder.fill((255, 0, 255, 128))  # Purple semi-transparent
                 for i in range(self.frame_count):
-                    self.frames.append(placeholder)
-                return
+                    frames.append(placeholder)
+                return frames
                 
             # Load sprite sheet
             sheet = pygame.image.load(sprite_sheet_path).convert_alpha()
@@ -34,15 +46,15 @@ class Animation:
             for i in range(self.frame_count):
                 frame = pygame.Surface((self.frame_width, self.frame_height), pygame.SRCALPHA)
                 frame.blit(sheet, (0, 0), (i * self.frame_width, 0, self.frame_width, self.frame_height))
-                self.frames.append(frame)
+                frames.append(frame)
                 
         except Exception as e:
             # Create a placeholder frame for error cases
             placeholder = pygame.Surface((self.frame_width, self.frame_height), pygame.SRCALPHA)
             placeholder.fill((255, 0, 0, 128))  # Red semi-transparent
-            for i in range(self.frame_count):
-                self.frames.append(placeholder)
-            
+            frames = [placeholder] * self.frame_count
+        return frames
+        
     def update(self, dt):
         if self.finished:
             return
@@ -0,0 +1,130 @@
+import os
+import time
+from dark_fantasy_game.src.save_writer import write_atomic
+from dark_fantasy_game.src.save_format import SaveReader, encode_save, encode_journal_record, read_journal
+
+# Sections that change often and are journaled between full snapshots
+JOURNALED_SECTIONS = ("player", "inventory", "quest_system", "game_state")
+
+class JournaledSave:
+    """A base save with journal records replayed on top, readable like a SaveReader"""
+    def __init__(self, reader, deltas):
+        self.reader = reader
+        self.deltas = deltas
+        
+    def get(self, name, default=None):
+        if name in self.deltas:
+            return self.deltas[name]
+        return self.reader.get(name, default)
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, *exc_info):
+        self.reader.close()
+
+class Autosave:
+    """Crash-resilient autosave: occasional full snapshots plus a journal of small deltas
+    
+    Every interval frames the player, inventory, quest and score sections are
+    compared with what was last written, and only the sections that changed
+    are appended to the journal. Every full_every autosaves the whole world is
+    snapshotted instead. After max_journal_records appends the writer thread
+    folds the journal into the base save and empties it. Loading replays the
+    journal onto the base save.
+    
+    All file work runs on the SaveWriter thread; the game thread only copies
+    the sections and compares them (see last_cost_ms).
+    """
+    def __init__(self, writer, save_directory, interval=600, full_every=30, max_journal_records=10):
+        self.writer = writer
+        self.base_file = os.path.join(save_directory, "autosave.sav")
+        self.journal_file = os.path.join(save_directory, "autosave.journal")
+        self.interval = interval  # frames between autosaves
+        self.full_every = full_every
+        self.max_journal_records = max_journal_records
+        self.enabled = True
+        
+        self.timer = 0
+        self.last_written = {}  # Section name -> value as of the last full snapshot or journal record
+        self.autosaves_since_full = 0
+        self.journal_records = 0
+        self.last_cost_ms = 0.0
+        
+    def reset(self):
+        """Start over with a full snapshot (new game or a game was loaded)"""
+        self.timer = 0
+        self.last_written = {}
+        self.journal_records = 0
+        
+    def update(self, save_system, game_state):
+        """Count frames and autosave when the interval has passed"""
+        if not self.enabled:
+            return
+        self.timer += 1
+        if self.timer >= self.interval:
+            self.timer = 0
+            self.autosave(save_system, game_state)
+            
+    def autosave(self, save_system, game_state):
+        start = time.perf_counter()
+        if not self.last_written or self.autosaves_since_full >= self.full_every:
+            # Full snapshot, includes monsters, items and the wave
+            save_data = save_system.snapshot_game(game_state)
+            self.writer.submit("autosave", None, self.write_base, save_data)
+            self.last_written = {name: save_data[name] for name in JOURNALED_SECTIONS}
+            self.autosaves_since_full = 0
+            self.journal_records = 0
+        else:
+            progress = save_system.snapshot_progress(game_state)
+            delta = {name: value for name, value in progress.items() if self.last_written.get(name) != value}
+            if delta:
+                self.writer.submit("autosave", None, self.append_journal, delta)
+                self.last_written.update(delta)
+                self.journal_records += 1
+                if self.journal_records >= self.max_journal_records:
+                    self.writer.submit("autosave", None, self.compact)
+                    self.journal_records = 0
+            self.autosaves_since_full += 1
+        self.last_cost_ms = (time.perf_counter() - start) * 1000
+        
+    def has_autosave(self):
+        return os.path.exists(self.base_file)
+        
+    def open(self):
+        """Open the base save with the journal replayed on top; close the result's reader when done"""
+        reader = SaveReader(self.base_file)
+        reader.verify()
+        deltas = {}
+        for record in read_journal(self.journal_file):
+            deltas.update(record)
+        return JournaledSave(reader, deltas)
+        
+    # Writer thread
+    
+    def write_base(self, save_data):
+        write_atomic(self.base_file, lambda f: f.write(encode_save(save_data)))
+        # The new base already holds everything the journal recorded
+        self.truncate_journal()
+        
+    def append_journal(self, delta):
+        with open(self.journal_file, 'ab') as f:
+            f.write(encode_journal_record(delta))
+            f.flush()
+            os.fsync(f.fileno())
+            
+    def compact(self):
+        """Fold the journal into the base save, then empty the journal"""
+        if not os.path.exists(self.base_file):
+            return
+        with SaveReader(self.base_file) as reader:
+            save_data = reader.read_all()
+        for record in read_journal(self.journal_file):
+            save_data.update(record)
+        # Replaying a record twice is harmless, so a crash between these two steps loses nothing
+        self.write_base(save_data)
+        
+    def truncate_journal(self):
+        with open(self.journal_file, 'wb') as f:
+            f.flush()
+            os.fsync(f.fileno())
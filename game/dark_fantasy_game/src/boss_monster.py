@@ -5,9 +5,36 @@ import os
 from dark_fantasy_game.src.monster import Monster
 from dark_fantasy_game.src.monster_types import MonsterType, MonsterAbility, MonsterBehavior
 
+def special_summon(boss, attack, player, game_map):
+    """Triệu hồi quái vật nhỏ"""
+    return boss.use_ability(MonsterAbility.SUMMON, player)
+
+def special_life_drain(boss, attack, player, game_map):
+    """Hút máu từ người chơi"""
+    heal_amount = int(attack["damage"] * 0.5)
+    boss.health = min(boss.max_health, boss.health + heal_amount)
+    boss.effects.append({
+        "type": "heal",
+        "timer": 60
+    })
+    return None
+
+def special_teleport(boss, attack, player, game_map):
+    """Dịch chuyển"""
+    return boss.use_ability(MonsterAbility.TELEPORT, player, game_map=game_map)
+
+# Tên tấn công đặc biệt -> hàm xử lý; tấn công không có trong bảng chỉ có hiệu ứng và animation
+SPECIAL_ATTACKS = {
+    "Summon Undead": special_summon,
+    "Summon Phase": special_summon,
+    "Life Drain": special_life_drain,
+    "Teleport Phase": special_teleport,
+}
+
 class BossMonster(Monster):
-    def __init__(self, monster_type, x, y, level=1):
-        super().__init__(monster_type, x, y, level)
+    def reset(self, x, y, level=1):
+        """Đặt lại quái vật và các giai đoạn, đòn đặc biệt của boss"""
+        super().reset(x, y, level)
         
         # Đảm bảo là boss
         self.is_boss = True
@@ -16,7 +43,8 @@ class BossMonster(Monster):
         self.width = int(self.width * 1.5)
         self.height = int(self.height * 1.5)
         
-        # Các giai đoạn của boss
+        # Các giai đoạn của boss (khả năng mở thêm theo giai đoạn thuộc riêng boss này)
+        self.phase_abilities = self.stats.abilities
         self.max_phases = 3
         self.current_phase = 1
         self.phase_health_thresholds = [0.7, 0.4, 0.1]  # 70%, 40%, 10% máu
@@ -47,6 +75,27 @@ class BossMonster(Monster):
         self.current_pattern = 0
         self.setup_attack_patterns()
         
+    @property
+    def abilities(self):
+        return self.phase_abilities
+        
+    def get_phase_record(self):
+        # Giai đoạn âm nghĩa là đang chuyển sang giai đoạn đó
+        phase = -self.current_phase if self.phase_transition_effect else self.current_phase
+        return (phase, self.special_attack_cooldown, self.phase_transition_timer)
+        
+    def apply_phase_record(self, phase_record):
+        phase, self.special_attack_cooldown, self.phase_transition_timer = phase_record
+        self.phase_transition_effect = phase < 0
+        self.current_phase = abs(phase)
+        
+        # Khả năng được thêm khi chuyển xong giai đoạn 2 và 3 (xem update)
+        completed_phase = self.current_phase - 1 if self.phase_transition_effect else self.current_phase
+        if completed_phase >= 2 and MonsterAbility.TELEPORT not in self.phase_abilities:
+            self.phase_abilities += (MonsterAbility.TELEPORT,)
+        if completed_phase >= 3 and MonsterAbility.SUMMON not in self.phase_abilities:
+            self.phase_abilities += (MonsterAbility.SUMMON,)
+        
     def setup_special_attacks(self):
         """Thiết lập các đòn tấn công đặc biệt dựa trên loại boss"""
         if self.monster_type == MonsterType.DRAGON:
@@ -102,10 +151,10 @@ class BossMonster(Monster):
                 {"name": "Teleport Phase", "duration": 120, "speed_multiplier": 1.5}
             ]
             
-    def update(self, player, game_map=None, monsters=None):
-        """Cập nhật trạng thái của boss"""
+    def begin_update(self, player, game_map=None, ticks=1):
+        """Cập nhật giai đoạn, tấn công đặc biệt và mẫu tấn công của boss trước hành vi chung"""
         if self.health <= 0:
-            return
+            return False
             
         # Kiểm tra chuyển giai đoạn
         health_percent = self.health / self.max_health
@@ -116,7 +165,7 @@ class BossMonster(Monster):
                 
         # Xử lý hiệu ứng chuyển giai đoạn
         if self.phase_transition_effect:
-            self.phase_transition_timer -= 1
+            self.phase_transition_timer -= ticks
             if self.phase_transition_timer <= 0:
                 self.phase_transition_effect = False
                 # Tăng sức mạnh khi chuyển giai đoạn
@@ -125,15 +174,14 @@ class BossMonster(Monster):
                 # Thêm khả năng mới nếu cần
                 if self.current_phase == 2:
                     if MonsterAbility.TELEPORT not in self.abilities:
-                        self.abilities.append(MonsterAbility.TELEPORT)
+                        self.phase_abilities += (MonsterAbility.TELEPORT,)
                 elif self.current_phase == 3:
                     if MonsterAbility.SUMMON not in self.abilities:
-                        self.abilities.append(MonsterAbility.SUMMON)
-            return  # Không di chuyển trong khi chuyển giai đoạn
+                        self.phase_abilities += (MonsterAbility.SUMMON,)
+            return False  # Không di chuyển trong khi chuyển giai đoạn
             
         # Cập nhật cooldown tấn công đặc biệt
-        if self.special_attack_cooldown > 0:
-            self.special_attack_cooldown -= 1
+        self.special_attack_cooldown = max(0, self.special_attack_cooldown - ticks)
             
         # Sử dụng tấn công đặc biệt nếu có thể
         if self.special_attack_cooldown <= 0 and len(self.special_attacks) > 0:
@@ -148,9 +196,9 @@ class BossMonster(Monster):
             
             if distance <= special_attack["range"]:
                 # Thực hiện tấn công đặc biệt
-                self.perform_special_attack(special_attack, player)
+                self.perform_special_attack(special_attack, player, game_map)
                 self.special_attack_cooldown = special_attack["cooldown"]
-                return  # Không di chuyển trong khi thực hiện tấn công đặc biệt
+                return False  # Không di chuyển trong khi thực hiện tấn công đặc biệt
                 
         # Cập nhật mẫu tấn công
         if len(self.attack_patterns) > 0:
@@ -161,11 +209,11 @@ class BossMonster(Monster):
             self.speed = original_speed * current_pattern["speed_multiplier"]
             
             # Chuyển sang mẫu tấn công tiếp theo sau một khoảng thời gian
-            if random.random() < 0.005:  # 0.5% cơ hội mỗi frame
+            if random.random() < 0.005 * ticks:  # 0.5% cơ hội mỗi frame
                 self.current_pattern = (self.current_pattern + 1) % len(self.attack_patterns)
                 
-        # Gọi phương thức update của lớp cha
-        super().update(player, game_map, monsters)
+        # Gọi phương thức của lớp cha
+        return super().begin_update(player, game_map, ticks)
         
     def transition_to_next_phase(self):
         """Chuyển sang giai đoạn tiếp theo"""
@@ -187,7 +235,7 @@ class BossMonster(Monster):
             "timer": self.phase_transition_duration
         })
         
-    def perform_special_attack(self, attack, player):
+    def perform_special_attack(self, attack, player, game_map=None):
         """Thực hiện tấn công đặc biệt"""
         # Đặt animation tấn công
         self.set_animation("attack")
@@ -200,24 +248,9 @@ class BossMonster(Monster):
             "range": attack["range"]
         })
         
-        # Xử lý logic tấn công đặc biệt
-        if attack["name"] == "Summon Undead" or attack["name"] == "Summon Phase":
-            # Triệu hồi quái vật nhỏ
-            return self.use_ability(MonsterAbility.SUMMON, player)
-        elif attack["name"] == "Life Drain":
-            # Hút máu từ người chơi
-            heal_amount = int(attack["damage"] * 0.5)
-            self.health = min(self.max_health, self.health + heal_amount)
-            # Thêm hiệu ứng hồi máu
-            self.effects.append({
-                "type": "heal",
-                "timer": 60
-            })
-        elif attack["name"] == "Teleport Phase":
-            # Dịch chuyển
-            return self.use_ability(MonsterAbility.TELEPORT, player)
-            
-        return None
+        # Xử lý logic tấn công đặc biệt theo bảng
+        handler = SPECIAL_ATTACKS.get(attack["name"])
+        return handler(self, attack, player, game_map) if handler else None
         
     def draw(self, screen, scale_x=1.0, scale_y=1.0):
         """Vẽ boss với các hiệu ứng đặc biệt"""
@@ -0,0 +1,128 @@
+import math
+import numpy as np
+
+HITBOX_SCALE = 0.4  # Hộp va chạm với địa hình = 40% kích thước sprite, đặt ở giữa sprite
+MAX_HITBOX_TILES = 0.8  # Quái thường đi theo trường hướng từng ô, nên hộp không rộng hơn một ô
+BOSS_HITBOX_SCALE = 0.6  # Boss: hộp theo kích thước đã phóng to, không giới hạn; A* tìm đường theo bề rộng này
+EDGE_EPSILON = 1e-6  # Mép phải/dưới của hộp không tính là nằm trong ô kế tiếp
+
+def get_hitbox_offset(width, height, tile_size, is_boss=False):
+    """Độ lệch (x, y) và kích thước (w, h) của hộp va chạm so với góc trên trái sprite"""
+    box_width = np.where(is_boss, width * BOSS_HITBOX_SCALE,
+                         np.minimum(width * HITBOX_SCALE, tile_size * MAX_HITBOX_TILES))
+    box_height = np.where(is_boss, height * BOSS_HITBOX_SCALE,
+                          np.minimum(height * HITBOX_SCALE, tile_size * MAX_HITBOX_TILES))
+    return (width - box_width) / 2, (height - box_height) / 2, box_width, box_height
+
+def get_clearance(width, height, tile_size, is_boss=False):
+    """Số ô cần trống mỗi bên ô tâm để hộp va chạm lọt qua (0 = một ô là đủ)"""
+    _, _, box_width, box_height = get_hitbox_offset(width, height, tile_size, is_boss)
+    box_tiles = float(max(box_width, box_height)) / tile_size
+    return max(0, math.ceil((box_tiles - 1) / 2))
+
+def to_cells(values, tile_size):
+    return np.floor(values / tile_size).astype(np.int64)
+
+def sweep_axis(game_map, start, size, delta, side_start, side_size, vertical):
+    """Quét hộp dọc một trục, dừng ở mép ô đầu tiên không đi qua được
+    
+    start/size/delta là vị trí, kích thước và độ dời trên trục di chuyển;
+    side_start/side_size là vị trí và kích thước trên trục còn lại. Chỉ các
+    hàng ô mà mép trước của hộp mới đi vào mới được kiểm tra, nên hộp đang
+    kẹt sẵn trong tường vẫn thoát ra được. Trả về (vị trí mới, bị chặn).
+    """
+    tile_size = game_map.tile_size
+    forward = delta > 0
+    lead = np.where(forward, start + size - EDGE_EPSILON, start)
+    first_line = to_cells(lead, tile_size)
+    steps = np.abs(to_cells(lead + delta, tile_size) - first_line)  # Số hàng ô mới đi qua
+    result = start + delta
+    blocked = np.zeros(start.shape, dtype=bool)
+    
+    # Chỉ những hộp đi vào hàng ô mới mới cần tra lưới
+    movers = np.nonzero(steps)[0]
+    if movers.size == 0:
+        return result, blocked
+    forward = forward[movers]
+    first_line = first_line[movers]
+    steps = steps[movers]
+    size = size[movers]
+    max_steps = int(steps.max())
+    
+    side_first = to_cells(side_start[movers], tile_size)
+    spans = to_cells(side_start[movers] + side_size[movers] - EDGE_EPSILON, tile_size) - side_first + 1
+    
+    # Lưới (thực thể, hàng ô mới, ô trên hàng); phần thừa được kẹp về ô hợp lệ rồi bỏ qua
+    step_index = np.arange(1, max_steps + 1)
+    span_index = np.arange(int(spans.max()))
+    line_valid = step_index[None, :] <= steps[:, None]
+    span_valid = span_index[None, :] < spans[:, None]
+    direction = np.where(forward, 1, -1)
+    lines = first_line[:, None] + direction[:, None] * np.where(line_valid, step_index[None, :], 1)
+    sides = side_first[:, None] + np.where(span_valid, span_index[None, :], 0)
+    lines_3d = np.broadcast_to(lines[:, :, None], lines.shape + sides.shape[1:])
+    sides_3d = np.broadcast_to(sides[:, None, :], lines_3d.shape)
+    if vertical:
+        passable = game_map.chunks.lookup(sides_3d, lines_3d)
+    else:
+        passable = game_map.chunks.lookup(lines_3d, sides_3d)
+        
+    solid = ~passable & line_valid[:, :, None] & span_valid[:, None, :]
+    solid_lines = solid.any(axis=2)
+    hit = solid_lines.any(axis=1)
+    wall = lines[np.arange(len(lines)), solid_lines.argmax(axis=1)]
+    stop = np.where(forward, wall * tile_size - size, (wall + 1) * tile_size)
+    result[movers] = np.where(hit, stop, result[movers])
+    blocked[movers] = hit
+    return result, blocked
+
+def move_boxes(game_map, left, top, width, height, dx, dy):
+    """Di chuyển nhiều hộp cùng lúc theo (dx, dy), xử lý trục x rồi trục y
+    
+    Trả về (left mới, top mới, bị chặn theo x, bị chặn theo y), đều là mảng.
+    """
+    left, top, width, height, dx, dy = (np.asarray(value, dtype=np.float64)
+                                        for value in (left, top, width, height, dx, dy))
+    new_left, blocked_x = sweep_axis(game_map, left, width, dx, top, height, False)
+    new_top, blocked_y = sweep_axis(game_map, top, height, dy, new_left, width, True)
+    return new_left, new_top, blocked_x, blocked_y
+
+def resolve_moves(game_map, entities, old_positions):
+    """Đưa các thực thể từ vị trí cũ tới vị trí hiện tại, trượt dọc tường thay vì xuyên qua
+    
+    Thực thể cần có x, y, width, height (boss có is_boss = True). Trả về danh sách bool: thực thể có bị chặn không.
+    """
+    if not entities:
+        return []
+        
+    old_x = np.array([position[0] for position in old_positions], dtype=np.float64)
+    old_y = np.array([position[1] for position in old_positions], dtype=np.float64)
+    new_x = np.array([entity.x for entity in entities], dtype=np.float64)
+    new_y = np.array([entity.y for entity in entities], dtype=np.float64)
+    width = np.array([entity.width for entity in entities], dtype=np.float64)
+    height = np.array([entity.height for entity in entities], dtype=np.float64)
+    is_boss = np.array([getattr(entity, "is_boss", False) for entity in entities], dtype=bool)
+    offset_x, offset_y, box_width, box_height = get_hitbox_offset(width, height, game_map.tile_size, is_boss)
+    
+    left, top, blocked_x, blocked_y = move_boxes(game_map, old_x + offset_x, old_y + offset_y,
+                                                 box_width, box_height, new_x - old_x, new_y - old_y)
+    left -= offset_x
+    top -= offset_y
+    blocked = blocked_x | blocked_y
+    for i, entity in enumerate(entities):
+        if blocked[i]:
+            entity.x = float(left[i])
+            entity.y = float(top[i])
+    return blocked.tolist()
+
+def is_area_free(game_map, x, y, width, height, is_boss=False):
+    """Hộp va chạm của sprite đặt tại (x, y) có nằm hoàn toàn trên ô đi qua được không"""
+    tile_size = game_map.tile_size
+    offset_x, offset_y, box_width, box_height = get_hitbox_offset(width, height, tile_size, is_boss)
+    first_x = int((x + offset_x) // tile_size)
+    first_y = int((y + offset_y) // tile_size)
+    last_x = int((x + offset_x + box_width - EDGE_EPSILON) // tile_size)
+    last_y = int((y + offset_y + box_height - EDGE_EPSILON) // tile_size)
+    return all(game_map.is_cell_passable(tile_x, tile_y)
+               for tile_y in range(first_y, last_y + 1)
+               for tile_x in range(first_x, last_x + 1))
@@ -1,4 +1,5 @@
 import math
+from dark_fantasy_game.src.ui_panel import CachedPanel
 
 class ExperienceSystem:
     def __init__(self):
@@ -15,6 +16,9 @@ class ExperienceSystem:
         # Lịch sử kinh nghiệm nhận được
         self.exp_history = []
         
+        # Bảng chỉ số được cache, chỉ vẽ lại khi dữ liệu thay đổi
+        self.stats_panel = CachedPanel()
+        
         # Các kỹ năng đã mở khóa theo cấp độ
         self.unlocked_skills = {
             1: ["Kiếm Khí", "Vòng Lửa"],  # Kỹ năng cơ bản (Warrior/Mage)
@@ -255,16 +259,33 @@ class ExperienceSystem:
         # Vẽ thông báo lên màn hình
         screen.blit(notification_surface, (notification_x, notification_y))
         
+    def get_stats_panel_state(self, panel_width, panel_height, scale_x, scale_y):
+        """Tạo khóa trạng thái quyết định khi nào cần vẽ lại bảng chỉ số"""
+        return (panel_width, panel_height, scale_x, scale_y, self.level, self.experience,
+                self.skill_points, tuple(self.upgradable_stats.values()))
+        
     def draw_stats_panel(self, screen, x, y, scale_x=1.0, scale_y=1.0):
         """Vẽ bảng chỉ số và nâng cấp"""
-        import pygame
-        
         # Điều chỉnh vị trí và kích thước theo tỷ lệ
         scaled_x = int(x * scale_x)
         scaled_y = int(y * scale_y)
         panel_width = int(350 * scale_x)
         panel_height = int(450 * scale_y)
         
+        # Chỉ vẽ lại bảng khi chỉ số thay đổi, còn lại chỉ blit surface đã cache
+        state_key = self.get_stats_panel_state(panel_width, panel_height, scale_x, scale_y)
+        self.stats_panel.draw(screen, scaled_x, scaled_y, state_key,
+                              lambda: self.render_stats_panel(panel_width, panel_height, scale_x, scale_y))
+        
+        # Trả về các nút nâng cấp để xử lý sự kiện click
+        return self.stats_panel.get_screen_rects()
+        
+    def render_stats_panel(self, panel_width, panel_height, scale_x=1.0, scale_y=1.0):
+        """Vẽ bảng chỉ số lên surface riêng, trả về surface và vị trí các nút nâng cấp"""
+        import pygame
+        
+        buttons = {}
+        
         # Vẽ nền bảng với độ trong suốt
         panel_surface = pygame.Surface((panel_width, panel_height), pygame.SRCALPHA)
         panel_surface.fill((0, 0, 0, 200))
@@ -338,6 +359,7 @@ class ExperienceSystem:
             # Vẽ nút nâng cấp nếu còn điểm kỹ năng
             if self.skill_points > 0:
                 button_rect = pygame.Rect(panel_width - 60, stat_y + 5, 30, 30)
+                buttons[stat] = button_rect
                 pygame.draw.rect(panel_surface, (0, 150, 0), button_rect)
                 pygame.draw.rect(panel_surface, (255, 255, 255), button_rect, 1)
                 
@@ -356,21 +378,7 @@ class ExperienceSystem:
         guide_text = font_small.render("Click + to spend skill points", True, (200, 200, 200))
         panel_surface.blit(guide_text, ((panel_width - guide_text.get_width()) // 2, stat_y + 10))
         
-        # Vẽ bảng lên màn hình
-        screen.blit(panel_surface, (scaled_x, scaled_y))
-        
-        # Trả về các nút nâng cấp để xử lý sự kiện click
-        buttons = {}
-        stat_y = 160
-        for stat in self.upgradable_stats:
-            if self.skill_points > 0:
-                button_rect = pygame.Rect(scaled_x + panel_width - 60, 
-                                        scaled_y + stat_y + 5, 
-                                        30, 30)
-                buttons[stat] = button_rect
-            stat_y += stat_height + 10
-            
-        return buttons
+        return panel_surface, buttons
         
     def handle_stats_click(self, pos, buttons):
         """Xử lý sự kiện click vào bảng chỉ số"""
@@ -378,3 +386,13 @@ class ExperienceSystem:
             if button_rect.collidepoint(pos):
                 return self.spend_skill_point(stat)
         return False
+        
+    def to_dict(self):
+        """Chuyển cấp độ, kinh nghiệm và điểm đã cộng thành dictionary để lưu game"""
+        return {
+            "level": self.level,
+            "experience": self.experience,
+            "skill_points": self.skill_points,
+            "total_skill_points_spent": self.total_skill_points_spent,
+            "upgradable_stats": dict(self.upgradable_stats)
+        }
@@ -1,10 +1,14 @@
 import pygame
 import random
+import time
 import math
 from dark_fantasy_game.src.player import Player, CharacterClass
 from dark_fantasy_game.src.monster import Monster, MonsterType
 from dark_fantasy_game.src.wave_manager import WaveManager
 from dark_fantasy_game.src.map import Map
+from dark_fantasy_game.src.ai_scheduler import AIScheduler
+from dark_fantasy_game.src.spawn_queue import SpawnQueue
+from dark_fantasy_game.src.collision import is_area_free
 from dark_fantasy_game.src.mini_map import MiniMap
 from dark_fantasy_game.src.effects_manager import EffectsManager
 from dark_fantasy_game.src.quest_system import QuestSystem, QuestObjectiveType
@@ -74,17 +78,20 @@ class Item:
                                   screen_y - int(self.height * scale_y / 2)))
 
 class GameState:
-    def __init__(self):
+    def __init__(self, seed=None):
         self.state = State.MAIN_MENU
         self.player = Player(400, 300, CharacterClass.WARRIOR)
         self.monsters = []
         self.wave_manager = WaveManager()
+        self.ai_scheduler = AIScheduler()  # Cập nhật AI quái vật theo khoảng cách tới người chơi
+        # Quái vật triệu hồi chờ spawn trong giới hạn số quái và ngân sách mỗi frame
+        self.spawn_queue = SpawnQueue(max_monsters=self.wave_manager.director.max_monsters)
         self.score = 0
         self.level = 1
         self.infinity_mode = True  # Luôn bật chế độ vô hạn
         
-        # Tạo map vô hạn với kích thước lớn hơn
-        self.game_map = Map(200, 200)  # Map 200x200 tiles để tạo cảm giác vô hạn
+        # Tạo map vô hạn với kích thước lớn hơn (seed None = thế giới mới ngẫu nhiên)
+        self.game_map = Map(200, 200, seed)  # Map 200x200 tiles để tạo cảm giác vô hạn
         
         # Camera position
         self.camera_x = 0
@@ -112,6 +119,10 @@ class GameState:
         self.monsters_per_wave = 10
         self.monsters_killed_in_wave = 0
         
+        # Thống kê cả trận: tổng số quái đã giết và sát thương người chơi gây ra
+        self.total_kills = 0
+        self.damage_dealt = 0
+        
         # Initialize main menu buttons
         self.init_main_menu()
         
@@ -200,6 +211,13 @@ class GameState:
                         # Xử lý trường hợp save_system chưa được khởi tạo
                         pass
                     return True
+                elif event.key == pygame.K_F6:
+                    # Lưu nhanh toàn bộ trận đấu (quái vật, vật phẩm, wave, camera)
+                    self.save_system.quick_save(self)
+                    return True
+                elif event.key == pygame.K_F8:
+                    self.save_system.quick_load(self)
+                    return True
                     
             # Pass events to player when playing
             self.player.handle_event(event, scale_x, scale_y)
@@ -265,12 +283,17 @@ class GameState:
             
     def start_game(self):
         """Start a new game"""
+        self.wave_manager.monster_pool.release_all(self.monsters)
         self.monsters = []
+        self.spawn_queue.clear()
         self.items = []  # Xóa tất cả vật phẩm
         self.score = 0
         self.level = 1
         self.monsters_killed_in_wave = 0
+        self.total_kills = 0
+        self.damage_dealt = 0
         self.wave_manager.start_wave(self.level)
+        self.save_system.autosave.reset()
         
         # Đặt người chơi vào giữa bản đồ
         map_center_x = self.game_map.width * self.game_map.tile_size / 2
@@ -284,7 +307,12 @@ class GameState:
         
     def update(self):
         """Update game state"""
+        # Pick up saves the writer thread has finished, autosave while playing
+        self.save_system.update(self)
+        
         if self.state == State.PLAYING:
+            update_start = time.perf_counter()
+            
             # Update player with delta time for animations
             self.player.update(1/60, self.game_map)
             
@@ -356,9 +384,18 @@ class GameState:
                     if item in self.items:
                         self.items.remove(item)
             
+            # Cập nhật trường hướng đi về phía người chơi (dùng chung cho mọi quái vật)
+            self.game_map.flow_field.update(self.player.x + self.player.width / 2,
+                                            self.player.y + self.player.height / 2)
+            # Xử lý các yêu cầu tìm đường A* trong giới hạn mỗi frame
+            self.game_map.pathfinder.update()
+            
             # Update monsters
+            # Cập nhật AI quái vật theo tầng khoảng cách, rồi giải quyết va chạm địa hình cho cả nhóm
+            self.ai_scheduler.update(self.monsters, self.player, self.game_map)
+            self.spawn_summons()
+                
             for monster in list(self.monsters):
-                monster.update(self.player, self.game_map)
                 
                 # Check for collisions with player attack
                 attack_rect = self.player.get_attack_rect()
@@ -401,11 +438,14 @@ class GameState:
                             # Hiển thị hiệu ứng chí mạng
                             self.show_critical_hit(monster.x, monster.y)
                             
+                        health_before = monster.health
                         monster.take_damage(damage)
+                        self.damage_dealt += max(0, health_before - monster.health)
                         
                         if monster.health <= 0:
                             # Tăng số quái vật đã tiêu diệt trong wave
                             self.monsters_killed_in_wave += 1
+                            self.total_kills += 1
                             
                             # Nhận kinh nghiệm khi tiêu diệt quái vật
                             exp_gained = self.player.exp_system.calculate_monster_exp(monster)
@@ -428,7 +468,7 @@ class GameState:
                             if random.random() < self.item_drop_chance:
                                 self.spawn_item(monster.x, monster.y)
                                 
-                            self.monsters.remove(monster)
+                            self.remove_monster(monster)
                             self.score += monster.score_value
                             
                             # Hồi máu khi giết quái (5% máu tối đa)
@@ -461,36 +501,48 @@ class GameState:
                 # Tăng số lượng quái vật cần tiêu diệt theo cấp độ wave
                 self.monsters_per_wave = 10 + (self.level - 1) * 2
                     
-            # Spawn monsters if needed
+            # Spawn monsters if needed (the director paces spawns by update time and monster count)
+            self.wave_manager.director.observe((time.perf_counter() - update_start) * 1000, len(self.monsters))
             new_monster = self.wave_manager.update()
             if new_monster:
                 # Spawn monster at a valid location on the map
                 self.spawn_monster_at_valid_location(new_monster)
                 
-    def spawn_monster_at_valid_location(self, monster):
-        """Spawn monster at a valid location around the player"""
-        max_attempts = 50
-        attempts = 0
-        
-        # Tạo quái vật xung quanh người chơi với khoảng cách từ 300-600 đơn vị
-        spawn_distance = random.randint(300, 600)
-        
-        while attempts < max_attempts:
-            # Tạo góc ngẫu nhiên
-            angle = random.uniform(0, 2 * math.pi)
-            
-            # Tính toán vị trí spawn dựa trên vị trí người chơi
-            monster.x = self.player.x + spawn_distance * math.cos(angle)
-            monster.y = self.player.y + spawn_distance * math.sin(angle)
+    def remove_monster(self, monster):
+        """Remove a dead monster from the game and return it to the pool for reuse"""
+        self.monsters.remove(monster)
+        self.ai_scheduler.forget(monster)
+        self.wave_manager.monster_pool.release(monster)
+        
+    def spawn_summons(self):
+        """Queue new summon requests, then spawn what the queue allows this frame from the monster pool"""
+        for monster in self.monsters:
+            if monster.summon_requests:
+                for request in monster.summon_requests:
+                    self.spawn_queue.push(request)
+                monster.summon_requests.clear()
                 
-            # Check if location is valid
-            if self.game_map.is_passable(monster.x, monster.y):
+        pool = self.wave_manager.monster_pool
+        for request in self.spawn_queue.pop_ready(len(self.monsters)):
+            monster = pool.acquire(request["monster_type"], request["x"], request["y"], request["level"])
+            if is_area_free(self.game_map, monster.x, monster.y, monster.width, monster.height, monster.is_boss):
                 self.monsters.append(monster)
-                return
+            else:
+                pool.release(monster)
                 
-            attempts += 1
+    def spawn_monster_at_valid_location(self, monster):
+        """Spawn monster at a valid location around the player"""
+        # Lấy ô đi qua được cách tâm người chơi 300-600 đơn vị từ chỉ mục dựng sẵn
+        point = self.game_map.spawn_sampler.sample(self.player.x + self.player.width / 2,
+                                                   self.player.y + self.player.height / 2, 300, 600)
+        if point is None:
+            # Không còn ô trống quanh người chơi: bỏ lượt spawn này, trả quái vật về kho
+            self.wave_manager.monster_pool.release(monster)
+            return
             
-        # If no valid location found, just add the monster anyway
+        # Điểm lấy mẫu là tâm quái vật
+        monster.x = point[0] - monster.width / 2
+        monster.y = point[1] - monster.height / 2
         self.monsters.append(monster)
         
     def update_camera(self):
@@ -504,6 +556,10 @@ class GameState:
         self.camera_y += (target_y - self.camera_y) * 0.1
         
         # Không giới hạn camera trong map, cho phép di chuyển tự do trong map vô hạn
+        
+        # Sinh trước các chunk địa hình quanh camera
+        self.game_map.stream_chunks(self.camera_x + self.screen_width / 2,
+                                    self.camera_y + self.screen_height / 2)
                 
     def update_scale(self, scale_x, scale_y):
         """Update scale factors for UI elements"""
@@ -923,6 +979,7 @@ class GameState:
         
         # Draw save/load menu if visible
         self.save_system.draw_save_load_menu(screen, scale_x, scale_y)
+        self.save_system.draw_status(screen, scale_x, scale_y)
         
         # Draw HUD
         self.draw_hud(screen, scale_x, scale_y)
@@ -1,13 +1,23 @@
 import pygame
 import random
+import time
+import math
 from dark_fantasy_game.src.player_enhanced import Player
 from dark_fantasy_game.src.monster import Monster, MonsterType
 from dark_fantasy_game.src.wave_manager import WaveManager
 from dark_fantasy_game.src.map import Map
+from dark_fantasy_game.src.ai_scheduler import AIScheduler
+from dark_fantasy_game.src.spawn_queue import SpawnQueue
+from dark_fantasy_game.src.collision import is_area_free
 from dark_fantasy_game.src.day_night_cycle import DayNightCycle
 from dark_fantasy_game.src.status_effects import StatusEffect, StatusEffectType
 from dark_fantasy_game.src.stats import CharacterClass
 
+# Sân chơi cố định của người chơi (Player.update giữ người chơi trong vùng này)
+FIELD_WIDTH = 800
+FIELD_HEIGHT = 600
+SPAWN_MIN_DISTANCE = 150  # Không cho quái vật xuất hiện sát người chơi (pixel)
+
 # Game states
 class State:
     MAIN_MENU = 0
@@ -22,6 +32,9 @@ class GameState:
         self.player = Player(400, 300, CharacterClass.WARRIOR)
         self.monsters = []
         self.wave_manager = WaveManager()
+        self.ai_scheduler = AIScheduler()  # Cập nhật AI quái vật theo khoảng cách tới người chơi
+        # Quái vật triệu hồi chờ spawn trong giới hạn số quái và ngân sách mỗi frame
+        self.spawn_queue = SpawnQueue(max_monsters=self.wave_manager.director.max_monsters)
         self.score = 0
         self.level = 1
         self.infinity_mode = False
@@ -122,7 +135,9 @@ class GameState:
             
     def start_game(self):
         """Start a new game"""
+        self.wave_manager.monster_pool.release_all(self.monsters)
         self.monsters = []
+        self.spawn_queue.clear()
         self.score = 0
         self.level = 1
         self.wave_manager.start_wave(self.level)
@@ -130,6 +145,8 @@ class GameState:
     def update(self):
         """Update game state"""
         if self.state == State.PLAYING:
+            update_start = time.perf_counter()
+            
             # Update day/night cycle
             self.day_night_cycle.update()
             
@@ -139,9 +156,18 @@ class GameState:
             # Update camera to follow player
             self.update_camera()
             
+            # Cập nhật trường hướng đi về phía người chơi (dùng chung cho mọi quái vật)
+            self.game_map.flow_field.update(self.player.x + self.player.width / 2,
+                                            self.player.y + self.player.height / 2)
+            # Xử lý các yêu cầu tìm đường A* trong giới hạn mỗi frame
+            self.game_map.pathfinder.update()
+            
             # Update monsters
+            # Cập nhật AI quái vật theo tầng khoảng cách, rồi giải quyết va chạm địa hình cho cả nhóm
+            self.ai_scheduler.update(self.monsters, self.player, self.game_map)
+            self.spawn_summons()
+                
             for monster in list(self.monsters):
-                monster.update(self.player, self.game_map)
                 
                 # Check for collisions with player attack
                 attack_rect = self.player.get_attack_rect()
@@ -180,7 +206,7 @@ class GameState:
                                 monster.add_status_effect(StatusEffectType.BURN, 180, 0.5)  # 3 seconds burn
                         
                         if monster.health <= 0:
-                            self.monsters.remove(monster)
+                            self.remove_monster(monster)
                             self.score += monster.score_value
                             
                             # Add experience to player
@@ -210,37 +236,56 @@ class GameState:
                     self.level += 1
                     self.wave_manager.start_wave(self.level)
                     
-            # Spawn monsters if needed
+            # Spawn monsters if needed (the director paces spawns by update time and monster count)
+            self.wave_manager.director.observe((time.perf_counter() - update_start) * 1000, len(self.monsters))
             new_monster = self.wave_manager.update()
             if new_monster:
                 # Spawn monster at a valid location on the map
                 self.spawn_monster_at_valid_location(new_monster)
                 
-    def spawn_monster_at_valid_location(self, monster):
-        """Spawn monster at a valid location on the map"""
-        max_attempts = 50
-        attempts = 0
-        
-        while attempts < max_attempts:
-            # Try to find a valid spawn location
-            if monster.x < 0:  # Left side
-                monster.x = random.randint(50, 150)
-            elif monster.x > 800:  # Right side
-                monster.x = random.randint(650, 750)
-            elif monster.y < 0:  # Top
-                monster.y = random.randint(50, 150)
-            else:  # Bottom
-                monster.y = random.randint(450, 550)
+    def remove_monster(self, monster):
+        """Remove a dead monster from the game and return it to the pool for reuse"""
+        self.monsters.remove(monster)
+        self.ai_scheduler.forget(monster)
+        self.wave_manager.monster_pool.release(monster)
+        
+    def spawn_summons(self):
+        """Queue new summon requests, then spawn what the queue allows this frame from the monster pool"""
+        for monster in self.monsters:
+            if monster.summon_requests:
+                for request in monster.summon_requests:
+                    self.spawn_queue.push(request)
+                monster.summon_requests.clear()
                 
-            # Check if location is valid
-            if self.game_map.is_passable(monster.x, monster.y):
+        pool = self.wave_manager.monster_pool
+        for request in self.spawn_queue.pop_ready(len(self.monsters)):
+            monster = pool.acquire(request["monster_type"], request["x"], request["y"], request["level"])
+            if is_area_free(self.game_map, monster.x, monster.y, monster.width, monster.height, monster.is_boss):
+                self.monsters.append(monster)
+            else:
+                pool.release(monster)
+                
+    def spawn_monster_at_valid_location(self, monster):
+        """Spawn monster at a valid location around the player"""
+        # Lấy ô đi qua được quanh tâm người chơi, xa tới góc xa nhất của sân chơi
+        center_x = self.player.x + self.player.width / 2
+        center_y = self.player.y + self.player.height / 2
+        max_distance = max(math.hypot(corner_x - center_x, corner_y - center_y)
+                           for corner_x in (0, FIELD_WIDTH) for corner_y in (0, FIELD_HEIGHT))
+        points = self.game_map.spawn_sampler.sample_batch(center_x, center_y, 8,
+                                                          SPAWN_MIN_DISTANCE, max_distance)
+        for point_x, point_y in points:
+            # Điểm lấy mẫu là tâm quái vật; quái vật phải nằm trọn trong sân chơi
+            x = point_x - monster.width / 2
+            y = point_y - monster.height / 2
+            if 0 <= x <= FIELD_WIDTH - monster.width and 0 <= y <= FIELD_HEIGHT - monster.height:
+                monster.x = x
+                monster.y = y
                 self.monsters.append(monster)
                 return
                 
-            attempts += 1
-            
-        # If no valid location found, just add the monster anyway
-        self.monsters.append(monster)
+        # Không có điểm hợp lệ trong sân chơi: bỏ lượt spawn này, trả quái vật về kho
+        self.wave_manager.monster_pool.release(monster)
         
     def update_camera(self):
         """Update camera position to follow player"""
@@ -258,6 +303,10 @@ class GameState:
         
         self.camera_x = max(0, min(self.camera_x, max_camera_x))
         self.camera_y = max(0, min(self.camera_y, max_camera_y))
+        
+        # Sinh trước các chunk địa hình quanh camera
+        self.game_map.stream_chunks(self.camera_x + self.screen_width / 2,
+                                    self.camera_y + self.screen_height / 2)
     
     def update_scale(self, scale_x, scale_y):
         """Update scale factors for UI elements"""
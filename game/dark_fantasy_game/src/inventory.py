@@ -1,4 +1,5 @@
 import pygame
+from dark_fantasy_game.src.ui_panel import CachedPanel
 
 # Colors
 WHITE = (255, 255, 255)
@@ -51,6 +52,24 @@ class Item:
             player.stats.update_derived_stats()
             return True
         return False
+        
+    def to_dict(self):
+        """Convert to dictionary for saving"""
+        return {
+            "name": self.name,
+            "description": self.description,
+            "item_type": self.item_type,
+            "value": self.value,
+            "stats_bonus": dict(self.stats_bonus),
+            "equipped": self.equipped
+        }
+        
+    @classmethod
+    def from_dict(cls, data):
+        """Create from dictionary when loading"""
+        item = cls(data["name"], data["description"], data["item_type"], data["value"], data["stats_bonus"])
+        item.equipped = data["equipped"]
+        return item
 
 class Inventory:
     def __init__(self, max_items=20):
@@ -62,7 +81,7 @@ class Inventory:
         # UI elements
         self.font = pygame.font.SysFont(None, 24)
         self.title_font = pygame.font.SysFont(None, 32)
-        self.item_rects = []  # For click detection
+        self.panel = CachedPanel()  # Cached rendering and click detection
         
         # Add some starter items
         self.add_item(Item("Wooden Sword", "A basic training sword", "weapon", 10, {"STR": 1}))
@@ -105,6 +124,27 @@ class Inventory:
                 return True
         return False
         
+    def to_dict(self):
+        """Convert inventory contents to dictionary for saving"""
+        return {
+            "gold": self.gold,
+            "max_items": self.max_items,
+            "items": [item.to_dict() for item in self.items]
+        }
+        
+    def from_dict(self, data):
+        """Replace inventory contents with saved data"""
+        self.gold = data["gold"]
+        self.max_items = data["max_items"]
+        self.items = [Item.from_dict(item_data) for item_data in data["items"]]
+        self.selected_item = None
+        self.panel.invalidate()
+        
+    def get_panel_state(self, width, height):
+        """Build the state key that decides when the inventory panel must be re-rendered"""
+        items_state = tuple((id(item), item.equipped) for item in self.items)
+        return (width, height, self.gold, id(self.selected_item), items_state)
+        
     def draw(self, screen, x, y, width=350, height=400):
         """Draw the inventory at the specified position"""
         # Get screen dimensions
@@ -115,73 +155,81 @@ class Inventory:
         x = max(10, min(x, screen_width - width - 10))
         y = max(10, min(y, screen_height - height - 10))
         
+        # Draw cached panel, re-rendering only when items or selection change
+        self.panel.draw(screen, x, y, self.get_panel_state(width, height),
+                        lambda: self.render_panel(width, height))
+        
+    def render_panel(self, width, height):
+        """Render the inventory to an off-screen surface and return it with its layout rects"""
+        rects = {}
+        
         # Draw background
-        inventory_surface = pygame.Surface((width, height))
-        inventory_surface.set_alpha(230)
-        inventory_surface.fill(BLACK)
-        screen.blit(inventory_surface, (x, y))
+        inventory_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        inventory_surface.fill((*BLACK, 230))
         
         # Draw title
         title_text = self.title_font.render("Inventory", True, GOLD)
-        screen.blit(title_text, (x + 20, y + 10))
+        inventory_surface.blit(title_text, (20, 10))
         
         # Draw gold
         gold_text = self.font.render(f"Gold: {self.gold}", True, GOLD)
-        screen.blit(gold_text, (x + width - 120, y + 10))
+        inventory_surface.blit(gold_text, (width - 120, 10))
         
         # Draw items
-        item_y = y + 50
-        self.item_rects = []
+        item_y = 50
         
         for i, item in enumerate(self.items):
             # Item background
-            item_rect = pygame.Rect(x + 10, item_y, width - 20, 30)
-            self.item_rects.append((item_rect, item))
+            item_rect = pygame.Rect(10, item_y, width - 20, 30)
+            rects[i] = item_rect
             
             # Highlight selected item
             if item == self.selected_item:
-                pygame.draw.rect(screen, GRAY, item_rect)
+                pygame.draw.rect(inventory_surface, GRAY, item_rect)
             else:
-                pygame.draw.rect(screen, DARK_GRAY, item_rect)
+                pygame.draw.rect(inventory_surface, DARK_GRAY, item_rect)
                 
             # Item name and type
             equipped_text = " [E]" if item.equipped else ""
             item_text = self.font.render(f"{item.name}{equipped_text}", True, WHITE)
-            screen.blit(item_text, (x + 20, item_y + 5))
+            inventory_surface.blit(item_text, (20, item_y + 5))
             
             # Item type
             type_text = self.font.render(item.item_type, True, GRAY)
-            screen.blit(type_text, (x + width - 100, item_y + 5))
+            inventory_surface.blit(type_text, (width - 100, item_y + 5))
             
             item_y += 35
             
         # Draw selected item details
         if self.selected_item:
-            detail_y = y + height - 100
+            detail_y = height - 100
             
             # Draw separator line
-            pygame.draw.line(screen, GRAY, (x + 10, detail_y - 10), (x + width - 10, detail_y - 10))
+            pygame.draw.line(inventory_surface, GRAY, (10, detail_y - 10), (width - 10, detail_y - 10))
             
             # Item description
             desc_text = self.font.render(self.selected_item.description, True, WHITE)
-            screen.blit(desc_text, (x + 20, detail_y))
+            inventory_surface.blit(desc_text, (20, detail_y))
             
             # Item value
             value_text = self.font.render(f"Value: {self.selected_item.value} gold", True, GOLD)
-            screen.blit(value_text, (x + 20, detail_y + 25))
+            inventory_surface.blit(value_text, (20, detail_y + 25))
             
             # Item stat bonuses
             bonus_y = detail_y + 50
             for stat, bonus in self.selected_item.stats_bonus.items():
                 bonus_text = self.font.render(f"{stat}: +{bonus}", True, WHITE)
-                screen.blit(bonus_text, (x + 20, bonus_y))
+                inventory_surface.blit(bonus_text, (20, bonus_y))
                 bonus_y += 20
+                
+        return inventory_surface, rects
     
     def handle_click(self, pos):
         """Handle mouse clicks on the inventory"""
-        for rect, item in self.item_rects:
-            if rect.collidepoint(pos):
-                self.selected_item = item
-                print(f"Selected item: {item.name}")
-                return True
+        index = self.panel.hit_test(pos)
+        if index is not None and index < len(self.items):
+            item = self.items[index]
+            self.selected_item = item
+            print(f"Selected item: {item.name}")
+            return True
         return False
@@ -1,11 +1,72 @@
 import pygame
 import random
 import os
+import numpy as np
+from dark_fantasy_game.src.terrain_generator import TerrainGenerator, GENERATOR_VERSION
+from dark_fantasy_game.src.world_chunks import ChunkManager
+from dark_fantasy_game.src.map_cache import MapCache
+from dark_fantasy_game.src.pathfinding import FlowField, PathfindingService
+from dark_fantasy_game.src.spawn_sampler import SpawnSampler
 
 class Tile:
     def __init__(self, tile_type, passable=True):
         self.tile_type = tile_type
         self.passable = passable
+
+# Bảng palette: id (uint8) -> loại tile, khả năng đi qua và màu
+TILE_TYPES = ['grass', 'dirt', 'stone', 'water', 'tree', 'wall']
+TILE_IDS = {tile_type: tile_id for tile_id, tile_type in enumerate(TILE_TYPES)}
+TILE_PASSABLE = np.array([True, True, True, False, False, False], dtype=bool)
+TILE_COLORS = np.array([
+    (34, 139, 34),    # grass - Xanh lá đậm
+    (139, 69, 19),    # dirt - Nâu
+    (169, 169, 169),  # stone - Xám
+    (65, 105, 225),   # water - Xanh dương
+    (0, 100, 0),      # tree - Xanh lá đậm hơn
+    (105, 105, 105),  # wall - Xám đậm
+], dtype=np.uint8)
+
+# Mỗi id dùng chung một Tile (chỉ đọc) cho giao diện tương thích tiles[y][x]
+TILE_PALETTE = [Tile(tile_type, bool(TILE_PASSABLE[tile_id])) for tile_id, tile_type in enumerate(TILE_TYPES)]
+
+class TileRow:
+    """Một hàng của lưới tile, trả về Tile dùng chung từ palette"""
+    def __init__(self, game_map, y):
+        self.game_map = game_map
+        self.y = y
+        
+    def __len__(self):
+        return self.game_map.width
+        
+    def __getitem__(self, x):
+        return TILE_PALETTE[self.game_map.get_tile_id(x, self.y)]
+        
+    def __setitem__(self, x, tile):
+        # Khả năng đi qua lấy theo palette của loại tile để mask luôn khớp với lưới id
+        self.game_map.set_tile(x, self.y, tile.tile_type)
+        
+    def __iter__(self):
+        for tile_id in self.game_map.chunks.get_window(0, self.y, self.game_map.width, 1)[0]:
+            yield TILE_PALETTE[tile_id]
+
+class TileGrid:
+    """Giao diện tương thích tiles[y][x] trên các chunk của Map
+    
+    len() và vòng lặp chỉ đi qua vùng width x height ban đầu, nhưng có thể
+    truy cập bất kỳ tọa độ nào (kể cả âm) vì thế giới không có biên.
+    """
+    def __init__(self, game_map):
+        self.game_map = game_map
+        
+    def __len__(self):
+        return self.game_map.height
+        
+    def __getitem__(self, y):
+        return TileRow(self.game_map, y)
+        
+    def __iter__(self):
+        for y in range(self.game_map.height):
+            yield TileRow(self.game_map, y)
         
 class Minimap:
     def __init__(self, game_map, size=150):
@@ -16,6 +77,9 @@ class Minimap:
         self.zoom_factor = 1.0
         self.surface = pygame.Surface((size, size))
         self.position = (20, 20)  # Vị trí góc trên bên phải
+        self.terrain_surface = None  # Ảnh địa hình đã thu nhỏ (cache)
+        self.terrain_key = None
+        self.view_range = 300  # Số ô hiển thị theo mỗi chiều khi không phóng to
         
     def toggle_visibility(self):
         self.visible = not self.visible
@@ -37,46 +101,30 @@ class Minimap:
         # Vẽ nền cho minimap
         self.surface.fill((0, 0, 0))
         
-        # Tính tỷ lệ giữa kích thước minimap và kích thước thực của map
-        map_width_pixels = self.game_map.width * self.game_map.tile_size
-        map_height_pixels = self.game_map.height * self.game_map.tile_size
+        # Vùng địa hình quanh người chơi (tính theo ô), gióng theo bước 8 ô để ít phải vẽ lại
+        tile_size = self.game_map.tile_size
+        view_tiles = int(self.view_range / self.zoom_factor)
+        player_tile_x = int(player_x // tile_size)
+        player_tile_y = int(player_y // tile_size)
+        origin_x = (player_tile_x - view_tiles // 2) // 8 * 8
+        origin_y = (player_tile_y - view_tiles // 2) // 8 * 8
         
-        scale_x = self.size / map_width_pixels
-        scale_y = self.size / map_height_pixels
-        
-        # Vẽ các tile lên minimap với màu tương ứng
-        for y in range(self.game_map.height):
-            for x in range(self.game_map.width):
-                tile = self.game_map.tiles[y][x]
-                
-                # Xác định màu cho từng loại tile
-                if tile.tile_type == 'grass':
-                    color = (34, 139, 34)
-                elif tile.tile_type == 'dirt':
-                    color = (139, 69, 19)
-                elif tile.tile_type == 'stone':
-                    color = (169, 169, 169)
-                elif tile.tile_type == 'water':
-                    color = (65, 105, 225)
-                elif tile.tile_type == 'tree':
-                    color = (0, 100, 0)
-                elif tile.tile_type == 'wall':
-                    color = (105, 105, 105)
-                else:
-                    color = (255, 255, 255)
-                
-                # Tính toán vị trí và kích thước của tile trên minimap
-                mini_x = int(x * self.game_map.tile_size * scale_x)
-                mini_y = int(y * self.game_map.tile_size * scale_y)
-                mini_width = max(1, int(self.game_map.tile_size * scale_x))
-                mini_height = max(1, int(self.game_map.tile_size * scale_y))
-                
-                # Vẽ tile
-                pygame.draw.rect(self.surface, color, (mini_x, mini_y, mini_width, mini_height))
+        # Vẽ các tile lên minimap với màu tương ứng (chỉ từ các chunk đã nạp)
+        chunks = self.game_map.chunks
+        terrain_key = (self.size, origin_x, origin_y, self.game_map.revision, chunks.load_count)
+        if self.terrain_surface is None or self.terrain_key != terrain_key:
+            window = chunks.get_window(origin_x, origin_y, view_tiles, view_tiles, load=False)
+            loaded = window < len(TILE_COLORS)
+            colors = np.zeros(window.shape + (3,), dtype=np.uint8)
+            colors[loaded] = TILE_COLORS[window[loaded]]
+            terrain = pygame.surfarray.make_surface(colors.swapaxes(0, 1))
+            self.terrain_surface = pygame.transform.scale(terrain, (self.size, self.size))
+            self.terrain_key = terrain_key
+        self.surface.blit(self.terrain_surface, (0, 0))
         
         # Vẽ vị trí người chơi (điểm đỏ)
-        player_mini_x = int((player_x / map_width_pixels) * self.size)
-        player_mini_y = int((player_y / map_height_pixels) * self.size)
+        player_mini_x = int((player_x / tile_size - origin_x) / view_tiles * self.size)
+        player_mini_y = int((player_y / tile_size - origin_y) / view_tiles * self.size)
         pygame.draw.circle(self.surface, (255, 0, 0), (player_mini_x, player_mini_y), 3)
         
         # Vẽ viền cho minimap
@@ -86,16 +134,23 @@ class Minimap:
         screen.blit(self.surface, self.position)
         
 class Map:
-    def __init__(self, width, height):
-        # Tăng kích thước map lên rất lớn để tạo cảm giác vô hạn
+    def __init__(self, width, height, seed=None):
+        # Thế giới không có biên: width x height chỉ là vùng khởi đầu (người chơi xuất hiện ở giữa)
         self.width = width * 4
         self.height = height * 4
         self.tile_size = 32
-        self.tiles = []
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)  # Cùng seed -> cùng map
+        self.chunk_size = 64  # Kích thước chunk (ô)
+        self.stream_radius = 2  # Số chunk quanh camera được sinh trước
+        self.tiles = TileGrid(self)  # Truy cập kiểu cũ tiles[y][x]
+        self.revision = 0  # Tăng mỗi khi địa hình thay đổi
         self.objects = []
         self.load_tiles()
         self.generate_map()
         self.minimap = Minimap(self)
+        self.flow_field = FlowField(self)  # Hướng đi chung về phía người chơi
+        self.pathfinder = PathfindingService(self)  # Tìm đường A* cho boss, tuần tra, đánh xa
+        self.spawn_sampler = SpawnSampler(self)  # Điểm xuất hiện hợp lệ quanh người chơi
         
     def load_tiles(self):
         # Tạo các tile đơn giản
@@ -117,62 +172,81 @@ class Map:
         self.tile_images['wall'].fill((105, 105, 105))  # Xám đậm
         
     def generate_map(self):
-        # Tạo map trống với cỏ
-        self.tiles = [[Tile('grass', True) for _ in range(self.width)] for _ in range(self.height)]
+        # Sinh địa hình (cỏ, đất, đá, nước, cây) từ seed theo từng chunk khi cần
+        # Không thêm tường bao quanh map để tạo cảm giác vô hạn
+        generator = TerrainGenerator(self.seed, (self.width // 2, self.height // 2))
+        self.chunks = ChunkManager(generator, TILE_PASSABLE, self.chunk_size)
         
-        # Thêm các vùng đất
-        self.generate_regions('dirt', 40, 15)
+        # Vùng khởi đầu được lưu trên đĩa theo seed: nạp bằng memory-map nếu có,
+        # nếu chưa thì sinh và lưu trong luồng nền cho lần sau
+        self.map_cache = MapCache()
+        base_grid = self.map_cache.load(self.seed, self.width, self.height)
+        if base_grid is not None:
+            self.chunks.set_base_grid(base_grid)
+        else:
+            self.map_cache.build_async(generator, self.seed, self.width, self.height,
+                                       self.chunks.set_base_grid)
         
-        # Thêm các vùng đá
-        self.generate_regions('stone', 30, 10)
+        # Sinh trước vùng người chơi xuất hiện
+        self.chunks.request_area(self.width // 2, self.height // 2, self.stream_radius)
         
-        # Thêm các vùng nước
-        self.generate_regions('water', 20, 8, False)  # Nước không thể đi qua
+    def to_dict(self):
+        """Lưu map dưới dạng seed và các ô đã bị thay đổi, không lưu toàn bộ địa hình"""
+        return {
+            "seed": self.seed,
+            "generator_version": GENERATOR_VERSION,
+            "width": self.width,
+            "height": self.height,
+            "tile_overrides": [
+                [tile_x, tile_y, int(tile_id), bool(passable)]
+                for (tile_x, tile_y), (tile_id, passable) in self.chunks.overrides.items()
+            ]
+        }
         
-        # Thêm cây (không thể đi qua)
-        self.add_obstacles('tree', 200, False)
+    @classmethod
+    def from_dict(cls, data):
+        """Tạo lại map từ seed đã lưu"""
+        if data.get("generator_version") != GENERATOR_VERSION:
+            print(f"Warning: map was saved with terrain generator version {data.get('generator_version')}, "
+                  f"current version is {GENERATOR_VERSION}")
+        game_map = cls(data["width"] // 4, data["height"] // 4, data["seed"])
+        for tile_x, tile_y, tile_id, passable in data.get("tile_overrides", []):
+            game_map.chunks.overrides[(tile_x, tile_y)] = (tile_id, passable)
+        return game_map
         
-        # Không thêm tường bao quanh map để tạo cảm giác vô hạn
+    def stream_chunks(self, x, y):
+        """Yêu cầu sinh trước các chunk quanh vị trí (x, y) tính theo pixel"""
+        self.chunks.request_area(int(x // self.tile_size), int(y // self.tile_size), self.stream_radius)
+        
+    def set_tile(self, x, y, tile_type, passable=None):
+        """Đặt loại tile tại ô (x, y)"""
+        if passable is None:
+            passable = TILE_PASSABLE[TILE_IDS[tile_type]]
+        self.chunks.set_tile(x, y, TILE_IDS[tile_type], bool(passable))
+        self.revision += 1
+        
+    def get_tile_id(self, tile_x, tile_y):
+        """Lấy id tile tại ô (tile_x, tile_y)"""
+        chunk = self.chunks.get_chunk(tile_x // self.chunk_size, tile_y // self.chunk_size)
+        return chunk.tile_ids[tile_y % self.chunk_size, tile_x % self.chunk_size]
+        
+    def get_tile_type(self, tile_x, tile_y):
+        """Lấy tên loại tile tại ô (tile_x, tile_y)"""
+        return TILE_TYPES[self.get_tile_id(tile_x, tile_y)]
+        
+    def is_cell_passable(self, tile_x, tile_y):
+        """Kiểm tra ô (tile_x, tile_y) có thể đi qua không"""
+        chunk = self.chunks.get_chunk(tile_x // self.chunk_size, tile_y // self.chunk_size)
+        return bool(chunk.passable_mask[tile_y % self.chunk_size, tile_x % self.chunk_size])
         
-    def generate_regions(self, tile_type, num_regions, max_size, passable=True):
-        for _ in range(num_regions):
-            # Chọn điểm bắt đầu ngẫu nhiên
-            x = random.randint(1, self.width - max_size - 1)
-            y = random.randint(1, self.height - max_size - 1)
-            
-            # Kích thước ngẫu nhiên
-            size_x = random.randint(3, max_size)
-            size_y = random.randint(3, max_size)
-            
-            # Tạo vùng
-            for i in range(size_y):
-                for j in range(size_x):
-                    if 0 <= y + i < self.height and 0 <= x + j < self.width:
-                        # Tạo viền không đều
-                        if random.random() < 0.8:
-                            self.tiles[y + i][x + j] = Tile(tile_type, passable)
-    
-    def add_obstacles(self, tile_type, count, passable=False):
-        placed = 0
-        while placed < count:
-            x = random.randint(1, self.width - 2)
-            y = random.randint(1, self.height - 2)
-            
-            # Chỉ đặt trên cỏ hoặc đất
-            if self.tiles[y][x].tile_type in ['grass', 'dirt'] and self.tiles[y][x].passable:
-                self.tiles[y][x] = Tile(tile_type, passable)
-                placed += 1
-    
     def is_passable(self, x, y):
         # Kiểm tra xem vị trí có thể đi qua không
         tile_x = int(x // self.tile_size)
         tile_y = int(y // self.tile_size)
         
-        # Xử lý trường hợp ra ngoài biên map - tạo cảm giác vô hạn bằng cách wrap around
-        tile_x = tile_x % self.width
-        tile_y = tile_y % self.height
-        
-        return self.tiles[tile_y][tile_x].passable
+        # Tra cứu qua chunk chứa ô - thế giới không có biên nên không cần wrap around
+        chunk = self.chunks.get_chunk(tile_x // self.chunk_size, tile_y // self.chunk_size)
+        return bool(chunk.passable_mask[tile_y % self.chunk_size, tile_x % self.chunk_size])
     
     def draw(self, screen, camera_x=0, camera_y=0, scale_x=1.0, scale_y=1.0):
         # Vẽ map với camera offset
@@ -183,13 +257,12 @@ class Map:
         start_x = int(camera_x // self.tile_size)
         start_y = int(camera_y // self.tile_size)
         
+        # Lấy các tile trong vùng nhìn thấy từ chunk
+        window = self.chunks.get_window(start_x - 1, start_y - 1, visible_width + 2, visible_height + 2)
+        
         # Vẽ các tile trong vùng nhìn thấy
         for y_offset in range(-1, visible_height + 1):
             for x_offset in range(-1, visible_width + 1):
-                # Tính toán vị trí tile trong map (với wrap around)
-                tile_x = (start_x + x_offset) % self.width
-                tile_y = (start_y + y_offset) % self.height
-                
                 # Tính toán vị trí vẽ trên màn hình
                 screen_x = int(((start_x + x_offset) * self.tile_size - camera_x) * scale_x)
                 screen_y = int(((start_y + y_offset) * self.tile_size - camera_y) * scale_y)
@@ -199,6 +272,6 @@ class Map:
                 scaled_size_y = int(self.tile_size * scale_y)
                 
                 # Vẽ tile
-                tile_type = self.tiles[tile_y][tile_x].tile_type
+                tile_type = TILE_TYPES[window[y_offset + 1, x_offset + 1]]
                 scaled_tile = pygame.transform.scale(self.tile_images[tile_type], (scaled_size_x, scaled_size_y))
                 screen.blit(scaled_tile, (screen_x, screen_y))
@@ -0,0 +1,89 @@
+import os
+import sys
+import threading
+import numpy as np
+from dark_fantasy_game.src.terrain_generator import GENERATOR_VERSION
+
+def get_user_cache_directory():
+    """Thư mục cache của người dùng cho game (không ghi vào thư mục mã nguồn)"""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+    else:
+        base = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(base, "dark_fantasy_game")
+
+class MapCache:
+    """Lưu lưới id tile của vùng khởi đầu xuống đĩa (.npy) và đọc lại bằng memory-map
+    
+    File được đặt tên theo seed, phiên bản bộ sinh địa hình và kích thước, nên
+    cache cũ tự động không còn được dùng khi thuật toán sinh thay đổi.
+    Seed được lưu trong file save, nên nạp lại một game đã lưu sẽ đọc map
+    từ cache thay vì sinh lại.
+    """
+    def __init__(self, cache_directory=None, max_files=8):
+        if cache_directory is None:
+            cache_directory = os.path.join(get_user_cache_directory(), "maps")
+        self.cache_directory = cache_directory
+        self.max_files = max_files  # Số map tối đa giữ trên đĩa
+        os.makedirs(self.cache_directory, exist_ok=True)
+        
+    def get_cache_file(self, seed, width, height):
+        """Đường dẫn file cache cho seed và kích thước"""
+        return os.path.join(self.cache_directory, f"map_{seed}_v{GENERATOR_VERSION}_{width}x{height}.npy")
+        
+    def load(self, seed, width, height):
+        """Memory-map lưới tile đã lưu, trả về None nếu chưa có hoặc bị hỏng"""
+        cache_file = self.get_cache_file(seed, width, height)
+        if not os.path.exists(cache_file):
+            return None
+            
+        try:
+            tile_ids = np.load(cache_file, mmap_mode='r')
+            if tile_ids.shape != (height, width) or tile_ids.dtype != np.uint8:
+                print(f"Ignoring map cache with unexpected shape: {cache_file}")
+                return None
+            # Cập nhật thời gian sửa để prune() xóa các map lâu không dùng nhất
+            os.utime(cache_file)
+            return tile_ids
+        except Exception as e:
+            print(f"Error loading map cache: {e}")
+            return None
+            
+    def store(self, seed, tile_ids):
+        """Ghi lưới tile xuống đĩa (ghi file tạm rồi đổi tên) và trả về bản memory-map"""
+        height, width = tile_ids.shape
+        cache_file = self.get_cache_file(seed, width, height)
+        temp_file = f"{cache_file}.{os.getpid()}.tmp"  # Mỗi tiến trình một file tạm riêng
+        
+        try:
+            with open(temp_file, 'wb') as f:
+                np.save(f, tile_ids)
+            os.replace(temp_file, cache_file)
+            self.prune()
+        except Exception as e:
+            print(f"Error saving map cache: {e}")
+            return None
+            
+        return self.load(seed, width, height)
+        
+    def prune(self):
+        """Xóa các file cache cũ nhất khi vượt quá max_files"""
+        cache_files = [os.path.join(self.cache_directory, name)
+                       for name in os.listdir(self.cache_directory) if name.endswith(".npy")]
+        cache_files.sort(key=os.path.getmtime, reverse=True)
+        for cache_file in cache_files[self.max_files:]:
+            try:
+                os.remove(cache_file)
+            except OSError as e:
+                print(f"Error removing old map cache: {e}")
+                
+    def build_async(self, generator, seed, width, height, callback=None):
+        """Sinh vùng width x height trong luồng nền, lưu vào cache rồi gọi callback(tile_ids)"""
+        def build():
+            tile_ids = self.store(seed, generator.generate(width, height))
+            if tile_ids is not None and callback is not None:
+                callback(tile_ids)
+                
+        thread = threading.Thread(target=build, daemon=True)
+        thread.start()
+        return thread
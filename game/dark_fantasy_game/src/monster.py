@@ -4,51 +4,64 @@ import math
 import os
 from enum import Enum
 from dark_fantasy_game.src.animation import Animation
-from dark_fantasy_game.src.monster_types import MonsterType, MonsterAbility, MonsterBehavior, MonsterStats
+from dark_fantasy_game.src.monster_types import (MonsterType, MonsterAbility, MonsterBehavior, MonsterState,
+                                                 get_monster_stats)
+from dark_fantasy_game.src.monster_behaviors import (STATES, CHASING_STATES, ABILITIES, get_machine,
+                                                     run_behaviors)
+from dark_fantasy_game.src.collision import resolve_moves, get_clearance
 
 class Monster:
     def __init__(self, monster_type, x, y, level=1):
         self.monster_type = monster_type
+        self.current_state = "walk"
+        self.load_animations()
+        self.reset(x, y, level)
+        
+    def reset(self, x, y, level=1):
+        """Đặt lại chỉ số và toàn bộ trạng thái như quái vật mới tạo
+        
+        Animation đã tải được giữ lại và chỉ quay về frame đầu, nhờ vậy
+        MonsterPool có thể tái sử dụng quái vật đã chết thay vì tạo mới.
+        """
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.level = level
         
         # Xác định xem có phải boss không
-        self.is_boss = monster_type in [
+        self.is_boss = self.monster_type in [
             MonsterType.DRAGON, 
             MonsterType.NECROMANCER, 
             MonsterType.DEMON_LORD, 
             MonsterType.LICH
         ]
         
-        # Khởi tạo chỉ số từ MonsterStats
-        self.stats = MonsterStats(monster_type, level, self.is_boss)
+        # Chỉ số gốc dùng chung cho cùng loại và cấp (xem get_monster_stats)
+        self.stats = get_monster_stats(self.monster_type, level, self.is_boss)
         
-        # Lấy các thuộc tính từ stats
-        self.max_health = self.stats.max_health
+        # Chỉ giữ trên quái vật các giá trị có thể thay đổi trong trận
         self.health = self.stats.health
         self.damage = self.stats.damage
         self.speed = self.stats.speed
-        self.attack_range = self.stats.attack_range
-        self.attack_cooldown_max = self.stats.attack_cooldown
-        self.score_value = self.stats.score_value
         self.width = self.stats.width
         self.height = self.stats.height
-        self.color = self.stats.color
-        self.abilities = self.stats.abilities
-        self.behavior = self.stats.behavior
         
         # Hướng di chuyển
         self.direction_timer = 0
         self.direction_change_time = 120  # frames
+        self.update_ticks = 1  # Số frame lần cập nhật AI gần nhất phải bù (bộ lập lịch AI có thể bỏ qua frame)
+        self.ai_tick = None  # Frame bộ lập lịch AI cập nhật quái vật gần nhất (None = chưa từng)
         self.direction_x = 0
         self.direction_y = 0
         self.change_direction()
         
         # Trạng thái animation
-        self.current_state = "walk"
         self.facing_right = True
-        self.load_animations()
+        for animation in self.animations.values():
+            animation.reset()
+        self.current_state = "walk"
+        self.current_animation = self.animations["walk"]
         
         # Cooldown tấn công
         self.attack_cooldown = 0
@@ -76,6 +89,9 @@ class Monster:
         # Các biến cho hành vi
         self.patrol_points = []
         self.current_patrol_point = 0
+        self.patrol_radius = 200  # Bán kính tạo điểm tuần tra quanh vị trí xuất hiện
+        self.path = []  # Các điểm trên đường A* đang đi theo
+        self.path_goal = None  # Ô đích của đường đang đi
         self.was_attacked = False
         self.target_x = 0
         self.target_y = 0
@@ -83,9 +99,46 @@ class Monster:
         self.berserker_threshold = 0.3  # Kích hoạt berserker khi máu dưới 30%
         self.berserker_active = False
         
+        # Máy trạng thái hành vi (xem monster_behaviors)
+        self.machine = get_machine(self.behavior, self.is_boss)
+        self.set_state(self.machine.initial)
+        
         # Hiệu ứng
         self.effects = []
         
+        # Yêu cầu triệu hồi chờ GameState chuyển vào hàng đợi spawn
+        self.summon_requests = []
+        
+    # Chỉ số không đổi đọc thẳng từ bảng dùng chung
+    
+    @property
+    def max_health(self):
+        return self.stats.max_health
+        
+    @property
+    def attack_range(self):
+        return self.stats.attack_range
+        
+    @property
+    def attack_cooldown_max(self):
+        return self.stats.attack_cooldown
+        
+    @property
+    def score_value(self):
+        return self.stats.score_value
+        
+    @property
+    def color(self):
+        return self.stats.color
+        
+    @property
+    def abilities(self):
+        return self.stats.abilities
+        
+    @property
+    def behavior(self):
+        return self.stats.behavior
+        
     def load_animations(self):
         base_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets", "sprites")
         
@@ -136,99 +189,121 @@ class Monster:
             
     def update(self, player, game_map=None, monsters=None):
         """Cập nhật vị trí và hành vi của quái vật"""
-        if self.health <= 0:
+        if not self.update_behavior(player, game_map, monsters):
             return
+        if game_map:
+            self.resolve_collision(resolve_moves(game_map, [self], [(self.prev_x, self.prev_y)])[0])
+        self.update_state(player)
+        
+    def update_behavior(self, player, game_map=None, monsters=None, ticks=1):
+        """Cooldown, hành vi và khả năng đặc biệt - quyết định vị trí muốn tới (chưa xét địa hình)
+        
+        ticks là số frame đã trôi qua từ lần cập nhật trước; cooldown và quãng
+        đường đi được bù theo ticks. Trả về False nếu quái vật không hoạt động (đã chết...).
+        """
+        return bool(run_behaviors([(self, ticks)], player, game_map, monsters))
+        
+    def set_state(self, state):
+        """Chuyển sang trạng thái hành vi mới và đặt lại bộ đếm thời gian của trạng thái"""
+        self.state = state
+        self.state_timer = 0
+        duration = STATES[state]["duration"]
+        self.state_duration = duration if duration is not None else float('inf')
+        
+    def get_record(self):
+        """Trạng thái trong trận của quái vật dưới dạng bản ghi phẳng để lưu game (xem save_format.MONSTER)
+        
+        Chỉ số gốc không cần lưu: chúng được tính lại từ loại và cấp độ.
+        """
+        flags = (self.facing_right | self.is_invisible << 1 | self.was_attacked << 2 |
+                 self.berserker_active << 3 | self.is_attacking << 4)
+        return (self.monster_type.value, self.x, self.y, self.health, self.level,
+                self.damage, self.speed, self.direction_x, self.direction_y,
+                self.state.value, self.state_timer, self.attack_cooldown, self.ability_cooldown,
+                self.summon_cooldown, self.teleport_cooldown, self.invisibility_timer, flags) + self.get_phase_record()
+        
+    def get_phase_record(self):
+        """Phần bản ghi dành cho giai đoạn của boss (giai đoạn, cooldown đòn đặc biệt, thời gian chuyển giai đoạn)"""
+        return (0, 0.0, 0.0)
+        
+    def apply_record(self, record):
+        """Khôi phục trạng thái từ get_record(); quái vật phải vừa được reset với cùng loại, vị trí và cấp độ"""
+        (_, _, _, self.health, _, self.damage, self.speed, self.direction_x, self.direction_y,
+         state, state_timer, self.attack_cooldown, self.ability_cooldown, self.summon_cooldown,
+         self.teleport_cooldown, self.invisibility_timer, flags) = record[:17]
+        self.set_state(MonsterState(state))
+        self.state_timer = state_timer
+        self.facing_right = bool(flags & 1)
+        self.is_invisible = bool(flags & 2)
+        self.was_attacked = bool(flags & 4)
+        self.berserker_active = bool(flags & 8)
+        self.is_attacking = bool(flags & 16)
+        self.apply_phase_record(record[17:])
+        
+    def apply_phase_record(self, phase_record):
+        pass
+        
+    def begin_update(self, player, game_map=None, ticks=1):
+        """Cooldown, hiệu ứng và chuyển trạng thái; trả về False nếu quái vật không hoạt động frame này"""
+        if self.health <= 0:
+            return False
             
-        old_x, old_y = self.x, self.y
+        self.prev_x, self.prev_y = self.x, self.y
+        self.update_ticks = ticks
         
         # Cập nhật cooldown
-        if self.attack_cooldown > 0:
-            self.attack_cooldown -= 1
-            
-        if self.ability_cooldown > 0:
-            self.ability_cooldown -= 1
-            
-        if self.teleport_cooldown > 0:
-            self.teleport_cooldown -= 1
-            
-        if self.summon_cooldown > 0:
-            self.summon_cooldown -= 1
+        self.attack_cooldown = max(0, self.attack_cooldown - ticks)
+        self.ability_cooldown = max(0, self.ability_cooldown - ticks)
+        self.teleport_cooldown = max(0, self.teleport_cooldown - ticks)
+        self.summon_cooldown = max(0, self.summon_cooldown - ticks)
             
         # Cập nhật hiệu ứng tàng hình
         if self.is_invisible:
-            self.invisibility_timer -= 1
+            self.invisibility_timer -= ticks
             if self.invisibility_timer <= 0:
                 self.is_invisible = False
                 
-        # Kiểm tra chế độ berserker
-        if self.behavior == MonsterBehavior.BERSERKER and self.health < self.max_health * self.berserker_threshold:
-            if not self.berserker_active:
-                self.berserker_active = True
-                self.damage = int(self.damage * 1.5)
-                self.speed = self.speed * 1.3
-                
-        # Xử lý hành vi dựa trên loại
-        if self.behavior == MonsterBehavior.AGGRESSIVE or self.is_boss:
-            self.chase_player(player)
-        elif self.behavior == MonsterBehavior.DEFENSIVE:
-            if self.was_attacked:
-                self.chase_player(player)
-            else:
-                self.wander()
-        elif self.behavior == MonsterBehavior.RANGED:
-            # Giữ khoảng cách với người chơi
-            self.keep_distance(player)
-        elif self.behavior == MonsterBehavior.PATROL:
-            self.patrol()
-        elif self.behavior == MonsterBehavior.AMBUSH:
-            # Nếu người chơi đến gần và quái vật đang tàng hình, tấn công
-            if self.is_player_in_range(player) and self.is_invisible:
-                self.is_invisible = False
-                self.chase_player(player)
-            # Nếu không ở gần người chơi, tàng hình và đứng yên
-            elif not self.is_player_in_range(player):
-                if not self.is_invisible and self.ability_cooldown <= 0:
-                    self.use_ability(MonsterAbility.INVISIBLE)
-                # Đứng yên khi tàng hình
-                if self.is_invisible:
-                    pass
-                else:
-                    self.wander()
-            else:
-                self.chase_player(player)
-        elif self.behavior == MonsterBehavior.SWARM:
-            # Tính toán số lượng quái vật gần đó
-            if monsters:
-                nearby_monsters = 0
-                for monster in monsters:
-                    if monster != self:
-                        dx = monster.x - self.x
-                        dy = monster.y - self.y
-                        distance = math.sqrt(dx * dx + dy * dy)
-                        if distance < 150:  # Trong phạm vi 150 đơn vị
-                            nearby_monsters += 1
-                
-                # Tăng sức mạnh dựa trên số lượng quái vật gần đó
-                self.swarm_bonus = nearby_monsters * 0.1  # Mỗi quái vật tăng 10% sức mạnh
-            
-            self.chase_player(player)
-        else:
-            self.wander()
-            
-        # Sử dụng khả năng đặc biệt nếu có thể
+        # Chuyển trạng thái theo bảng của hành vi
+        self.state_timer += ticks
+        self.machine.step(self, player)
+        return True
+        
+    def end_update(self, player, game_map=None, monsters=None):
+        """Sử dụng khả năng đặc biệt nếu có thể"""
         if self.ability_cooldown <= 0 and len(self.abilities) > 0:
             # Chọn ngẫu nhiên một khả năng
             ability = random.choice(self.abilities)
-            self.use_ability(ability, player, monsters)
+            self.use_ability(ability, player, monsters, game_map)
             
-        # Kiểm tra va chạm với bản đồ
-        if game_map:
-            if not game_map.is_passable(self.x, self.y):
-                # Quay lại vị trí cũ nếu không thể đi qua
-                self.x, self.y = old_x, old_y
-                # Đổi hướng
-                self.change_direction()
-        
+    def update_coarse(self, player, ticks):
+        """Cập nhật thô cho quái vật ở xa: chỉ di chuyển, bỏ qua cooldown, khả năng và animation"""
+        if self.health <= 0:
+            return False
+            
+        self.prev_x, self.prev_y = self.x, self.y
+        if self.state in CHASING_STATES:
+            # Đi thẳng về phía người chơi; tìm đường chính xác khi đã vào gần
+            center_x, center_y = self.get_center()
+            dx = player.x + player.width / 2 - center_x
+            dy = player.y + player.height / 2 - center_y
+            distance = math.sqrt(dx * dx + dy * dy)
+            if distance > 0:
+                self.direction_x = dx / distance
+                self.direction_y = dy / distance
+                
+        # Quái vật không đuổi theo tiếp tục đi theo hướng hiện tại
+        self.x += self.direction_x * self.speed * ticks
+        self.y += self.direction_y * self.speed * ticks
+        return True
+        
+    def resolve_collision(self, blocked):
+        """Xử lý sau khi va chạm địa hình đã được giải quyết (trượt dọc tường)"""
+        if blocked:
+            # Đổi hướng khi chạm tường
+            self.change_direction()
+            
+    def update_state(self, player):
+        """Hướng nhìn, tấn công và animation sau khi đã di chuyển"""
         # Cập nhật hướng nhìn
         if self.direction_x > 0:
             self.facing_right = True
@@ -245,50 +320,115 @@ class Monster:
             self.is_attacking = False
             
         # Cập nhật animation
-        self.current_animation.update(1/60)
+        self.current_animation.update(self.update_ticks / 60)
         
         # Nếu animation tấn công kết thúc, quay lại trạng thái đi
         if self.current_state == "attack" and self.current_animation.finished:
             self.set_animation("walk")
             
-    def wander(self):
-        """Di chuyển ngẫu nhiên"""
-        self.direction_timer += 1
+    def wander(self, ticks=1):
+        """Di chuyển ngẫu nhiên (ticks: số frame cần bù)"""
+        self.direction_timer += ticks
         if self.direction_timer >= self.direction_change_time:
             self.direction_timer = 0
             self.change_direction()
             
         # Di chuyển theo hướng hiện tại
-        self.x += self.direction_x * self.speed
-        self.y += self.direction_y * self.speed
+        self.x += self.direction_x * self.speed * ticks
+        self.y += self.direction_y * self.speed * ticks
         
-    def patrol(self):
+    def patrol(self, game_map=None, ticks=1):
         """Đi tuần tra theo các điểm định sẵn"""
+        if len(self.patrol_points) == 0 and game_map:
+            self.create_patrol_points(game_map)
+            
         if len(self.patrol_points) == 0:
-            self.wander()
+            self.wander(ticks)
             return
             
-        # Lấy điểm tuần tra hiện tại
+        # Lấy điểm tuần tra hiện tại (vị trí tâm quái vật cần tới)
         target_x, target_y = self.patrol_points[self.current_patrol_point]
         
         # Tính khoảng cách đến điểm tuần tra
-        dx = target_x - self.x
-        dy = target_y - self.y
+        center_x, center_y = self.get_center()
+        dx = target_x - center_x
+        dy = target_y - center_y
         distance = math.sqrt(dx * dx + dy * dy)
         
         # Nếu đã đến điểm tuần tra, chuyển sang điểm tiếp theo
         if distance < 10:
             self.current_patrol_point = (self.current_patrol_point + 1) % len(self.patrol_points)
+        elif self.follow_path(target_x, target_y, game_map, ticks):
+            # Đi theo đường A* đến điểm tuần tra
+            pass
         else:
             # Di chuyển đến điểm tuần tra
             if distance > 0:
                 self.direction_x = dx / distance
                 self.direction_y = dy / distance
                 
-                self.x += self.direction_x * self.speed
-                self.y += self.direction_y * self.speed
+                self.x += self.direction_x * self.speed * ticks
+                self.y += self.direction_y * self.speed * ticks
+                
+    def create_patrol_points(self, game_map, count=4):
+        """Tạo các điểm tuần tra đi qua được quanh vị trí hiện tại"""
+        points = []
+        center_x, center_y = self.get_center()
+        for i in range(count):
+            angle = 2 * math.pi * i / count + random.uniform(-0.5, 0.5)
+            distance = random.uniform(self.patrol_radius * 0.5, self.patrol_radius)
+            point_x = center_x + distance * math.cos(angle)
+            point_y = center_y + distance * math.sin(angle)
+            if game_map.is_passable(point_x, point_y):
+                points.append((point_x, point_y))
+                
+        # Cần ít nhất 2 điểm để tuần tra
+        if len(points) >= 2:
+            self.patrol_points = points
+            self.current_patrol_point = 0
+            
+    def get_center(self):
+        """Tâm sprite (cũng là tâm hộp va chạm) - điểm dùng để tìm đường"""
+        return self.x + self.width / 2, self.y + self.height / 2
+        
+    def follow_path(self, target_x, target_y, game_map, ticks=1):
+        """Đưa tâm quái vật theo đường A* đến (target_x, target_y); trả về False nếu chưa có đường"""
+        if game_map is None:
+            return False
+        step = self.speed * ticks
+            
+        # Xin đường mới khi đích đổi ô hoặc đã đi hết đường cũ; trong lúc chờ vẫn đi theo đường cũ
+        pathfinder = game_map.pathfinder
+        goal_cell = pathfinder.get_cell(target_x, target_y)
+        if goal_cell != self.path_goal or not self.path:
+            # Boss có hộp va chạm rộng hơn một ô: chỉ đi qua lối đủ rộng
+            clearance = get_clearance(self.width, self.height, game_map.tile_size, self.is_boss)
+            path = pathfinder.get_path(*self.get_center(), target_x, target_y, clearance)
+            if path:
+                self.path = list(path)
+                self.path_goal = goal_cell
+            elif not self.path:
+                return False
                 
-    def keep_distance(self, player):
+        # Bỏ qua các điểm đã tới
+        center_x, center_y = self.get_center()
+        while self.path:
+            dx = self.path[0][0] - center_x
+            dy = self.path[0][1] - center_y
+            distance = math.sqrt(dx * dx + dy * dy)
+            if distance > step:
+                break
+            self.path.pop(0)
+        if not self.path:
+            return False
+            
+        self.direction_x = dx / distance
+        self.direction_y = dy / distance
+        self.x += self.direction_x * step
+        self.y += self.direction_y * step
+        return True
+        
+    def keep_distance(self, player, game_map=None, ticks=1):
         """Giữ khoảng cách với người chơi (cho quái vật tấn công từ xa)"""
         # Tính khoảng cách đến người chơi
         dx = player.x - self.x
@@ -298,41 +438,67 @@ class Monster:
         ideal_distance = self.attack_range * 0.8  # Giữ khoảng cách bằng 80% tầm tấn công
         
         if distance < ideal_distance - 20:
-            # Quá gần, di chuyển ra xa
+            # Quá gần, di chuyển ra xa (theo đường A* tới điểm ở khoảng cách lý tưởng nếu có)
             if distance > 0:
+                retreat_x = player.x + player.width / 2 - dx / distance * ideal_distance
+                retreat_y = player.y + player.height / 2 - dy / distance * ideal_distance
+                if self.follow_path(retreat_x, retreat_y, game_map, ticks):
+                    return
+                    
                 self.direction_x = -dx / distance
                 self.direction_y = -dy / distance
                 
-                self.x += self.direction_x * self.speed
-                self.y += self.direction_y * self.speed
+                self.x += self.direction_x * self.speed * ticks
+                self.y += self.direction_y * self.speed * ticks
         elif distance > ideal_distance + 20:
             # Quá xa, di chuyển lại gần
+            if self.follow_path(player.x + player.width / 2, player.y + player.height / 2, game_map, ticks):
+                return
+                
             if distance > 0:
                 self.direction_x = dx / distance
                 self.direction_y = dy / distance
                 
-                self.x += self.direction_x * self.speed
-                self.y += self.direction_y * self.speed
+                self.x += self.direction_x * self.speed * ticks
+                self.y += self.direction_y * self.speed * ticks
         else:
             # Giữ nguyên vị trí, đã ở khoảng cách lý tưởng
             self.direction_x = 0
             self.direction_y = 0
             
-    def chase_player(self, player):
+    def chase_player(self, player, game_map=None, ticks=1):
         """Đuổi theo người chơi"""
+        # Đi theo trường hướng chung của map để vòng qua nước, cây...
+        direction = game_map.flow_field.get_direction(*self.get_center()) if game_map else None
+        if direction:
+            self.direction_x, self.direction_y = direction
+            self.x += self.direction_x * self.speed * ticks
+            self.y += self.direction_y * self.speed * ticks
+        else:
+            self.chase_directly(player, game_map, ticks)
+            
+    def chase_directly(self, player, game_map=None, ticks=1):
+        """Đuổi theo người chơi không qua trường hướng: A* khi ở xa, đi thẳng khi ở gần"""
         # Tính hướng đến người chơi
         dx = player.x - self.x
         dy = player.y - self.y
         
         # Chuẩn hóa hướng
         distance = math.sqrt(dx * dx + dy * dy)
+        
+        # Ngoài vùng trường hướng (vd. boss ở xa): tìm đường bằng A*
+        if game_map and distance > game_map.tile_size * 2:
+            if self.follow_path(player.x + player.width / 2, player.y + player.height / 2, game_map, ticks):
+                return
+                
+        # Ở gần người chơi: đi thẳng đến người chơi
         if distance > 0:
             self.direction_x = dx / distance
             self.direction_y = dy / distance
             
             # Di chuyển về phía người chơi
-            self.x += self.direction_x * self.speed
-            self.y += self.direction_y * self.speed
+            self.x += self.direction_x * self.speed * ticks
+            self.y += self.direction_y * self.speed * ticks
         else:
             self.change_direction()
             
@@ -349,69 +515,16 @@ class Monster:
         distance = math.sqrt(dx * dx + dy * dy)
         return distance <= self.attack_range
         
-    def use_ability(self, ability, player=None, monsters=None):
-        """Sử dụng khả năng đặc biệt"""
-        if ability == MonsterAbility.HEAL:
-            # Hồi máu
-            self.health = min(self.max_health, self.health + self.heal_amount)
-            # Hiệu ứng hồi máu
-            self.effects.append({
-                "type": "heal",
-                "timer": 60
-            })
-        elif ability == MonsterAbility.TELEPORT and player and self.teleport_cooldown <= 0:
-            # Dịch chuyển đến gần người chơi
-            angle = random.uniform(0, 2 * math.pi)
-            teleport_distance = random.uniform(100, self.teleport_distance)
-            self.x = player.x + math.cos(angle) * teleport_distance
-            self.y = player.y + math.sin(angle) * teleport_distance
-            self.teleport_cooldown = 180  # 3 giây
-            # Hiệu ứng dịch chuyển
-            self.effects.append({
-                "type": "teleport",
-                "timer": 30
-            })
-        elif ability == MonsterAbility.SUMMON and monsters is not None and self.summon_cooldown <= 0:
-            # Triệu hồi quái vật nhỏ
-            # Chỉ triệu hồi nếu có ít hơn 10 quái vật
-            if len(monsters) < 10:
-                # Tạo 1-3 quái vật nhỏ xung quanh
-                num_summons = random.randint(1, 3)
-                for _ in range(num_summons):
-                    angle = random.uniform(0, 2 * math.pi)
-                    summon_distance = random.uniform(50, 100)
-                    summon_x = self.x + math.cos(angle) * summon_distance
-                    summon_y = self.y + math.sin(angle) * summon_distance
-                    
-                    # Chọn loại quái vật nhỏ để triệu hồi
-                    summon_type = random.choice([MonsterType.GOBLIN, MonsterType.SKELETON])
-                    
-                    # Thêm quái vật mới vào danh sách
-                    # Lưu ý: Cần xử lý thêm ở GameState để thêm quái vật vào game
-                    return {
-                        "type": "summon",
-                        "monster_type": summon_type,
-                        "x": summon_x,
-                        "y": summon_y,
-                        "level": max(1, self.level - 1)
-                    }
-                    
-                self.summon_cooldown = 300  # 5 giây
-            
-        elif ability == MonsterAbility.INVISIBLE:
-            # Tàng hình
-            self.is_invisible = True
-            self.invisibility_timer = self.invisibility_duration
-            # Hiệu ứng tàng hình
-            self.effects.append({
-                "type": "invisible",
-                "timer": 30
-            })
+    def use_ability(self, ability, player=None, monsters=None, game_map=None):
+        """Sử dụng khả năng đặc biệt theo bảng ABILITIES; trả về yêu cầu triệu hồi nếu có"""
+        handler = ABILITIES.get(ability)
+        result = handler(self, player, monsters, game_map) if handler else None
+        if result and result["type"] == "summon":
+            self.summon_requests.append(result)
             
         # Đặt cooldown cho khả năng
         self.ability_cooldown = self.ability_cooldown_max
-        
-        return None  # Không có quái vật mới được triệu hồi
+        return result
         
     def take_damage(self, amount):
         """Nhận sát thương và cập nhật máu"""
@@ -0,0 +1,293 @@
+import math
+import random
+import numpy as np
+from dark_fantasy_game.src.monster_types import MonsterType, MonsterAbility, MonsterBehavior, MonsterState
+from dark_fantasy_game.src.collision import is_area_free
+
+# Điều kiện chuyển trạng thái: condition(monster, player) -> bool
+
+def player_near(monster, player):
+    return monster.is_player_in_range(player)
+
+def player_far(monster, player):
+    return not monster.is_player_in_range(player)
+
+def was_attacked(monster, player):
+    return monster.was_attacked
+
+def can_hide(monster, player):
+    return (not monster.is_player_in_range(player) and not monster.is_invisible and
+            monster.ability_cooldown <= 0)
+
+def is_visible(monster, player):
+    return not monster.is_invisible
+
+def low_health(monster, player):
+    return monster.health < monster.max_health * monster.berserker_threshold
+
+def state_timeout(monster, player):
+    return monster.state_timer >= monster.state_duration
+
+CONDITIONS = {
+    "player_near": player_near,
+    "player_far": player_far,
+    "attacked": was_attacked,
+    "can_hide": can_hide,
+    "visible": is_visible,
+    "low_health": low_health,
+    "timeout": state_timeout,
+}
+
+# Hành động khi chuyển trạng thái: action(monster)
+
+def hide(monster):
+    monster.use_ability(MonsterAbility.INVISIBLE)
+
+def reveal(monster):
+    monster.is_invisible = False
+
+def enrage(monster):
+    if not monster.berserker_active:
+        monster.berserker_active = True
+        monster.damage = int(monster.damage * 1.5)
+        monster.speed = monster.speed * 1.3
+
+ACTIONS = {
+    "hide": hide,
+    "reveal": reveal,
+    "enrage": enrage,
+}
+
+# Xử lý mỗi trạng thái: handler(entries, player, game_map, all_monsters) chạy cho cả nhóm,
+# entries là các (quái vật, ticks); quãng đường di chuyển được nhân theo ticks
+
+def chase_group(entries, player, game_map, all_monsters):
+    """Đuổi theo người chơi; hướng theo trường hướng chung được tra cho cả nhóm một lần"""
+    if game_map is None:
+        for monster, ticks in entries:
+            monster.chase_directly(player, game_map, ticks)
+        return
+        
+    # Trường hướng đi theo từng ô, quá hẹp cho hộp va chạm của boss: boss tìm đường A* theo bề rộng của nó
+    bosses = [(monster, ticks) for monster, ticks in entries if monster.is_boss]
+    if bosses:
+        for monster, ticks in bosses:
+            monster.chase_directly(player, game_map, ticks)
+        entries = [(monster, ticks) for monster, ticks in entries if not monster.is_boss]
+        if not entries:
+            return
+            
+    centers_x = np.array([monster.x + monster.width / 2 for monster, _ in entries])
+    centers_y = np.array([monster.y + monster.height / 2 for monster, _ in entries])
+    directions_x, directions_y, valid = game_map.flow_field.get_directions(centers_x, centers_y)
+    for (monster, ticks), ok, direction_x, direction_y in zip(entries, valid.tolist(),
+                                                              directions_x.tolist(), directions_y.tolist()):
+        if ok:
+            monster.direction_x = direction_x
+            monster.direction_y = direction_y
+            monster.x += direction_x * monster.speed * ticks
+            monster.y += direction_y * monster.speed * ticks
+        else:
+            # Ngoài vùng trường hướng hoặc đã ở sát người chơi
+            monster.chase_directly(player, game_map, ticks)
+
+def swarm_group(entries, player, game_map, all_monsters):
+    """Đuổi theo người chơi, mạnh hơn khi có nhiều quái vật gần đó"""
+    if all_monsters:
+        # Đếm quái vật khác trong phạm vi 150 đơn vị cho cả nhóm cùng lúc
+        all_x = np.array([other.x for other in all_monsters])
+        all_y = np.array([other.y for other in all_monsters])
+        xs = np.array([monster.x for monster, _ in entries])
+        ys = np.array([monster.y for monster, _ in entries])
+        distance_sq = (all_x[None, :] - xs[:, None]) ** 2 + (all_y[None, :] - ys[:, None]) ** 2
+        # Trừ chính quái vật đó (khoảng cách 0 tới bản thân)
+        nearby = (distance_sq < 150 * 150).sum(axis=1) - 1
+        for (monster, _), nearby_monsters in zip(entries, nearby.tolist()):
+            monster.swarm_bonus = max(0, nearby_monsters) * 0.1  # Mỗi quái vật tăng 10% sức mạnh
+    chase_group(entries, player, game_map, all_monsters)
+
+def wander_group(entries, player, game_map, all_monsters):
+    for monster, ticks in entries:
+        monster.wander(ticks)
+
+def keep_distance_group(entries, player, game_map, all_monsters):
+    for monster, ticks in entries:
+        monster.keep_distance(player, game_map, ticks)
+
+def patrol_group(entries, player, game_map, all_monsters):
+    for monster, ticks in entries:
+        monster.patrol(game_map, ticks)
+
+def hidden_group(entries, player, game_map, all_monsters):
+    """Đứng yên khi tàng hình"""
+
+# Bảng trạng thái và hành vi (dữ liệu)
+
+# Trạng thái: hàm xử lý nhóm và thời lượng tối đa (frame, None = không giới hạn)
+STATES = {
+    MonsterState.CHASE: {"handler": chase_group, "duration": None},
+    MonsterState.SWARM: {"handler": swarm_group, "duration": None},
+    MonsterState.BERSERK: {"handler": chase_group, "duration": None},
+    MonsterState.WANDER: {"handler": wander_group, "duration": None},
+    MonsterState.KEEP_DISTANCE: {"handler": keep_distance_group, "duration": None},
+    MonsterState.PATROL: {"handler": patrol_group, "duration": None},
+    MonsterState.HIDDEN: {"handler": hidden_group, "duration": 600},
+}
+
+# Các trạng thái tiến về phía người chơi (dùng cho cập nhật thô ở xa)
+CHASING_STATES = {MonsterState.CHASE, MonsterState.SWARM, MonsterState.BERSERK, MonsterState.KEEP_DISTANCE}
+
+# Hành vi: trạng thái ban đầu và các chuyển trạng thái (từ, điều kiện, tới, hành động)
+BEHAVIORS = {
+    MonsterBehavior.AGGRESSIVE: {
+        "initial": MonsterState.CHASE,
+        "transitions": [],
+    },
+    MonsterBehavior.DEFENSIVE: {
+        "initial": MonsterState.WANDER,
+        "transitions": [
+            (MonsterState.WANDER, "attacked", MonsterState.CHASE, None),
+        ],
+    },
+    MonsterBehavior.RANGED: {
+        "initial": MonsterState.KEEP_DISTANCE,
+        "transitions": [],
+    },
+    MonsterBehavior.PATROL: {
+        "initial": MonsterState.PATROL,
+        "transitions": [],
+    },
+    MonsterBehavior.AMBUSH: {
+        "initial": MonsterState.WANDER,
+        "transitions": [
+            (MonsterState.WANDER, "player_near", MonsterState.CHASE, None),
+            (MonsterState.WANDER, "can_hide", MonsterState.HIDDEN, "hide"),
+            (MonsterState.HIDDEN, "player_near", MonsterState.CHASE, "reveal"),
+            (MonsterState.HIDDEN, "visible", MonsterState.WANDER, None),
+            (MonsterState.HIDDEN, "timeout", MonsterState.WANDER, "reveal"),
+            (MonsterState.CHASE, "player_far", MonsterState.WANDER, None),
+        ],
+    },
+    MonsterBehavior.SWARM: {
+        "initial": MonsterState.SWARM,
+        "transitions": [],
+    },
+    MonsterBehavior.BERSERKER: {
+        "initial": MonsterState.WANDER,
+        "transitions": [
+            (MonsterState.WANDER, "low_health", MonsterState.BERSERK, "enrage"),
+        ],
+    },
+}
+
+# Boss luôn đuổi theo người chơi, bất kể hành vi của loại quái
+BOSS_BEHAVIOR = {
+    "initial": MonsterState.CHASE,
+    "transitions": [],
+}
+
+class StateMachine:
+    """Bảng chuyển trạng thái đã biên dịch cho một hành vi"""
+    def __init__(self, spec):
+        self.initial = spec["initial"]
+        # Trạng thái -> danh sách (hàm điều kiện, trạng thái đích, hàm hành động)
+        self.transitions = {state: [] for state in STATES}
+        for source, condition, target, action in spec["transitions"]:
+            self.transitions[source].append((CONDITIONS[condition], target,
+                                             ACTIONS[action] if action else None))
+                                             
+    def step(self, monster, player):
+        """Kiểm tra các chuyển trạng thái của trạng thái hiện tại, thực hiện chuyển đầu tiên thỏa mãn"""
+        for condition, target, action in self.transitions[monster.state]:
+            if condition(monster, player):
+                if action:
+                    action(monster)
+                monster.set_state(target)
+                return True
+        return False
+
+MACHINES = {behavior: StateMachine(spec) for behavior, spec in BEHAVIORS.items()}
+BOSS_MACHINE = StateMachine(BOSS_BEHAVIOR)
+
+def get_machine(behavior, is_boss=False):
+    """Máy trạng thái cho hành vi (boss dùng máy riêng)"""
+    if is_boss:
+        return BOSS_MACHINE
+    return MACHINES.get(behavior, MACHINES[MonsterBehavior.AGGRESSIVE])
+
+# Khả năng đặc biệt: handler(monster, player, monsters, game_map) -> kết quả (vd. yêu cầu triệu hồi)
+
+def ability_heal(monster, player, monsters, game_map):
+    monster.health = min(monster.max_health, monster.health + monster.heal_amount)
+    monster.effects.append({"type": "heal", "timer": 60})
+    return None
+
+def ability_teleport(monster, player, monsters, game_map):
+    """Dịch chuyển đến gần người chơi (chỉ khi điểm đến đứng được)"""
+    if player is None or monster.teleport_cooldown > 0:
+        return None
+    angle = random.uniform(0, 2 * math.pi)
+    teleport_distance = random.uniform(100, monster.teleport_distance)
+    target_x = player.x + math.cos(angle) * teleport_distance
+    target_y = player.y + math.sin(angle) * teleport_distance
+    if game_map and not is_area_free(game_map, target_x, target_y, monster.width, monster.height, monster.is_boss):
+        return None
+    # Dịch chuyển không quét qua địa hình: coi vị trí mới là điểm xuất phát của frame
+    monster.x = monster.prev_x = target_x
+    monster.y = monster.prev_y = target_y
+    monster.teleport_cooldown = 180  # 3 giây
+    monster.effects.append({"type": "teleport", "timer": 30})
+    return None
+
+def ability_summon(monster, player, monsters, game_map):
+    """Yêu cầu triệu hồi một quái vật nhỏ (GameState đưa vào hàng đợi spawn, nơi giới hạn số quái vật)"""
+    if monster.summon_cooldown > 0:
+        return None
+    angle = random.uniform(0, 2 * math.pi)
+    summon_distance = random.uniform(50, 100)
+    monster.summon_cooldown = 300  # 5 giây
+    return {
+        "type": "summon",
+        "monster_type": random.choice([MonsterType.GOBLIN, MonsterType.SKELETON]),
+        "x": monster.x + math.cos(angle) * summon_distance,
+        "y": monster.y + math.sin(angle) * summon_distance,
+        "level": max(1, monster.level - 1)
+    }
+
+def ability_invisible(monster, player, monsters, game_map):
+    monster.is_invisible = True
+    monster.invisibility_timer = monster.invisibility_duration
+    monster.effects.append({"type": "invisible", "timer": 30})
+    return None
+
+# Khả năng -> hàm xử lý; None là khả năng bị động (chỉ ảnh hưởng đòn đánh/hiển thị)
+ABILITIES = {
+    MonsterAbility.NONE: None,
+    MonsterAbility.HEAL: ability_heal,
+    MonsterAbility.TELEPORT: ability_teleport,
+    MonsterAbility.SUMMON: ability_summon,
+    MonsterAbility.INVISIBLE: ability_invisible,
+    MonsterAbility.POISON: None,
+    MonsterAbility.FIRE: None,
+    MonsterAbility.ICE: None,
+    MonsterAbility.LIGHTNING: None,
+}
+
+# Chạy hành vi cho nhiều quái vật, gom theo trạng thái
+
+def run_behaviors(entries, player, game_map=None, monsters=None):
+    """Chạy AI cho các (quái vật, ticks): chuyển trạng thái, xử lý theo nhóm trạng thái, rồi khả năng
+    
+    Trả về danh sách (quái vật, ticks) đã thực sự hoạt động trong frame này.
+    """
+    active = [(monster, ticks) for monster, ticks in entries if monster.begin_update(player, game_map, ticks)]
+    
+    # Gom theo trạng thái để mỗi hàm xử lý chạy một lượt cho cả nhóm
+    groups = {}
+    for monster, ticks in active:
+        groups.setdefault(monster.state, []).append((monster, ticks))
+    for state, members in groups.items():
+        STATES[state]["handler"](members, player, game_map, monsters)
+    for monster, ticks in active:
+        monster.end_update(player, game_map, monsters)
+    return active
@@ -0,0 +1,72 @@
+from dark_fantasy_game.src.monster import Monster
+from dark_fantasy_game.src.boss_monster import BossMonster
+from dark_fantasy_game.src.monster_types import MonsterType
+
+BOSS_TYPES = (MonsterType.DRAGON, MonsterType.NECROMANCER, MonsterType.DEMON_LORD, MonsterType.LICH)
+
+class MonsterPool:
+    """Kho quái vật theo từng loại, tái sử dụng quái vật đã chết thay vì tạo mới
+    
+    Tạo quái vật mới phải tính chỉ số và tải lại toàn bộ sprite animation;
+    quái vật lấy từ kho chỉ cần reset(). Mỗi loại giữ tối đa max_free_per_type
+    quái vật rảnh để kho không phình ra sau một wave lớn.
+    """
+    def __init__(self, max_free_per_type=64):
+        self.max_free_per_type = max_free_per_type
+        self.free = {}  # Loại quái vật -> danh sách quái vật rảnh
+        self.in_use = 0
+        self.high_water = 0  # Số quái vật đang dùng cao nhất từng đạt
+        self.created = 0
+        self.reused = 0
+        self.prewarmed = 0  # Số quái vật tạo sẵn trước khi cần (xem WavePrefetcher)
+        
+    def acquire(self, monster_type, x, y, level=1):
+        """Lấy một quái vật đã reset từ kho, hoặc tạo mới nếu kho của loại này trống"""
+        free = self.free.get(monster_type)
+        if free:
+            monster = free.pop()
+            monster.reset(x, y, level)
+            self.reused += 1
+        else:
+            monster = self.create(monster_type, x, y, level)
+        self.in_use += 1
+        self.high_water = max(self.high_water, self.in_use)
+        return monster
+        
+    def create(self, monster_type, x, y, level=1):
+        self.created += 1
+        if monster_type in BOSS_TYPES:
+            return BossMonster(monster_type, x, y, level)
+        return Monster(monster_type, x, y, level)
+        
+    def get_free_count(self, monster_type):
+        return len(self.free.get(monster_type, ()))
+        
+    def prewarm(self, monster_type, level=1):
+        """Tạo sẵn một quái vật rảnh (tải animation, tính chỉ số) để lần spawn sau không phải chờ"""
+        free = self.free.setdefault(monster_type, [])
+        if len(free) < self.max_free_per_type:
+            free.append(self.create(monster_type, 0, 0, level))
+            self.prewarmed += 1
+            
+    def release(self, monster):
+        """Trả quái vật (đã bị loại khỏi game) về kho"""
+        self.in_use = max(0, self.in_use - 1)
+        free = self.free.setdefault(monster.monster_type, [])
+        if len(free) < self.max_free_per_type:
+            free.append(monster)
+            
+    def release_all(self, monsters):
+        for monster in monsters:
+            self.release(monster)
+            
+    def get_stats(self):
+        """Số quái vật đang dùng, đang rảnh, mức dùng cao nhất và số lần tạo mới/tái sử dụng"""
+        return {
+            "in_use": self.in_use,
+            "free": sum(len(free) for free in self.free.values()),
+            "high_water": self.high_water,
+            "created": self.created,
+            "reused": self.reused,
+            "prewarmed": self.prewarmed,
+        }
@@ -1,5 +1,7 @@
 from enum import Enum
 
+LEVEL_SCALING = 0.2  # Mỗi cấp tăng 20% máu, sát thương và điểm
+
 class MonsterType(Enum):
     # Cơ bản
     GOBLIN = "Goblin"
@@ -39,7 +41,22 @@ class MonsterBehavior(Enum):
     SWARM = "Swarm"  # Tấn công theo nhóm, mạnh hơn khi ở gần quái khác
     BERSERKER = "Berserker"  # Tấn công mạnh hơn khi máu thấp
 
+class MonsterState(Enum):
+    CHASE = "Chase"  # Đuổi theo người chơi
+    WANDER = "Wander"  # Đi lang thang
+    KEEP_DISTANCE = "Keep Distance"  # Giữ khoảng cách để tấn công từ xa
+    PATROL = "Patrol"  # Đi tuần giữa các điểm
+    HIDDEN = "Hidden"  # Tàng hình, đứng yên chờ người chơi
+    SWARM = "Swarm"  # Đuổi theo cùng bầy
+    BERSERK = "Berserk"  # Nổi điên khi máu thấp
+
 class MonsterStats:
+    """Chỉ số gốc của một loại quái ở một cấp độ
+    
+    Đối tượng được dùng chung cho mọi quái vật cùng (loại, cấp, boss) qua
+    get_monster_stats nên bị khóa sau khi tính xong; giá trị thay đổi trong
+    trận (máu, buff sát thương/tốc độ...) được giữ trên từng quái vật.
+    """
     def __init__(self, monster_type, level=1, is_boss=False):
         self.monster_type = monster_type
         self.level = level
@@ -55,6 +72,15 @@ class MonsterStats:
         if is_boss:
             self.apply_boss_scaling()
             
+        # Khóa chỉ số (danh sách khả năng cũng được dùng chung)
+        self.abilities = tuple(self.abilities)
+        self.frozen = True
+        
+    def __setattr__(self, name, value):
+        if getattr(self, "frozen", False):
+            raise AttributeError(f"MonsterStats is shared between monsters, cannot set {name}")
+        super().__setattr__(name, value)
+        
     def setup_base_stats(self):
         """Thiết lập chỉ số cơ bản dựa trên loại quái"""
         # Chỉ số mặc định
@@ -211,7 +237,7 @@ class MonsterStats:
             
     def apply_level_scaling(self):
         """Áp dụng hệ số cấp độ cho chỉ số"""
-        level_factor = 1 + (self.level - 1) * 0.2  # Mỗi cấp tăng 20%
+        level_factor = 1 + (self.level - 1) * LEVEL_SCALING
         
         self.max_health = int(self.max_health * level_factor)
         self.damage = int(self.damage * level_factor)
@@ -226,3 +252,14 @@ class MonsterStats:
         self.health = self.max_health
         self.width *= 1.5
         self.height *= 1.5
+
+# (loại quái, cấp độ, boss) -> MonsterStats dùng chung
+STAT_TEMPLATES = {}
+
+def get_monster_stats(monster_type, level=1, is_boss=False):
+    """Chỉ số dùng chung cho (loại, cấp, boss), chỉ tính ở lần đầu được yêu cầu"""
+    key = (monster_type, level, is_boss)
+    stats = STAT_TEMPLATES.get(key)
+    if stats is None:
+        stats = STAT_TEMPLATES[key] = MonsterStats(monster_type, level, is_boss)
+    return stats
@@ -0,0 +1,326 @@
+import math
+import heapq
+from collections import OrderedDict
+import numpy as np
+
+UNREACHABLE = np.iinfo(np.uint16).max
+
+# 8 hướng lân cận (dx, dy); 4 hướng đầu là hướng thẳng
+NEIGHBOR_OFFSETS = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)]
+NEIGHBOR_DX = np.array([dx for dx, dy in NEIGHBOR_OFFSETS], dtype=np.int8)
+NEIGHBOR_DY = np.array([dy for dx, dy in NEIGHBOR_OFFSETS], dtype=np.int8)
+
+def shift(grid, dx, dy, fill):
+    """Dịch lưới sao cho result[y, x] = grid[y - dy, x - dx], ô ngoài biên nhận giá trị fill"""
+    height, width = grid.shape
+    result = np.full_like(grid, fill)
+    result[max(dy, 0):height + min(dy, 0), max(dx, 0):width + min(dx, 0)] = \
+        grid[max(-dy, 0):height + min(-dy, 0), max(-dx, 0):width + min(-dx, 0)]
+    return result
+
+class FlowField:
+    """Trường hướng đi chung dẫn về phía người chơi
+    
+    Khoảng cách (BFS 8 hướng) từ ô của người chơi được tính một lần cho cả
+    vùng quanh người chơi, chỉ khi người chơi đổi ô hoặc địa hình thay đổi.
+    Mỗi quái vật chỉ cần tra ô của mình để biết bước tiếp theo - O(1).
+    """
+    def __init__(self, game_map, radius=32):
+        self.game_map = game_map
+        self.radius = radius  # Bán kính vùng tính (ô)
+        self.size = radius * 2 + 1
+        self.origin_x = 0
+        self.origin_y = 0
+        self.goal = None  # (tile_x, tile_y, revision) lần tính gần nhất
+        self.distance = None
+        self.step_x = None
+        self.step_y = None
+        self.compute_count = 0
+        
+    def update(self, target_x, target_y):
+        """Tính lại trường hướng nếu mục tiêu đổi ô hoặc map thay đổi"""
+        tile_size = self.game_map.tile_size
+        tile_x = int(target_x // tile_size)
+        tile_y = int(target_y // tile_size)
+        goal = (tile_x, tile_y, self.game_map.revision)
+        if goal != self.goal:
+            self.goal = goal
+            self.compute(tile_x, tile_y)
+            
+    def compute(self, tile_x, tile_y):
+        """Tính khoảng cách và hướng đi cho toàn bộ vùng quanh ô (tile_x, tile_y)"""
+        self.origin_x = tile_x - self.radius
+        self.origin_y = tile_y - self.radius
+        passable = self.game_map.chunks.get_window(self.origin_x, self.origin_y, self.size, self.size,
+                                                   missing=False, layer="passable_mask")
+        
+        # Đi chéo chỉ được khi cả hai ô thẳng bên cạnh đều đi qua được (không cắt góc)
+        moves = []
+        for dx, dy in NEIGHBOR_OFFSETS:
+            allowed = passable.copy()
+            if dx != 0 and dy != 0:
+                allowed &= shift(passable, dx, 0, False) & shift(passable, 0, dy, False)
+            moves.append((dx, dy, allowed))
+            
+        # BFS theo từng lớp sóng trên cả lưới; frontier có viền 1 ô để dịch bằng cắt lát
+        size = self.size
+        distance = np.full((size, size), UNREACHABLE, dtype=np.uint16)
+        distance[self.radius, self.radius] = 0
+        unvisited = np.ones((size, size), dtype=bool)
+        unvisited[self.radius, self.radius] = False
+        padded = np.zeros((size + 2, size + 2), dtype=bool)
+        padded[self.radius + 1, self.radius + 1] = True
+        grown = np.empty((size, size), dtype=bool)
+        reached = np.empty((size, size), dtype=bool)
+        step = 0
+        while True:
+            step += 1
+            grown.fill(False)
+            for dx, dy, allowed in moves:
+                np.logical_and(padded[1 - dy:1 - dy + size, 1 - dx:1 - dx + size], allowed, out=reached)
+                grown |= reached
+            grown &= unvisited
+            if not grown.any():
+                break
+            distance[grown] = step
+            unvisited &= ~grown
+            padded[1:-1, 1:-1] = grown
+            
+        # Hướng đi: ô lân cận có khoảng cách nhỏ nhất (theo đúng luật đi của BFS)
+        neighbor_distance = np.empty((len(NEIGHBOR_OFFSETS), self.size, self.size), dtype=np.uint16)
+        for i, (dx, dy, allowed) in enumerate(moves):
+            # Ô (x, y) đi tới (x + dx, y + dy) hợp lệ nếu ô đích cho phép bước (dx, dy) vào nó
+            neighbor_distance[i] = np.where(shift(allowed, -dx, -dy, False),
+                                            shift(distance, -dx, -dy, UNREACHABLE), UNREACHABLE)
+        best = neighbor_distance.argmin(axis=0)
+        self.step_x = NEIGHBOR_DX[best]
+        self.step_y = NEIGHBOR_DY[best]
+        self.distance = distance
+        self.compute_count += 1
+        
+    def get_direction(self, x, y):
+        """Hướng đi (đã chuẩn hóa) từ vị trí (x, y) theo trường, hoặc None nếu nên đi thẳng
+        
+        Trả về None khi đã ở sát mục tiêu, ở ngoài vùng tính hoặc không có đường đi.
+        """
+        if self.distance is None:
+            return None
+            
+        tile_size = self.game_map.tile_size
+        tile_x = int(x // tile_size)
+        tile_y = int(y // tile_size)
+        local_x = tile_x - self.origin_x
+        local_y = tile_y - self.origin_y
+        if not (0 <= local_x < self.size and 0 <= local_y < self.size):
+            return None
+            
+        distance = self.distance[local_y, local_x]
+        if distance <= 1 or distance == UNREACHABLE:
+            return None
+            
+        # Hướng về tâm ô tiếp theo
+        target_x = (tile_x + int(self.step_x[local_y, local_x]) + 0.5) * tile_size
+        target_y = (tile_y + int(self.step_y[local_y, local_x]) + 0.5) * tile_size
+        dx = target_x - x
+        dy = target_y - y
+        length = math.sqrt(dx * dx + dy * dy)
+        if length == 0:
+            return None
+        return dx / length, dy / length
+        
+    def get_directions(self, xs, ys):
+        """Như get_direction cho nhiều vị trí cùng lúc (mảng xs, ys)
+        
+        Trả về (hướng x, hướng y, hợp lệ); vị trí không hợp lệ là những vị trí
+        mà get_direction sẽ trả về None.
+        """
+        count = len(xs)
+        if self.distance is None:
+            return np.zeros(count), np.zeros(count), np.zeros(count, dtype=bool)
+            
+        tile_size = self.game_map.tile_size
+        tile_x = np.floor(xs / tile_size).astype(np.int64)
+        tile_y = np.floor(ys / tile_size).astype(np.int64)
+        local_x = tile_x - self.origin_x
+        local_y = tile_y - self.origin_y
+        inside = (local_x >= 0) & (local_x < self.size) & (local_y >= 0) & (local_y < self.size)
+        local_x = np.clip(local_x, 0, self.size - 1)
+        local_y = np.clip(local_y, 0, self.size - 1)
+        
+        distance = self.distance[local_y, local_x]
+        valid = inside & (distance > 1) & (distance != UNREACHABLE)
+        
+        # Hướng về tâm ô tiếp theo
+        dx = (tile_x + self.step_x[local_y, local_x].astype(np.int64) + 0.5) * tile_size - xs
+        dy = (tile_y + self.step_y[local_y, local_x].astype(np.int64) + 0.5) * tile_size - ys
+        length = np.sqrt(dx * dx + dy * dy)
+        valid &= length > 0
+        length[~valid] = 1.0
+        return dx / length, dy / length, valid
+        
+class PathSearch:
+    """Một lần tìm đường A* 8 hướng (không cắt góc) có thể chạy dần qua nhiều frame
+    
+    clearance là số ô phải trống mỗi bên ô trên đường (0 = chỉ ô đó), để
+    thực thể lớn như boss không được dẫn qua lối hẹp hơn hộp va chạm của nó.
+    """
+    def __init__(self, game_map, start, goal, max_nodes, clearance=0):
+        self.game_map = game_map
+        self.start = start
+        self.goal = goal
+        self.max_nodes = max_nodes  # Giới hạn số ô mở rộng cho cả lần tìm
+        self.clearance = clearance
+        self.expanded = 0
+        self.done = False
+        self.path = []  # Danh sách tâm ô sau ô bắt đầu, [] nếu không có đường
+        
+        self.open_heap = [(self.heuristic(start), 0.0, start)]
+        self.came_from = {start: None}
+        self.cost_so_far = {start: 0.0}
+        self.known = {goal: True}  # Ô đích luôn được coi là đi qua được
+        
+    def heuristic(self, cell):
+        dx = abs(cell[0] - self.goal[0])
+        dy = abs(cell[1] - self.goal[1])
+        return max(dx, dy) + (math.sqrt(2) - 1) * min(dx, dy)
+        
+    def passable(self, cell):
+        result = self.known.get(cell)
+        if result is None:
+            x, y = cell
+            r = self.clearance
+            result = self.known[cell] = all(self.game_map.is_cell_passable(x + dx, y + dy)
+                                            for dy in range(-r, r + 1) for dx in range(-r, r + 1))
+        return result
+        
+    def run(self, max_steps):
+        """Mở rộng tối đa max_steps ô, trả về số ô đã mở rộng"""
+        steps = 0
+        open_heap = self.open_heap
+        cost_so_far = self.cost_so_far
+        while open_heap and steps < max_steps:
+            _, cost, current = heapq.heappop(open_heap)
+            if current == self.goal:
+                self.finish(current)
+                return steps
+            if cost > cost_so_far[current]:
+                continue
+            steps += 1
+            self.expanded += 1
+            if self.expanded > self.max_nodes:
+                self.finish(None)
+                return steps
+                
+            x, y = current
+            for dx, dy in NEIGHBOR_OFFSETS:
+                neighbor = (x + dx, y + dy)
+                if not self.passable(neighbor):
+                    continue
+                if dx != 0 and dy != 0:
+                    if not (self.passable((x + dx, y)) and self.passable((x, y + dy))):
+                        continue
+                    new_cost = cost + math.sqrt(2)
+                else:
+                    new_cost = cost + 1
+                if new_cost < cost_so_far.get(neighbor, float('inf')):
+                    cost_so_far[neighbor] = new_cost
+                    self.came_from[neighbor] = current
+                    heapq.heappush(open_heap, (new_cost + self.heuristic(neighbor), new_cost, neighbor))
+                    
+        if not open_heap:
+            self.finish(None)
+        return steps
+        
+    def finish(self, goal):
+        """Kết thúc tìm kiếm và dựng lại đường đi từ ô đích về ô bắt đầu"""
+        self.done = True
+        self.open_heap = []
+        if goal is None:
+            return
+            
+        tile_size = self.game_map.tile_size
+        path = []
+        cell = goal
+        while cell != self.start:
+            path.append(((cell[0] + 0.5) * tile_size, (cell[1] + 0.5) * tile_size))
+            cell = self.came_from[cell]
+        path.reverse()
+        self.path = path
+
+class PathfindingService:
+    """Dịch vụ tìm đường A* trên lưới đi qua được của map, có cache và giới hạn mỗi frame
+    
+    Kết quả được cache theo (ô bắt đầu, ô đích) và bị xóa khi địa hình thay đổi.
+    Yêu cầu chưa có trong cache được xếp hàng; mỗi frame chỉ mở rộng tối đa
+    nodes_per_frame ô, lần tìm dài được chạy tiếp ở các frame sau nên không
+    làm khựng một frame nào.
+    """
+    def __init__(self, game_map, nodes_per_frame=400, max_nodes=4000, cache_size=512, max_pending=64):
+        self.game_map = game_map
+        self.nodes_per_frame = nodes_per_frame
+        self.max_nodes = max_nodes
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # (ô bắt đầu, ô đích, clearance) -> danh sách điểm, [] nếu không có đường
+        self.pending = OrderedDict()  # Yêu cầu đang chờ, theo thứ tự đến
+        self.max_pending = max_pending  # Bỏ yêu cầu cũ nhất khi hàng đợi quá dài
+        self.search = None  # Lần tìm đang chạy dở
+        self.revision = game_map.revision
+        self.search_count = 0
+        self.cache_hits = 0
+        
+    def get_cell(self, x, y):
+        tile_size = self.game_map.tile_size
+        return int(x // tile_size), int(y // tile_size)
+        
+    def get_path(self, start_x, start_y, goal_x, goal_y, clearance=0):
+        """Lấy đường đi từ (start_x, start_y) tới (goal_x, goal_y) dưới dạng danh sách điểm
+        
+        clearance: xem PathSearch. Trả về None nếu yêu cầu đang chờ xử lý,
+        [] nếu không tìm được đường.
+        """
+        self.check_revision()
+        key = (self.get_cell(start_x, start_y), self.get_cell(goal_x, goal_y), clearance)
+        path = self.cache.get(key)
+        if path is not None:
+            self.cache.move_to_end(key)
+            self.cache_hits += 1
+            return path
+        self.pending[key] = True
+        while len(self.pending) > self.max_pending:
+            self.pending.popitem(last=False)
+        return None
+        
+    def check_revision(self):
+        """Xóa cache (và lần tìm dở) khi địa hình thay đổi"""
+        if self.revision != self.game_map.revision:
+            self.revision = self.game_map.revision
+            self.cache.clear()
+            self.search = None
+            
+    def update(self):
+        """Chạy các yêu cầu đang chờ trong giới hạn số ô của frame này"""
+        self.check_revision()
+        budget = self.nodes_per_frame
+        while budget > 0:
+            if self.search is None:
+                if not self.pending:
+                    break
+                key, _ = self.pending.popitem(last=False)
+                if key in self.cache:
+                    continue
+                self.search = PathSearch(self.game_map, key[0], key[1], self.max_nodes, key[2])
+                
+            budget -= max(1, self.search.run(budget))
+            if self.search.done:
+                self.cache[(self.search.start, self.search.goal, self.search.clearance)] = self.search.path
+                self.search_count += 1
+                self.search = None
+                while len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+                    
+    def find_path(self, start, goal, clearance=0):
+        """Tìm đường ngay lập tức (không giới hạn theo frame)"""
+        search = PathSearch(self.game_map, start, goal, self.max_nodes, clearance)
+        while not search.done:
+            search.run(self.max_nodes)
+        return search.path
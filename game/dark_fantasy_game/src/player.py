@@ -7,6 +7,7 @@ from dark_fantasy_game.src.animation import Animation
 from dark_fantasy_game.src.skill_bar import SkillBar
 from dark_fantasy_game.src.experience_system import ExperienceSystem
 from dark_fantasy_game.src.skill_tree import SkillTree
+from dark_fantasy_game.src.collision import resolve_moves
 
 class Player:
     def __init__(self, x=400, y=300, character_class=CharacterClass.WARRIOR):
@@ -237,11 +238,9 @@ class Player:
         if self.moving_down:
             self.y += self.speed
             
-        # Check if new position is valid (if map is provided)
+        # Sweep the hitbox from the old position and slide along walls (if map is provided)
         if game_map:
-            if not game_map.is_passable(self.x, self.y):
-                # Revert to old position if not passable
-                self.x, self.y = old_x, old_y
+            resolve_moves(game_map, [self], [(old_x, old_y)])
         
         # Không giới hạn người chơi trong màn hình, để camera theo dõi
         # Cho phép người chơi di chuyển tự do trong map vô hạn
@@ -6,6 +6,7 @@ from dark_fantasy_game.src.inventory import Inventory
 from dark_fantasy_game.src.animation import Animation
 from dark_fantasy_game.src.abilities import WhirlwindAbility, ShieldBashAbility, ChargeAbility, TeleportAbility, FrostNovaAbility, MeteorAbility
 from dark_fantasy_game.src.status_effects import StatusEffect, StatusEffectType
+from dark_fantasy_game.src.collision import resolve_moves
 
 class Player:
     def __init__(self, x=400, y=300, character_class=CharacterClass.WARRIOR):
@@ -273,11 +274,9 @@ class Player:
             if self.moving_down:
                 self.y += actual_speed
                 
-            # Check if new position is valid (if map is provided)
+            # Sweep the hitbox from the old position and slide along walls (if map is provided)
             if game_map:
-                if not game_map.is_passable(self.x, self.y):
-                    # Revert to old position if not passable
-                    self.x, self.y = old_x, old_y
+                resolve_moves(game_map, [self], [(old_x, old_y)])
             
             # Keep player on screen
             self.x = max(0, min(800 - self.width, self.x))
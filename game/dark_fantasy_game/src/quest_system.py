@@ -2,6 +2,7 @@ import pygame
 import json
 import os
 from enum import Enum
+from dark_fantasy_game.src.ui_panel import CachedPanel
 
 class QuestType(Enum):
     MAIN = "Main Quest"
@@ -149,7 +150,7 @@ class Quest:
             "level_requirement": self.level_requirement,
             "objectives": [obj.to_dict() for obj in self.objectives],
             "status": self.status.value,
-            "rewards": self.rewards,
+            "rewards": dict(self.rewards),
             "next_quest_id": self.next_quest_id,
             "is_hidden": self.is_hidden
         }
@@ -187,6 +188,7 @@ class QuestSystem:
         self.font_large = None
         self.font_medium = None
         self.font_small = None
+        self.quest_log_panel = CachedPanel()
         
         # Load predefined quests
         self.load_predefined_quests()
@@ -313,6 +315,7 @@ class QuestSystem:
         self.font_large = pygame.font.SysFont(None, font_large_size)
         self.font_medium = pygame.font.SysFont(None, font_medium_size)
         self.font_small = pygame.font.SysFont(None, font_small_size)
+        self.quest_log_panel.invalidate()
         
     def start_quest(self, quest_id):
         """Start a quest by ID"""
@@ -437,6 +440,16 @@ class QuestSystem:
         # Draw notification
         screen.blit(notification_surface, (notification_x, notification_y))
         
+    def get_quest_log_state(self, log_width, log_height, scale_x, scale_y):
+        """Build the state key that decides when the quest log must be re-rendered"""
+        quests_state = tuple(
+            (quest_id,
+             self.quests[quest_id].status,
+             tuple(objective.current_amount for objective in self.quests[quest_id].objectives))
+            for quest_id in self.active_quests
+        )
+        return (log_width, log_height, scale_x, scale_y, self.selected_quest_index, quests_state)
+        
     def draw_quest_log(self, screen, scale_x=1.0, scale_y=1.0):
         """Draw the quest log if visible"""
         if not self.quest_log_visible:
@@ -451,6 +464,15 @@ class QuestSystem:
         log_x = (screen.get_width() - log_width) // 2
         log_y = (screen.get_height() - log_height) // 2
         
+        # Draw cached quest log, re-rendering only when quests or selection change
+        state_key = self.get_quest_log_state(log_width, log_height, scale_x, scale_y)
+        self.quest_log_panel.draw(screen, log_x, log_y, state_key,
+                                  lambda: self.render_quest_log(log_width, log_height, scale_x, scale_y))
+        
+    def render_quest_log(self, log_width, log_height, scale_x=1.0, scale_y=1.0):
+        """Render the quest log to an off-screen surface and return it with its layout rects"""
+        rects = {}
+        
         # Create quest log surface with transparency
         log_surface = pygame.Surface((log_width, log_height), pygame.SRCALPHA)
         log_surface.fill((0, 0, 0, 200))
@@ -489,10 +511,12 @@ class QuestSystem:
             for i, quest_id in enumerate(self.active_quests):
                 quest = self.quests[quest_id]
                 if quest.quest_type == category_type:
+                    quest_rect = pygame.Rect(10, category_y - 5, log_width - 20, 60)
+                    rects[quest_id] = quest_rect
+                    
                     # Highlight selected quest
                     if i == self.selected_quest_index:
-                        pygame.draw.rect(log_surface, (50, 50, 50), 
-                                        (10, category_y - 5, log_width - 20, 60))
+                        pygame.draw.rect(log_surface, (50, 50, 50), quest_rect)
                     
                     # Draw quest title
                     quest_title = self.font_medium.render(quest.title, True, (255, 255, 255))
@@ -610,15 +634,14 @@ class QuestSystem:
         instructions_y = log_height - 30
         log_surface.blit(instructions_text, (instructions_x, instructions_y))
         
-        # Draw quest log
-        screen.blit(log_surface, (log_x, log_y))
+        return log_surface, rects
         
     def to_dict(self):
         """Convert quest system state to dictionary for saving"""
         return {
-            "active_quests": self.active_quests,
-            "completed_quests": self.completed_quests,
-            "failed_quests": self.failed_quests,
+            "active_quests": list(self.active_quests),
+            "completed_quests": list(self.completed_quests),
+            "failed_quests": list(self.failed_quests),
             "quests": {quest_id: quest.to_dict() for quest_id, quest in self.quests.items()}
         }
         
@@ -0,0 +1,360 @@
+import io
+import struct
+import zlib
+from array import array
+
+# File layout (little endian):
+#   header      magic, format version, section count, checksum of the directory
+#   directory   one entry per section: tag, file offset, size, checksum of the payload
+#   payloads    sections in directory order
+# Readers skip sections they do not know, so new sections can be added without
+# a version bump; changing the layout of an existing section needs one.
+SAVE_MAGIC = b"DFSV"
+SAVE_VERSION = 2  # 2: full monster and item records, effects and world sections
+
+HEADER = struct.Struct("<4sHHI")
+SECTION_ENTRY = struct.Struct("<4sIII")
+
+PLAYER = struct.Struct("<8d")  # x, y, speed, max_health, current_health, physical_damage, magic_damage, physical_defense
+GAME = struct.Struct("<qII")  # score, level, monsters killed in wave
+MAP = struct.Struct("<QIIII")  # seed, generator version, width, height, tile override count
+# One record per monster (see Monster.get_record): type, x, y, health, level, damage, speed,
+# direction x/y, behavior state, state timer, attack/ability/summon/teleport cooldowns,
+# invisibility timer, flags, boss phase, special attack cooldown, phase transition timer
+MONSTER = struct.Struct("<BfffHffffBffffffBbff")
+MONSTER_NAME_FIELDS = (0, 9)
+ITEM = struct.Struct("<Bfffb")  # type index, x, y, bob offset, bob direction
+EFFECT = struct.Struct("<Bffhh")  # type index, x, y, duration, frames left
+MONSTER_V1 = struct.Struct("<BfffH")  # type index, x, y, health, level
+ITEM_V1 = struct.Struct("<Bff")  # type index, x, y
+
+SECTION_TAGS = {
+    "player": b"PLYR",
+    "inventory": b"INVT",
+    "game_state": b"GAME",
+    "quest_system": b"QUST",
+    "monsters": b"MONS",
+    "items": b"ITEM",
+    "effects": b"EFCT",
+    "world": b"WRLD",
+    "map": b"MAPS",
+}
+
+# Autosave journal: a sequence of records, each a dict of section name -> new
+# section value, framed as (payload size, payload checksum) + pack_value payload
+JOURNAL_RECORD = struct.Struct("<II")
+
+INT = struct.Struct("<q")
+FLOAT = struct.Struct("<d")
+LENGTH = struct.Struct("<I")
+
+class SaveFormatError(ValueError):
+    """The file is not a save, is from a newer version, or is damaged"""
+
+def pack_value(value, out):
+    """Append a tagged encoding of a JSON-like value (None, bool, int, float, str, list, dict) to out"""
+    if value is None:
+        out += b"N"
+    elif value is True:
+        out += b"T"
+    elif value is False:
+        out += b"F"
+    elif isinstance(value, int):
+        out += b"i" + INT.pack(value)
+    elif isinstance(value, float):
+        out += b"d" + FLOAT.pack(value)
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        out += b"s" + LENGTH.pack(len(data)) + data
+    elif isinstance(value, (list, tuple)):
+        out += b"l" + LENGTH.pack(len(value))
+        for item in value:
+            pack_value(item, out)
+    elif isinstance(value, dict):
+        out += b"m" + LENGTH.pack(len(value))
+        for key, item in value.items():
+            pack_value(key, out)
+            pack_value(item, out)
+    else:
+        raise TypeError(f"Cannot save value of type {type(value).__name__}")
+    return out
+
+def unpack_value(buffer, offset=0):
+    """Decode one value written by pack_value, return it and the offset after it"""
+    tag = buffer[offset:offset + 1].tobytes()
+    offset += 1
+    if tag == b"N":
+        return None, offset
+    if tag == b"T":
+        return True, offset
+    if tag == b"F":
+        return False, offset
+    if tag == b"i":
+        return INT.unpack_from(buffer, offset)[0], offset + INT.size
+    if tag == b"d":
+        return FLOAT.unpack_from(buffer, offset)[0], offset + FLOAT.size
+    if tag in (b"s", b"l", b"m"):
+        length = LENGTH.unpack_from(buffer, offset)[0]
+        offset += LENGTH.size
+        if tag == b"s":
+            return buffer[offset:offset + length].tobytes().decode("utf-8"), offset + length
+        if tag == b"l":
+            items = []
+            for _ in range(length):
+                item, offset = unpack_value(buffer, offset)
+                items.append(item)
+            return items, offset
+        result = {}
+        for _ in range(length):
+            key, offset = unpack_value(buffer, offset)
+            result[key], offset = unpack_value(buffer, offset)
+        return result, offset
+    raise SaveFormatError(f"Unknown value tag {tag!r}")
+
+def encode_records(records, record_struct, name_fields=(0,)):
+    """Encode records as a table of distinct names followed by fixed-size records
+    
+    The fields listed in name_fields hold strings (monster type, state...) and
+    are stored as an index into the name table.
+    """
+    names = sorted({record[field] for record in records for field in name_fields})
+    index = {name: i for i, name in enumerate(names)}
+    out = pack_value(names, bytearray())
+    out += LENGTH.pack(len(records))
+    pack = record_struct.pack
+    for record in records:
+        record = list(record)
+        for field in name_fields:
+            record[field] = index[record[field]]
+        out += pack(*record)
+    return out
+
+def decode_records(buffer, record_struct, name_fields=(0,)):
+    names, offset = unpack_value(buffer)
+    count = LENGTH.unpack_from(buffer, offset)[0]
+    offset += LENGTH.size
+    end = offset + count * record_struct.size
+    if name_fields == (0,):
+        return [(names[fields[0]], *fields[1:])
+                for fields in record_struct.iter_unpack(buffer[offset:end])]
+    records = []
+    for fields in record_struct.iter_unpack(buffer[offset:end]):
+        record = list(fields)
+        for field in name_fields:
+            record[field] = names[record[field]]
+        records.append(tuple(record))
+    return records
+
+def encode_player(player):
+    stats = player["stats"]
+    out = bytearray(PLAYER.pack(player["x"], player["y"], player["speed"],
+                                stats["max_health"], stats["current_health"], stats["physical_damage"],
+                                stats["magic_damage"], stats["physical_defense"]))
+    pack_value(player["character_class"], out)
+    pack_value(player["experience_system"], out)
+    return out
+
+def decode_player(buffer, version):
+    x, y, speed, max_health, current_health, physical_damage, magic_damage, physical_defense = PLAYER.unpack_from(buffer)
+    character_class, offset = unpack_value(buffer, PLAYER.size)
+    experience_system, offset = unpack_value(buffer, offset)
+    return {
+        "x": x,
+        "y": y,
+        "speed": speed,
+        "character_class": character_class,
+        "stats": {
+            "max_health": max_health,
+            "current_health": current_health,
+            "physical_damage": physical_damage,
+            "magic_damage": magic_damage,
+            "physical_defense": physical_defense
+        },
+        "experience_system": experience_system
+    }
+
+def encode_game_state(game_state):
+    return GAME.pack(game_state["score"], game_state["level"], game_state["monsters_killed_in_wave"])
+
+def decode_game_state(buffer, version):
+    score, level, monsters_killed_in_wave = GAME.unpack_from(buffer)
+    return {"score": score, "level": level, "monsters_killed_in_wave": monsters_killed_in_wave}
+
+def encode_map(game_map):
+    overrides = game_map["tile_overrides"]
+    out = bytearray(MAP.pack(game_map["seed"], game_map["generator_version"], game_map["width"],
+                             game_map["height"], len(overrides)))
+    out += array("i", [int(value) for override in overrides for value in override]).tobytes()
+    return out
+
+def decode_map(buffer, version):
+    seed, generator_version, width, height, count = MAP.unpack_from(buffer)
+    values = array("i")
+    values.frombytes(buffer[MAP.size:MAP.size + count * 4 * values.itemsize])
+    return {
+        "seed": seed,
+        "generator_version": generator_version,
+        "width": width,
+        "height": height,
+        "tile_overrides": [[values[i], values[i + 1], values[i + 2], bool(values[i + 3])]
+                           for i in range(0, len(values), 4)]
+    }
+
+def decode_monsters(buffer, version):
+    if version < 2:
+        return decode_records(buffer, MONSTER_V1)
+    return decode_records(buffer, MONSTER, MONSTER_NAME_FIELDS)
+
+def decode_items(buffer, version):
+    return decode_records(buffer, ITEM_V1 if version < 2 else ITEM)
+
+# Sections without an entry here (inventory, quests, world) are stored with pack_value.
+# Decoders get the format version of the file so older layouts keep loading.
+ENCODERS = {
+    "player": encode_player,
+    "game_state": encode_game_state,
+    "monsters": lambda monsters: encode_records(monsters, MONSTER, MONSTER_NAME_FIELDS),
+    "items": lambda items: encode_records(items, ITEM),
+    "effects": lambda effects: encode_records(effects, EFFECT),
+    "map": encode_map,
+}
+DECODERS = {
+    "player": decode_player,
+    "game_state": decode_game_state,
+    "monsters": decode_monsters,
+    "items": decode_items,
+    "effects": lambda buffer, version: decode_records(buffer, EFFECT),
+    "map": decode_map,
+}
+
+def encode_save(save_data):
+    """Encode a save snapshot (section name -> data) into the binary save format"""
+    payloads = []
+    for name, tag in SECTION_TAGS.items():
+        data = save_data.get(name)
+        if data is None:
+            continue
+        encoder = ENCODERS.get(name)
+        payloads.append((tag, bytes(encoder(data) if encoder else pack_value(data, bytearray()))))
+        
+    directory = bytearray()
+    offset = HEADER.size + SECTION_ENTRY.size * len(payloads)
+    for tag, payload in payloads:
+        directory += SECTION_ENTRY.pack(tag, offset, len(payload), zlib.crc32(payload))
+        offset += len(payload)
+        
+    out = bytearray(HEADER.pack(SAVE_MAGIC, SAVE_VERSION, len(payloads), zlib.crc32(directory)))
+    out += directory
+    for _, payload in payloads:
+        out += payload
+    return bytes(out)
+
+def encode_journal_record(delta):
+    """Frame one journal record (section name -> new value) for appending to a journal file"""
+    payload = bytes(pack_value(delta, bytearray()))
+    return JOURNAL_RECORD.pack(len(payload), zlib.crc32(payload)) + payload
+
+def read_journal(path):
+    """Yield the records of a journal file in order
+    
+    Stops at the first incomplete or damaged record: that is where the game
+    stopped mid-append, and everything after it is lost anyway.
+    """
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return
+    with f:
+        while True:
+            header = f.read(JOURNAL_RECORD.size)
+            if len(header) < JOURNAL_RECORD.size:
+                return
+            size, checksum = JOURNAL_RECORD.unpack(header)
+            payload = f.read(size)
+            if len(payload) < size or zlib.crc32(payload) != checksum:
+                return
+            yield unpack_value(memoryview(payload))[0]
+
+class SaveReader:
+    """Read a binary save one section at a time
+    
+    Opening only reads the header and the section directory; each section is
+    read, checked against its checksum and decoded the first time get() asks
+    for it. Supports get(name, default) like the dict of a JSON save.
+    source is a file path, or the bytes of a save kept in memory (checkpoints).
+    """
+    def __init__(self, source):
+        if isinstance(source, (bytes, bytearray)):
+            self.file = io.BytesIO(source)
+        else:
+            self.file = open(source, 'rb')
+        self.sections = {}  # tag -> (offset, size, checksum)
+        self.decoded = {}
+        try:
+            self.read_directory()
+        except Exception:
+            self.file.close()
+            raise
+            
+    def read_directory(self):
+        header = self.file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise SaveFormatError("Save file is truncated")
+        magic, self.version, count, checksum = HEADER.unpack(header)
+        if magic != SAVE_MAGIC:
+            raise SaveFormatError("Not a save file")
+        if self.version > SAVE_VERSION:
+            raise SaveFormatError(f"Save format version {self.version} is newer than supported ({SAVE_VERSION})")
+            
+        directory = self.file.read(SECTION_ENTRY.size * count)
+        if len(directory) < SECTION_ENTRY.size * count or zlib.crc32(directory) != checksum:
+            raise SaveFormatError("Save file directory is damaged")
+        for tag, offset, size, section_checksum in SECTION_ENTRY.iter_unpack(directory):
+            self.sections[tag] = (offset, size, section_checksum)
+            
+    def __contains__(self, name):
+        return SECTION_TAGS.get(name) in self.sections
+        
+    def read_payload(self, tag):
+        offset, size, checksum = self.sections[tag]
+        self.file.seek(offset)
+        payload = self.file.read(size)
+        if len(payload) < size or zlib.crc32(payload) != checksum:
+            raise SaveFormatError(f"Save section {tag.decode('ascii', 'replace')} is damaged")
+        return payload
+        
+    def verify(self):
+        """Check every section against its checksum without decoding it
+        
+        Lets a load fail before anything is applied instead of halfway through.
+        """
+        for tag in self.sections:
+            self.read_payload(tag)
+            
+    def get(self, name, default=None):
+        """Decode a section on first access"""
+        if name in self.decoded:
+            return self.decoded[name]
+        tag = SECTION_TAGS.get(name)
+        if tag not in self.sections:
+            return default
+            
+        payload = self.read_payload(tag)
+        decoder = DECODERS.get(name)
+        buffer = memoryview(payload)
+        value = decoder(buffer, self.version) if decoder else unpack_value(buffer)[0]
+        self.decoded[name] = value
+        return value
+        
+    def read_all(self):
+        """Decode every section this version knows into a dict (to rewrite the save)"""
+        return {name: self.get(name) for name, tag in SECTION_TAGS.items() if tag in self.sections}
+        
+    def close(self):
+        self.file.close()
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, *exc_info):
+        self.close()
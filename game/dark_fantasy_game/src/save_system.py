@@ -3,6 +3,13 @@ import json
 import datetime
 import pygame
 from enum import Enum
+from dark_fantasy_game.src.ui_panel import CachedPanel
+from dark_fantasy_game.src.save_writer import SaveWriter
+from dark_fantasy_game.src.save_format import SaveReader, encode_save
+from dark_fantasy_game.src.autosave import Autosave
+from dark_fantasy_game.src.thumbnails import THUMBNAIL_SIZE, ThumbnailLoader, ThumbnailEncoder, capture_thumbnail, write_thumbnail
+
+QUICK_SAVE_SLOT = 0  # Written to quicksave.sav, not shown in the save/load menu
 
 class SaveSlot:
     def __init__(self, slot_id, save_name="", player_level=1, timestamp=None, screenshot=None):
@@ -47,10 +54,26 @@ class SaveSystem:
         self.font_large = None
         self.font_medium = None
         self.font_small = None
+        self.menu_panel = CachedPanel()
+        
+        # Save files are encoded and written on a background thread
+        self.writer = SaveWriter()
+        self.pending_slots = {}  # slot_id -> SaveSlot to apply once its write finishes
+        self.status_text = ""
+        self.status_timer = 0
+        self.status_duration = 120  # frames
+        
+        # Slot thumbnails are loaded in the background when the menu first shows them
+        self.thumbnail_loader = ThumbnailLoader()
+        # New thumbnails are scaled and written in the background after a save
+        self.thumbnail_encoder = ThumbnailEncoder()
         
         # Create save directory if it doesn't exist
         os.makedirs(self.save_directory, exist_ok=True)
         
+        # Periodic autosave: full snapshots with a journal of small changes in between
+        self.autosave = Autosave(self.writer, self.save_directory)
+        
         # Load save slot metadata
         self.load_save_slots_metadata()
         
@@ -63,6 +86,7 @@ class SaveSystem:
         self.font_large = pygame.font.SysFont(None, font_large_size)
         self.font_medium = pygame.font.SysFont(None, font_medium_size)
         self.font_small = pygame.font.SysFont(None, font_small_size)
+        self.menu_panel.invalidate()
         
     def load_save_slots_metadata(self):
         """Load metadata for all save slots"""
@@ -73,17 +97,9 @@ class SaveSystem:
                 with open(metadata_file, 'r') as f:
                     metadata = json.load(f)
                     
+                # Only names, levels and times: thumbnails are loaded when first shown
                 for slot_data in metadata:
                     slot = SaveSlot.from_dict(slot_data)
-                    
-                    # Load screenshot if available
-                    screenshot_path = os.path.join(self.save_directory, f"slot_{slot.slot_id}_screenshot.png")
-                    if os.path.exists(screenshot_path):
-                        try:
-                            slot.screenshot = pygame.image.load(screenshot_path)
-                        except:
-                            slot.screenshot = None
-                            
                     self.save_slots[slot.slot_id] = slot
             except Exception as e:
                 print(f"Error loading save slots metadata: {e}")
@@ -98,139 +114,272 @@ class SaveSystem:
             self.save_slots[i] = SaveSlot(i)
             
     def save_slots_metadata(self):
-        """Save metadata for all save slots"""
+        """Queue a write of the metadata for all save slots"""
         metadata_file = os.path.join(self.save_directory, "save_slots.json")
+        metadata = [slot.to_dict() for slot in self.save_slots.values()]
+        self.writer.submit_metadata(metadata_file, metadata)
+        
+    def snapshot_game(self, game_state):
+        """Copy everything a save needs into plain dicts and lists
+        
+        Runs on the game thread and must stay cheap: no encoding, no disk access.
+        The result shares no mutable containers with the game, so the writer
+        thread can serialize it while the game keeps changing.
+        """
+        save_data = self.snapshot_progress(game_state)
+        save_data.update({
+            "monsters": [monster.get_record() for monster in game_state.monsters],
+            "items": [(item.item_type, item.x, item.y, item.animation_offset, item.animation_direction)
+                      for item in game_state.items],
+            "effects": [(effect.effect_type, effect.x, effect.y, effect.duration, effect.timer)
+                        for effect in game_state.effects_manager.effects],
+            "world": {
+                "camera": [game_state.camera_x, game_state.camera_y],
+                "monsters_per_wave": game_state.monsters_per_wave,
+                "wave_manager": game_state.wave_manager.to_dict()
+            },
+            "map": game_state.game_map.to_dict()  # Only the seed and edited tiles, not the terrain
+        })
+        return save_data
+        
+    def snapshot_progress(self, game_state):
+        """Copy the sections that change as the player progresses: player, inventory, score and quests"""
+        player = game_state.player
+        return {
+            "player": {
+                "x": player.x,
+                "y": player.y,
+                "speed": player.speed,
+                "character_class": player.character_class.value,
+                "stats": {
+                    "max_health": player.stats.max_health,
+                    "current_health": player.stats.current_health,
+                    "physical_damage": player.stats.physical_damage,
+                    "magic_damage": player.stats.magic_damage,
+                    "physical_defense": player.stats.physical_defense
+                },
+                "experience_system": player.exp_system.to_dict()
+            },
+            "inventory": player.inventory.to_dict(),
+            "game_state": {
+                "score": game_state.score,
+                "level": game_state.level,
+                "monsters_killed_in_wave": game_state.monsters_killed_in_wave
+            },
+            "quest_system": game_state.quest_system.to_dict() if hasattr(game_state, "quest_system") else None
+        }
+        
+    def checkpoint(self, game_state):
+        """Encode the whole game into save bytes kept in memory (for headless simulations)"""
+        return encode_save(self.snapshot_game(game_state))
+        
+    def restore_checkpoint(self, game_state, data):
+        """Restore the game from bytes returned by checkpoint()"""
+        with SaveReader(data) as save_data:
+            save_data.verify()
+            self.apply_save(save_data, game_state)
+        
+    def get_save_file(self, slot_id):
+        """Path of the binary save of a slot"""
+        return os.path.join(self.save_directory, f"slot_{slot_id}.sav")
+        
+    def get_legacy_save_file(self, slot_id):
+        """Path of a JSON save written by older versions of the game"""
+        return os.path.join(self.save_directory, f"slot_{slot_id}.json")
+        
+    def get_thumbnail_file(self, slot_id):
+        """Path of a slot's raw thumbnail (see thumbnails.py)"""
+        return os.path.join(self.save_directory, f"slot_{slot_id}_thumb.raw")
+        
+    def get_screenshot_file(self, slot_id):
+        """Path of the full-size PNG screenshot older versions saved with each slot"""
+        return os.path.join(self.save_directory, f"slot_{slot_id}_screenshot.png")
+        
+    def get_quick_save_file(self):
+        return os.path.join(self.save_directory, "quicksave.sav")
+        
+    def has_save(self, slot_id):
+        return os.path.exists(self.get_save_file(slot_id)) or os.path.exists(self.get_legacy_save_file(slot_id))
         
-        try:
-            metadata = [slot.to_dict() for slot in self.save_slots.values()]
-            with open(metadata_file, 'w') as f:
-                json.dump(metadata, f, indent=2)
-        except Exception as e:
-            print(f"Error saving slots metadata: {e}")
-            
     def save_game(self, slot_id, game_state, take_screenshot=True):
-        """Save game to specified slot"""
+        """Snapshot the game and queue it to be written to the specified slot
+        
+        Returns as soon as the snapshot is taken; the files are written on the
+        writer thread and update() reports when they are done.
+        """
         if slot_id < 1 or slot_id > self.max_slots:
             return False
             
-        save_file = os.path.join(self.save_directory, f"slot_{slot_id}.json")
-        screenshot_file = os.path.join(self.save_directory, f"slot_{slot_id}_screenshot.png")
+        save_file = self.get_save_file(slot_id)
+        metadata_file = os.path.join(self.save_directory, "save_slots.json")
         
         try:
-            # Create save data
-            save_data = {
-                "player": {
-                    "x": game_state.player.x,
-                    "y": game_state.player.y,
-                    "character_class": game_state.player.character_class.value,
-                    "stats": {
-                        "max_health": game_state.player.stats.max_health,
-                        "current_health": game_state.player.stats.current_health,
-                        "physical_damage": game_state.player.stats.physical_damage,
-                        "magic_damage": game_state.player.stats.magic_damage,
-                        "physical_defense": game_state.player.stats.physical_defense
-                    },
-                    "experience_system": game_state.player.exp_system.to_dict(),
-                    "inventory": game_state.player.inventory.to_dict()
-                },
-                "game_state": {
-                    "score": game_state.score,
-                    "level": game_state.level,
-                    "monsters_killed_in_wave": game_state.monsters_killed_in_wave
-                },
-                "quest_system": game_state.quest_system.to_dict() if hasattr(game_state, "quest_system") else None
-            }
-            
-            # Save game data
-            with open(save_file, 'w') as f:
-                json.dump(save_data, f, indent=2)
-                
-            # Update save slot metadata
-            self.save_slots[slot_id].player_level = game_state.player.exp_system.level
-            self.save_slots[slot_id].timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            # Take screenshot if requested
-            if take_screenshot and game_state.state == 1:  # Only if in playing state
-                # Get a copy of the screen
-                screen = pygame.display.get_surface()
-                screenshot = pygame.Surface((screen.get_width(), screen.get_height()))
-                screenshot.blit(screen, (0, 0))
-                
-                # Resize screenshot to thumbnail
-                thumbnail_size = (200, 150)
-                thumbnail = pygame.transform.scale(screenshot, thumbnail_size)
-                
-                # Save thumbnail
-                pygame.image.save(thumbnail, screenshot_file)
-                
-                # Update slot screenshot
-                self.save_slots[slot_id].screenshot = thumbnail
-                
-            # Save updated metadata
-            self.save_slots_metadata()
-            
-            self.current_slot = slot_id
+            save_data = self.snapshot_game(game_state)
+            
+            # The slot only shows the new level and time once the write has finished
+            saved_slot = SaveSlot(slot_id, self.save_slots[slot_id].save_name, game_state.player.exp_system.level)
+            metadata = [saved_slot.to_dict() if slot.slot_id == slot_id else slot.to_dict()
+                        for slot in self.save_slots.values()]
+            
+            # Take screenshot if requested (only in playing state): a small copy here,
+            # the encoder thread scales it down and hands it back to saved_slot
+            if take_screenshot and game_state.state == 1:
+                capture = capture_thumbnail(pygame.display.get_surface())
+                thumbnail_file = self.get_thumbnail_file(slot_id)
+                if not self.thumbnail_encoder.submit(saved_slot, thumbnail_file, capture):
+                    # Encoder is still busy with earlier saves, finish this one here
+                    saved_slot.screenshot = pygame.transform.scale(capture, THUMBNAIL_SIZE)
+                    self.writer.submit("thumbnail", slot_id, write_thumbnail, thumbnail_file, saved_slot.screenshot)
+            
+            self.writer.submit_save(slot_id, save_file, save_data, metadata_file, metadata)
+            self.pending_slots[slot_id] = saved_slot
+            self.set_status("Saving...")
             return True
         except Exception as e:
             print(f"Error saving game: {e}")
             return False
             
-    def load_game(self, slot_id, game_state):
-        """Load game from specified slot"""
-        if slot_id < 1 or slot_id > self.max_slots:
+    def quick_save(self, game_state):
+        """Queue a save of the whole game to the quick save file"""
+        try:
+            self.writer.submit_save(QUICK_SAVE_SLOT, self.get_quick_save_file(), self.snapshot_game(game_state))
+            self.set_status("Quick saving...")
+            return True
+        except Exception as e:
+            print(f"Error quick saving: {e}")
             return False
             
-        save_file = os.path.join(self.save_directory, f"slot_{slot_id}.json")
-        
-        if not os.path.exists(save_file):
+    def quick_load(self, game_state):
+        """Restore the game from the quick save file, right where the fight was"""
+        self.writer.wait()
+        quick_save_file = self.get_quick_save_file()
+        if not os.path.exists(quick_save_file):
+            self.set_status("No quick save")
             return False
             
         try:
-            # Load save data
-            with open(save_file, 'r') as f:
-                save_data = json.load(f)
+            with SaveReader(quick_save_file) as save_data:
+                save_data.verify()
+                self.apply_save(save_data, game_state)
+            game_state.state = 1  # PLAYING
+            self.set_status("Quick loaded")
+            return True
+        except Exception as e:
+            print(f"Error quick loading: {e}")
+            self.set_status("Quick load failed!")
+            return False
+            
+    def load_autosave(self, game_state):
+        """Restore the last autosave: its base snapshot with the journal replayed on top"""
+        self.writer.wait()
+        if not self.autosave.has_autosave():
+            return False
+            
+        try:
+            with self.autosave.open() as save_data:
+                self.apply_save(save_data, game_state)
+            game_state.state = 1  # PLAYING
+            self.set_status("Autosave loaded")
+            return True
+        except Exception as e:
+            print(f"Error loading autosave: {e}")
+            return False
+            
+    def update(self, game_state=None):
+        """Apply finished background saves to the slots, autosave and tick the status message"""
+        if game_state is not None and game_state.state == 1:  # Only autosave while playing
+            self.autosave.update(self, game_state)
+            
+        self.apply_finished_saves()
+        self.collect_thumbnails()
+        
+        # Show thumbnails the loader has finished; convert old PNG screenshots for next time
+        for slot_id, thumbnail, converted in self.thumbnail_loader.collect_ready():
+            slot = self.save_slots.get(slot_id)
+            if slot is None or slot.screenshot is not None or thumbnail is None:
+                continue
+            slot.screenshot = thumbnail
+            self.menu_panel.invalidate()
+            if converted:
+                self.writer.submit("thumbnail", slot_id, write_thumbnail,
+                                   self.get_thumbnail_file(slot_id), thumbnail.copy())
                 
-            # Load player data
-            player_data = save_data["player"]
-            game_state.player.x = player_data["x"]
-            game_state.player.y = player_data["y"]
-            
-            # Load character class
-            from dark_fantasy_game.src.stats import CharacterClass
-            game_state.player.character_class = CharacterClass(player_data["character_class"])
-            
-            # Load stats
-            stats_data = player_data["stats"]
-            game_state.player.stats.max_health = stats_data["max_health"]
-            game_state.player.stats.current_health = stats_data["current_health"]
-            game_state.player.stats.physical_damage = stats_data["physical_damage"]
-            game_state.player.stats.magic_damage = stats_data["magic_damage"]
-            game_state.player.stats.physical_defense = stats_data["physical_defense"]
-            
-            # Load experience system
-            if "experience_system" in player_data:
-                from dark_fantasy_game.src.experience_system import ExperienceSystem
-                exp_system = ExperienceSystem()
-                exp_system.level = player_data["experience_system"]["level"]
-                exp_system.experience = player_data["experience_system"]["experience"]
-                exp_system.skill_points = player_data["experience_system"]["skill_points"]
-                exp_system.upgradable_stats = player_data["experience_system"]["upgradable_stats"]
-                game_state.player.exp_system = exp_system
+        # Keep "Saving..." on screen until the writer is done
+        if self.status_timer > 0 and not self.writer.is_busy():
+            self.status_timer -= 1
+            
+    def apply_finished_saves(self):
+        """Apply saves the writer has finished to their slots and report them"""
+        for kind, slot_id, error in self.writer.collect_finished():
+            if kind != "save":
+                continue
+            if slot_id == QUICK_SAVE_SLOT:
+                self.set_status("Quick save failed!" if error is not None else "Quick saved")
+                continue
+            saved_slot = self.pending_slots.pop(slot_id, None)
+            if error is not None:
+                self.set_status("Save failed!")
+            elif saved_slot is not None:
+                slot = self.save_slots[slot_id]
+                slot.player_level = saved_slot.player_level
+                slot.timestamp = saved_slot.timestamp
+                if saved_slot.screenshot is not None:
+                    slot.screenshot = saved_slot.screenshot
+                self.current_slot = slot_id
+                self.menu_panel.invalidate()
+                self.set_status(f"Game saved to slot {slot_id}")
                 
-            # Load inventory
-            if "inventory" in player_data:
-                game_state.player.inventory.from_dict(player_data["inventory"])
+    def collect_thumbnails(self):
+        """Hand finished save thumbnails to their slots"""
+        for saved_slot, thumbnail in self.thumbnail_encoder.collect_ready():
+            if thumbnail is None:
+                continue
+            saved_slot.screenshot = thumbnail
+            # Still pending: applied with the rest of the slot when its save finishes
+            if self.pending_slots.get(saved_slot.slot_id) is not saved_slot:
+                self.save_slots[saved_slot.slot_id].screenshot = thumbnail
+                self.menu_panel.invalidate()
                 
-            # Load game state data
-            game_state_data = save_data["game_state"]
-            game_state.score = game_state_data["score"]
-            game_state.level = game_state_data["level"]
-            game_state.monsters_killed_in_wave = game_state_data["monsters_killed_in_wave"]
-            
-            # Load quest system if available
-            if "quest_system" in save_data and save_data["quest_system"]:
-                from dark_fantasy_game.src.quest_system import QuestSystem
-                game_state.quest_system = QuestSystem.from_dict(save_data["quest_system"])
+    def set_status(self, text):
+        self.status_text = text
+        self.status_timer = self.status_duration
+        
+    def draw_status(self, screen, scale_x=1.0, scale_y=1.0):
+        """Draw the save status message in the bottom right corner"""
+        if self.status_timer <= 0:
+            return
+            
+        if not self.font_large:
+            self.update_fonts(scale_x, scale_y)
+            
+        # Fade out over the last quarter of the duration
+        alpha = min(255, int(255 * self.status_timer / (self.status_duration / 4)))
+        text_surface = self.font_small.render(self.status_text, True, (255, 255, 255))
+        text_surface.set_alpha(alpha)
+        screen.blit(text_surface, (screen.get_width() - text_surface.get_width() - int(20 * scale_x),
+                                   screen.get_height() - text_surface.get_height() - int(60 * scale_y)))
+            
+    def load_game(self, slot_id, game_state):
+        """Load game from specified slot"""
+        if slot_id < 1 or slot_id > self.max_slots:
+            return False
+            
+        # A save still being written must land before it is read back
+        self.writer.wait()
+        save_file = self.get_save_file(slot_id)
+        legacy_file = self.get_legacy_save_file(slot_id)
+        
+        try:
+            if os.path.exists(save_file):
+                # Sections are decoded as apply_save asks for them
+                with SaveReader(save_file) as save_data:
+                    save_data.verify()
+                    self.apply_save(save_data, game_state)
+            elif os.path.exists(legacy_file):
+                with open(legacy_file, 'r') as f:
+                    self.apply_save(json.load(f), game_state)
+            else:
+                return False
                 
             # Update current slot
             self.current_slot = slot_id
@@ -243,28 +392,146 @@ class SaveSystem:
             print(f"Error loading game: {e}")
             return False
             
+    def apply_save(self, save_data, game_state):
+        """Restore the game from a save (a SaveReader, or the dict of an older JSON save)"""
+        # Load player data
+        player_data = save_data.get("player")
+        game_state.player.x = player_data["x"]
+        game_state.player.y = player_data["y"]
+        if "speed" in player_data:
+            game_state.player.speed = player_data["speed"]
+            
+        # Load character class
+        from dark_fantasy_game.src.stats import CharacterClass
+        game_state.player.character_class = CharacterClass(player_data["character_class"])
+        
+        # Load stats
+        stats_data = player_data["stats"]
+        game_state.player.stats.max_health = stats_data["max_health"]
+        game_state.player.stats.current_health = stats_data["current_health"]
+        game_state.player.stats.physical_damage = stats_data["physical_damage"]
+        game_state.player.stats.magic_damage = stats_data["magic_damage"]
+        game_state.player.stats.physical_defense = stats_data["physical_defense"]
+        
+        # Load experience system
+        if "experience_system" in player_data:
+            from dark_fantasy_game.src.experience_system import ExperienceSystem
+            exp_system = ExperienceSystem()
+            exp_system.level = player_data["experience_system"]["level"]
+            exp_system.experience = player_data["experience_system"]["experience"]
+            exp_system.skill_points = player_data["experience_system"]["skill_points"]
+            exp_system.upgradable_stats = player_data["experience_system"]["upgradable_stats"]
+            exp_system.total_skill_points_spent = player_data["experience_system"].get("total_skill_points_spent", 0)
+            game_state.player.exp_system = exp_system
+            
+        # Load inventory (older saves keep it inside the player data)
+        inventory_data = save_data.get("inventory") or player_data.get("inventory")
+        if inventory_data:
+            game_state.player.inventory.from_dict(inventory_data)
+            
+        # Load game state data
+        game_state_data = save_data.get("game_state")
+        game_state.score = game_state_data["score"]
+        game_state.level = game_state_data["level"]
+        game_state.monsters_killed_in_wave = game_state_data["monsters_killed_in_wave"]
+        
+        # Rebuild map from its seed if available
+        map_data = save_data.get("map")
+        if map_data:
+            from dark_fantasy_game.src.map import Map
+            game_state.game_map.chunks.stop_worker()
+            game_state.game_map = Map.from_dict(map_data)
+            game_state.mini_map.game_map = game_state.game_map
+            game_state.mini_map.update_scale()
+            
+        # Load quest system if available
+        quest_data = save_data.get("quest_system")
+        if quest_data:
+            from dark_fantasy_game.src.quest_system import QuestSystem
+            game_state.quest_system = QuestSystem.from_dict(quest_data)
+            
+        # Restore monsters, dropped items and effects (older saves have none of them)
+        monsters_data = save_data.get("monsters")
+        if monsters_data is not None:
+            self.restore_monsters(game_state, monsters_data)
+        items_data = save_data.get("items")
+        if items_data is not None:
+            self.restore_items(game_state, items_data)
+        effects_data = save_data.get("effects")
+        if effects_data is not None:
+            game_state.effects_manager.effects = []
+            for effect_type, x, y, duration, timer in effects_data:
+                game_state.effects_manager.add_effect(x, y, effect_type, duration)
+                game_state.effects_manager.effects[-1].timer = timer
+                
+        # Continue the wave where it was and put the camera back
+        world_data = save_data.get("world")
+        if world_data is not None:
+            game_state.camera_x, game_state.camera_y = world_data["camera"]
+            game_state.monsters_per_wave = world_data["monsters_per_wave"]
+            game_state.wave_manager.restore(world_data["wave_manager"])
+            
+        # The next autosave must be a full snapshot of the loaded game
+        self.autosave.reset()
+            
+    def restore_monsters(self, game_state, monsters_data):
+        """Replace the live monsters with saved records, reusing pooled monsters"""
+        from dark_fantasy_game.src.monster_types import MonsterType
+        for monster in list(game_state.monsters):
+            game_state.remove_monster(monster)
+        game_state.spawn_queue.clear()
+        
+        pool = game_state.wave_manager.monster_pool
+        for record in monsters_data:
+            monster_type, x, y, health, level = record[:5]
+            monster = pool.acquire(MonsterType(monster_type), x, y, level)
+            if len(record) > 5:
+                monster.apply_record(record)
+            else:
+                # Version 1 saves only kept type, position, health and level
+                monster.health = health
+            game_state.monsters.append(monster)
+            
+    def restore_items(self, game_state, items_data):
+        from dark_fantasy_game.src.game_state import Item
+        game_state.items = []
+        for record in items_data:
+            item = Item(*record[:3])
+            if len(record) > 3:
+                item.animation_offset, item.animation_direction = record[3:]
+            game_state.items.append(item)
+            
     def delete_save(self, slot_id):
         """Delete save from specified slot"""
         if slot_id < 1 or slot_id > self.max_slots:
             return False
             
-        save_file = os.path.join(self.save_directory, f"slot_{slot_id}.json")
-        screenshot_file = os.path.join(self.save_directory, f"slot_{slot_id}_screenshot.png")
-        
         try:
-            # Delete save file if it exists
-            if os.path.exists(save_file):
-                os.remove(save_file)
-                
-            # Delete screenshot if it exists
-            if os.path.exists(screenshot_file):
-                os.remove(screenshot_file)
+            # Let queued writes finish so they cannot recreate the deleted files
+            self.writer.wait()
+            self.thumbnail_encoder.wait()
+            # The slot's queued save is finished now: drop it so update() does not apply it to the empty slot
+            self.pending_slots.pop(slot_id, None)
+            self.apply_finished_saves()
+            self.collect_thumbnails()
+            
+            # Delete save files if they exist (binary and older JSON)
+            for save_file in (self.get_save_file(slot_id), self.get_legacy_save_file(slot_id)):
+                if os.path.exists(save_file):
+                    os.remove(save_file)
                 
+            # Delete thumbnail and old screenshot if they exist
+            for image_file in (self.get_thumbnail_file(slot_id), self.get_screenshot_file(slot_id)):
+                if os.path.exists(image_file):
+                    os.remove(image_file)
+                    
             # Reset slot metadata
             self.save_slots[slot_id] = SaveSlot(slot_id)
+            self.thumbnail_loader.forget(slot_id)
             
             # Save updated metadata
             self.save_slots_metadata()
+            self.menu_panel.invalidate()
             
             # Reset current slot if it was deleted
             if self.current_slot == slot_id:
@@ -283,6 +550,7 @@ class SaveSystem:
         try:
             self.save_slots[slot_id].save_name = new_name
             self.save_slots_metadata()
+            self.menu_panel.invalidate()
             return True
         except Exception as e:
             print(f"Error renaming save: {e}")
@@ -359,10 +627,13 @@ class SaveSystem:
                         self.save_game(slot_id, game_state)
                         self.show_save_menu = False
                     elif self.show_load_menu:
-                        save_file = os.path.join(self.save_directory, f"slot_{slot_id}.json")
-                        if os.path.exists(save_file):
+                        if self.has_save(slot_id):
                             self.load_game(slot_id, game_state)
                             self.show_load_menu = False
+                elif event.key == pygame.K_a and self.show_load_menu:
+                    # Load the autosave
+                    if self.load_autosave(game_state):
+                        self.show_load_menu = False
                 elif event.key == pygame.K_DELETE:
                     # Delete selected save
                     slot_id = self.get_selected_slot_id()
@@ -389,6 +660,30 @@ class SaveSystem:
         menu_x = (screen.get_width() - menu_width) // 2
         menu_y = (screen.get_height() - menu_height) // 2
         
+        state_key = self.get_menu_state(menu_width, menu_height)
+        self.menu_panel.draw(screen, menu_x, menu_y, state_key,
+                             lambda: self.render_save_load_menu(menu_width, menu_height))
+        
+        # Draw blinking cursor on top of the cached menu
+        if self.rename_mode and pygame.time.get_ticks() % 1000 < 500:
+            cursor_rect = self.menu_panel.get_rect("cursor")
+            if cursor_rect:
+                pygame.draw.line(screen, (255, 255, 255), 
+                                cursor_rect.topleft, cursor_rect.bottomleft, 1)
+        
+    def get_menu_state(self, menu_width, menu_height):
+        """Get a key describing everything shown in the save/load menu"""
+        slots = tuple(
+            (slot.save_name, slot.player_level, slot.timestamp, id(slot.screenshot))
+            for slot in self.save_slots.values()
+        )
+        return (menu_width, menu_height, self.show_save_menu, self.selected_slot_index,
+                self.rename_mode, self.new_save_name, slots)
+        
+    def render_save_load_menu(self, menu_width, menu_height):
+        """Render save or load menu to a surface and return it with its layout rects"""
+        rects = {}
+        
         # Create menu surface with transparency
         menu_surface = pygame.Surface((menu_width, menu_height), pygame.SRCALPHA)
         menu_surface.fill((0, 0, 0, 230))
@@ -415,6 +710,8 @@ class SaveSystem:
         for i in range(1, self.max_slots + 1):
             slot = self.save_slots[i]
             
+            rects[i] = pygame.Rect(10, slot_y - 5, menu_width - 20, slot_height + 10)
+            
             # Highlight selected slot
             if i - 1 == self.selected_slot_index:
                 pygame.draw.rect(menu_surface, (50, 50, 80), 
@@ -437,19 +734,15 @@ class SaveSystem:
                 name_text = self.font_medium.render(self.new_save_name, True, (255, 255, 255))
                 menu_surface.blit(name_text, (125, slot_y + 5))
                 
-                # Draw blinking cursor
-                if pygame.time.get_ticks() % 1000 < 500:
-                    cursor_x = 125 + name_text.get_width()
-                    pygame.draw.line(menu_surface, (255, 255, 255), 
-                                    (cursor_x, slot_y + 5), 
-                                    (cursor_x, slot_y + 25), 1)
+                # Remember cursor position, the cursor itself blinks on screen
+                cursor_x = 125 + name_text.get_width()
+                rects["cursor"] = pygame.Rect(cursor_x, slot_y + 5, 1, 20)
             else:
                 name_text = self.font_medium.render(slot.save_name, True, (255, 255, 255))
                 menu_surface.blit(name_text, (120, slot_y))
             
             # Draw save info
-            save_file = os.path.join(self.save_directory, f"slot_{i}.json")
-            if os.path.exists(save_file):
+            if self.has_save(i):
                 # Draw level and timestamp
                 level_text = self.font_small.render(f"Level: {slot.player_level}", True, (200, 200, 200))
                 menu_surface.blit(level_text, (120, slot_y + 30))
@@ -457,9 +750,11 @@ class SaveSystem:
                 time_text = self.font_small.render(slot.timestamp, True, (150, 150, 150))
                 menu_surface.blit(time_text, (250, slot_y + 30))
                 
-                # Draw screenshot thumbnail if available
-                if slot.screenshot:
-                    thumbnail_size = (80, 60)
+                # Draw screenshot thumbnail if available, or have it loaded for the next frames
+                if not slot.screenshot:
+                    self.thumbnail_loader.request(i, self.get_thumbnail_file(i), self.get_screenshot_file(i))
+                else:
+                    thumbnail_size = THUMBNAIL_SIZE
                     thumbnail_x = menu_width - thumbnail_size[0] - 20
                     thumbnail_y = slot_y
                     
@@ -468,9 +763,11 @@ class SaveSystem:
                                     (thumbnail_x - 2, thumbnail_y - 2, 
                                      thumbnail_size[0] + 4, thumbnail_size[1] + 4))
                     
-                    # Draw thumbnail
-                    menu_surface.blit(pygame.transform.scale(slot.screenshot, thumbnail_size), 
-                                     (thumbnail_x, thumbnail_y))
+                    # Draw thumbnail (already stored at display size)
+                    thumbnail = slot.screenshot
+                    if thumbnail.get_size() != thumbnail_size:
+                        thumbnail = pygame.transform.scale(thumbnail, thumbnail_size)
+                    menu_surface.blit(thumbnail, (thumbnail_x, thumbnail_y))
             else:
                 # Draw empty slot text
                 empty_text = self.font_small.render("Empty Slot", True, (150, 150, 150))
@@ -499,6 +796,8 @@ class SaveSystem:
                     "Delete: Delete save",
                     "Esc: Cancel"
                 ]
+                if self.autosave.has_autosave():
+                    instructions.insert(1, "A: Load autosave")
                 
         # Draw instructions
         instruction_y = menu_height - 30 * len(instructions) - 10
@@ -508,8 +807,7 @@ class SaveSystem:
             menu_surface.blit(inst_text, (inst_x, instruction_y))
             instruction_y += 25
             
-        # Draw menu
-        screen.blit(menu_surface, (menu_x, menu_y))
+        return menu_surface, rects
         
     def to_dict(self):
         """Convert save system state to dictionary"""
@@ -0,0 +1,102 @@
+import os
+import json
+import queue
+import threading
+from dark_fantasy_game.src.save_format import encode_save
+
+def write_atomic(path, write):
+    """Write a file through a temp file and rename it over the target
+    
+    A crash or power loss mid-write leaves the previous file intact instead of
+    a truncated one. write(f) receives the open binary temp file.
+    """
+    temp_file = f"{path}.tmp"
+    with open(temp_file, 'wb') as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_file, path)
+
+class SaveWriter:
+    """Serialize and write save files on a background thread
+    
+    The game thread only hands over a snapshot (plain dicts and lists that no
+    longer reference live game objects) and keeps running; encoding and disk
+    writes happen here. Jobs run in the order they were
+    queued, so a metadata write never overtakes the save it describes.
+    Finished jobs are reported through collect_finished().
+    """
+    def __init__(self):
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.worker = None
+        self.pending = 0  # Jobs queued but not yet collected
+        
+    def start_worker(self):
+        """Start the writer thread if it is not running"""
+        if self.worker is None or not self.worker.is_alive():
+            self.worker = threading.Thread(target=self.worker_loop, daemon=True)
+            self.worker.start()
+            
+    def stop_worker(self):
+        """Finish queued writes, then stop the writer thread"""
+        if self.worker is not None and self.worker.is_alive():
+            self.requests.put(None)
+            self.worker.join(timeout=5.0)
+        self.worker = None
+        
+    def submit(self, kind, slot_id, write, *args):
+        """Queue write(*args) to run on the writer thread; kind and slot_id are reported back when it finishes"""
+        self.pending += 1
+        self.requests.put((kind, slot_id, write, args))
+        self.start_worker()
+        
+    def submit_save(self, slot_id, save_file, save_data, metadata_file=None, metadata=None):
+        """Queue a save: game data, then the optional slot metadata"""
+        self.submit("save", slot_id, self.write_save, save_file, save_data, metadata_file, metadata)
+        
+    def submit_metadata(self, metadata_file, metadata):
+        """Queue a metadata-only write (rename, delete)"""
+        self.submit("metadata", None, self.write_metadata, metadata_file, metadata)
+        
+    def is_busy(self):
+        return self.pending > 0
+        
+    def wait(self):
+        """Block until every queued job has been written (used before loading or deleting files)"""
+        if self.worker is not None and self.worker.is_alive():
+            self.requests.join()
+            
+    def worker_loop(self):
+        while True:
+            job = self.requests.get()
+            if job is None:
+                self.requests.task_done()
+                break
+            kind, slot_id, write, args = job
+            try:
+                write(*args)
+                self.results.put((kind, slot_id, None))
+            except Exception as e:
+                print(f"Error writing save: {e}")
+                self.results.put((kind, slot_id, e))
+            self.requests.task_done()
+            
+    def write_save(self, save_file, save_data, metadata_file, metadata):
+        write_atomic(save_file, lambda f: f.write(encode_save(save_data)))
+        if metadata is not None:
+            self.write_metadata(metadata_file, metadata)
+        
+    def write_metadata(self, metadata_file, metadata):
+        write_atomic(metadata_file, lambda f: f.write(json.dumps(metadata, indent=2).encode("utf-8")))
+        
+    def collect_finished(self):
+        """Return (kind, slot_id, error) for every job finished since the last call"""
+        finished = []
+        while True:
+            try:
+                finished.append(self.results.get_nowait())
+            except queue.Empty:
+                break
+        self.pending = max(0, self.pending - len(finished))
+        return finished
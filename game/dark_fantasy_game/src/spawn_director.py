@@ -0,0 +1,83 @@
+from collections import deque
+from dark_fantasy_game.src.monster_types import LEVEL_SCALING
+
+class SpawnDirector:
+    """Điều chỉnh nhịp spawn theo số quái vật đang sống và thời gian cập nhật đo được
+    
+    GameState báo thời gian cập nhật mỗi frame qua observe(); cứ mỗi
+    decision_interval frame, director so tải (thời gian trung bình so với
+    frame_budget_ms, số quái vật so với target_monsters) để giãn hoặc thu
+    nhịp spawn (cadence nhân vào spawn_delay/auto_spawn_delay, không nhỏ hơn
+    1 nên không bao giờ spawn nhanh hơn thiết kế gốc). Khi nhịp bị giãn, quái
+    vật spawn được tăng cấp để tổng sức mạnh theo thời gian giữ như cũ - ít
+    quái vật hơn nhưng mạnh hơn. Các quyết định được ghi vào decisions để tinh chỉnh.
+    """
+    def __init__(self, frame_budget_ms=6.0, target_monsters=80, max_monsters=120, max_cadence=4.0,
+                 decision_interval=60, smoothing=0.05, verbose=False):
+        self.frame_budget_ms = frame_budget_ms  # Ngân sách CPU cho phần cập nhật game mỗi frame
+        self.target_monsters = target_monsters
+        self.max_monsters = max_monsters  # Đạt mức này thì ngừng spawn hẳn
+        self.max_cadence = max_cadence
+        self.decision_interval = decision_interval
+        self.smoothing = smoothing
+        self.verbose = verbose  # In quyết định ra console
+        self.average_ms = None
+        self.live_count = 0
+        self.frames = 0
+        self.cadence = 1.0
+        self.decisions = deque(maxlen=256)
+        
+    def observe(self, update_ms, live_count):
+        """Ghi nhận thời gian cập nhật của frame vừa rồi và số quái vật đang sống"""
+        if self.average_ms is None:
+            self.average_ms = update_ms
+        else:
+            self.average_ms += (update_ms - self.average_ms) * self.smoothing
+        self.live_count = live_count
+        self.frames += 1
+        if self.frames % self.decision_interval == 0:
+            self.decide()
+            
+    def get_load(self):
+        """Tải hiện tại: tỉ lệ lớn hơn giữa thời gian/ngân sách và số quái vật/mục tiêu"""
+        time_load = (self.average_ms or 0.0) / self.frame_budget_ms
+        return max(time_load, self.live_count / self.target_monsters)
+        
+    def decide(self):
+        load = self.get_load()
+        if load > 1.0:
+            cadence = min(self.max_cadence, self.cadence * 1.25)
+        elif load < 0.7:
+            cadence = max(1.0, self.cadence / 1.25)
+        else:
+            cadence = self.cadence
+        if cadence == self.cadence:
+            return
+            
+        decision = {
+            "frame": self.frames,
+            "update_ms": round(self.average_ms, 3),
+            "monsters": self.live_count,
+            "load": round(load, 3),
+            "cadence": round(cadence, 3),
+        }
+        self.decisions.append(decision)
+        if self.verbose:
+            print(f"Spawn director: cadence {self.cadence:.2f} -> {cadence:.2f} "
+                  f"(update {self.average_ms:.2f} ms, {self.live_count} monsters)")
+        self.cadence = cadence
+        
+    def can_spawn(self):
+        return self.live_count < self.max_monsters
+        
+    def get_delay(self, delay):
+        """Số frame chờ giữa hai lần spawn sau khi áp nhịp hiện tại"""
+        return delay * self.cadence
+        
+    def get_level(self, level):
+        """Cấp độ quái vật spawn, tăng khi nhịp bị giãn để bù số lượng"""
+        if self.cadence <= 1.0:
+            return level
+        # Hệ số cấp độ (xem MonsterStats.apply_level_scaling) nhân theo nhịp
+        factor = (1 + (level - 1) * LEVEL_SCALING) * self.cadence
+        return max(level, int(round((factor - 1) / LEVEL_SCALING)) + 1)
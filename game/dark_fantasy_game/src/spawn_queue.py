@@ -0,0 +1,50 @@
+from collections import deque
+
+class SpawnQueue:
+    """Hàng đợi có giới hạn cho các quái vật được triệu hồi trong trận
+    
+    Yêu cầu triệu hồi được xếp hàng thay vì spawn ngay: hàng đợi giữ tối đa
+    max_pending yêu cầu, mỗi frame chỉ spawn tối đa spawns_per_frame quái
+    vật và không bao giờ để tổng số quái vật vượt quá max_monsters. Yêu cầu
+    vượt giới hạn bị bỏ (đếm trong dropped) để boss triệu hồi liên tục không
+    làm số quái vật hay thời gian frame tăng vọt.
+    """
+    def __init__(self, max_pending=16, max_monsters=120, spawns_per_frame=2):
+        self.max_pending = max_pending
+        self.max_monsters = max_monsters
+        self.spawns_per_frame = spawns_per_frame
+        self.pending = deque()
+        self.spawned = 0
+        self.dropped = 0
+        
+    def push(self, request):
+        """Thêm yêu cầu triệu hồi; trả về False nếu hàng đợi đã đầy"""
+        if len(self.pending) >= self.max_pending:
+            self.dropped += 1
+            return False
+        self.pending.append(request)
+        return True
+        
+    def pop_ready(self, live_count):
+        """Các yêu cầu được spawn trong frame này khi đang có live_count quái vật"""
+        budget = min(self.spawns_per_frame, self.max_monsters - live_count)
+        ready = []
+        while self.pending and len(ready) < budget:
+            ready.append(self.pending.popleft())
+        self.spawned += len(ready)
+        
+        # Đã chạm giới hạn quái vật: bỏ các yêu cầu còn lại thay vì để chúng xuất hiện muộn
+        if self.pending and live_count + len(ready) >= self.max_monsters:
+            self.dropped += len(self.pending)
+            self.pending.clear()
+        return ready
+        
+    def clear(self):
+        self.pending.clear()
+        
+    def get_stats(self):
+        return {
+            "pending": len(self.pending),
+            "spawned": self.spawned,
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,89 @@
+import math
+import random
+import numpy as np
+
+class SpawnSampler:
+    """Chọn nhanh các điểm xuất hiện hợp lệ quanh người chơi
+    
+    Giữ chỉ mục các ô đi qua được quanh ô của người chơi (lấy từ các chunk
+    đã nạp), sắp xếp và chia thành các vòng theo khoảng cách. Một yêu cầu
+    "cách người chơi từ min đến max pixel" chỉ cần chọn ngẫu nhiên trong
+    đoạn các vòng tương ứng - O(1), không phải thử lại is_passable.
+    Chỉ mục được dựng lại khi người chơi sang ô khác hoặc địa hình thay đổi.
+    """
+    def __init__(self, game_map, max_distance=800, ring_width=32):
+        self.game_map = game_map
+        self.max_distance = max_distance  # Khoảng cách xa nhất được hỗ trợ (pixel)
+        self.ring_width = ring_width  # Độ rộng mỗi vòng (pixel)
+        self.radius = int(math.ceil(max_distance / game_map.tile_size)) + 1  # Bán kính vùng chỉ mục (ô)
+        self.anchor = None  # (tile_x, tile_y, revision) lúc dựng chỉ mục
+        self.cells_x = None
+        self.cells_y = None
+        self.ring_starts = None  # Vị trí bắt đầu của từng vòng trong mảng ô đã sắp xếp
+        self.build_count = 0
+        
+    def update(self, player_x, player_y):
+        """Dựng lại chỉ mục nếu người chơi đã sang ô khác hoặc địa hình thay đổi"""
+        tile_size = self.game_map.tile_size
+        anchor = (int(player_x // tile_size), int(player_y // tile_size), self.game_map.revision)
+        if anchor != self.anchor:
+            self.anchor = anchor
+            self.build(anchor[0], anchor[1])
+            
+    def build(self, tile_x, tile_y):
+        """Lập chỉ mục các ô đi qua được quanh ô (tile_x, tile_y), chia theo vòng khoảng cách"""
+        tile_size = self.game_map.tile_size
+        size = self.radius * 2 + 1
+        passable = self.game_map.chunks.get_window(tile_x - self.radius, tile_y - self.radius, size, size,
+                                                   missing=False, layer="passable_mask")
+        local_y, local_x = np.nonzero(passable)
+        
+        # Khoảng cách (pixel) từ tâm ô người chơi đến tâm từng ô
+        offset_x = local_x - self.radius
+        offset_y = local_y - self.radius
+        distance = np.sqrt(offset_x * offset_x + offset_y * offset_y) * tile_size
+        rings = (distance // self.ring_width).astype(np.int32)
+        
+        order = np.argsort(rings, kind='stable')
+        rings = rings[order]
+        self.cells_x = offset_x[order] + tile_x
+        self.cells_y = offset_y[order] + tile_y
+        ring_count = int(self.max_distance // self.ring_width) + 2
+        self.ring_starts = np.searchsorted(rings, np.arange(ring_count + 1))
+        self.build_count += 1
+        
+    def get_range(self, min_distance, max_distance):
+        """Đoạn [start, end) trong mảng ô ứng với khoảng cách min..max"""
+        last_ring = len(self.ring_starts) - 2
+        first = min(int(min_distance // self.ring_width), last_ring)
+        last = min(int(max_distance // self.ring_width), last_ring)
+        return int(self.ring_starts[first]), int(self.ring_starts[last + 1])
+        
+    def cell_to_point(self, index):
+        """Tọa độ pixel gần tâm ô thứ index (dùng làm tâm quái vật)"""
+        tile_size = self.game_map.tile_size
+        return ((int(self.cells_x[index]) + random.uniform(0.4, 0.6)) * tile_size,
+                (int(self.cells_y[index]) + random.uniform(0.4, 0.6)) * tile_size)
+                
+    def sample(self, player_x, player_y, min_distance=300, max_distance=600):
+        """Lấy một điểm xuất hiện hợp lệ cách người chơi min..max pixel, hoặc None nếu không có"""
+        points = self.sample_batch(player_x, player_y, 1, min_distance, max_distance)
+        return points[0] if points else None
+        
+    def sample_batch(self, player_x, player_y, count, min_distance=300, max_distance=600,
+                     min_separation=0, max_tries=8):
+        """Lấy tối đa count điểm xuất hiện hợp lệ, các điểm cách nhau ít nhất min_separation pixel"""
+        self.update(player_x, player_y)
+        start, end = self.get_range(min_distance, max_distance)
+        if start >= end:
+            return []
+            
+        points = []
+        min_separation_sq = min_separation * min_separation
+        for _ in range(count):
+            for _ in range(max_tries):
+                point = self.cell_to_point(random.randrange(start, end))
+                if all((point[0] - x) ** 2 + (point[1] - y) ** 2 >= min_separation_sq for x, y in points):
+                    points.append(point)
+                    break
+        return points
@@ -1,5 +1,6 @@
 import pygame
 from enum import Enum
+from dark_fantasy_game.src.ui_panel import CachedPanel
 
 # Character classes
 class CharacterClass(Enum):
@@ -51,6 +52,7 @@ class Stats:
         self.font = pygame.font.SysFont(None, 32)
         self.small_font = pygame.font.SysFont(None, 24)
         self.stat_buttons = {}  # Will store rect objects for the + buttons
+        self.panel = CachedPanel()
     
     def update_derived_stats(self):
         """Update all derived stats based on base stats"""
@@ -83,6 +85,13 @@ class Stats:
             return True
         return False
     
+    def get_panel_state(self, width, height):
+        """Build the state key that decides when the stats panel must be re-rendered"""
+        return (width, height, self.upgrade_points, tuple(self.stats.values()),
+                self.max_health, self.physical_damage, self.magic_damage,
+                self.physical_defense, self.magic_defense,
+                self.physical_accuracy, self.magic_accuracy, self.dodge_chance)
+    
     def draw_stats_panel(self, screen, x, y, width=300, height=400):
         """Draw the stats panel at the specified position"""
         # Get screen dimensions
@@ -93,43 +102,49 @@ class Stats:
         x = max(10, min(x, screen_width - width - 10))
         y = max(10, min(y, screen_height - height - 10))
         
+        # Draw cached panel, re-rendering only when stats change
+        self.panel.draw(screen, x, y, self.get_panel_state(width, height),
+                        lambda: self.render_stats_panel(width, height))
+        self.stat_buttons = self.panel.get_screen_rects()
+    
+    def render_stats_panel(self, width, height):
+        """Render the stats panel to an off-screen surface and return it with its + button rects"""
+        rects = {}
+        
         # Draw semi-transparent background
-        stats_surface = pygame.Surface((width, height))
-        stats_surface.set_alpha(230)
-        stats_surface.fill(BLACK)
-        screen.blit(stats_surface, (x, y))
+        stats_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        stats_surface.fill((*BLACK, 230))
         
         # Draw title
         title_text = self.font.render(f"{self.character_class.value} Stats", True, YELLOW)
-        screen.blit(title_text, (x + 20, y + 10))
+        stats_surface.blit(title_text, (20, 10))
         
         # Draw remaining points
         points_text = self.small_font.render(f"Điểm nâng cấp còn lại: {self.upgrade_points}", True, GREEN)
-        screen.blit(points_text, (x + 20, y + 40))
+        stats_surface.blit(points_text, (20, 40))
         
         # Draw stats and + buttons
-        y_pos = y + 80
-        self.stat_buttons.clear()  # Clear previous buttons
+        y_pos = 80
         
         for stat, value in self.stats.items():
             # Stat name and value
             stat_text = self.font.render(f"{stat}: {value}", True, WHITE)
-            screen.blit(stat_text, (x + 20, y_pos))
+            stats_surface.blit(stat_text, (20, y_pos))
             
             # + button
             if self.upgrade_points > 0:
-                plus_button = pygame.Rect(x + 150, y_pos, 30, 30)
-                pygame.draw.rect(screen, GREEN, plus_button)
+                plus_button = pygame.Rect(150, y_pos, 30, 30)
+                pygame.draw.rect(stats_surface, GREEN, plus_button)
                 plus_text = self.font.render("+", True, BLACK)
-                screen.blit(plus_text, (x + 160, y_pos + 5))
-                self.stat_buttons[stat] = plus_button
+                stats_surface.blit(plus_text, (160, y_pos + 5))
+                rects[stat] = plus_button
             
             y_pos += 40
         
         # Draw derived stats
         y_pos += 20
         derived_title = self.font.render("Derived Stats:", True, YELLOW)
-        screen.blit(derived_title, (x + 20, y_pos))
+        stats_surface.blit(derived_title, (20, y_pos))
         y_pos += 30
         
         derived_stats = [
@@ -145,13 +160,14 @@ class Stats:
         
         for stat in derived_stats:
             stat_text = self.small_font.render(stat, True, GRAY)
-            screen.blit(stat_text, (x + 20, y_pos))
+            stats_surface.blit(stat_text, (20, y_pos))
             y_pos += 25
+            
+        return stats_surface, rects
     
     def handle_click(self, pos):
         """Handle mouse clicks on the stats panel"""
-        for stat, button in self.stat_buttons.items():
-            if button.collidepoint(pos):
-                if self.increase_stat(stat):
-                    return True
+        stat = self.panel.hit_test(pos)
+        if stat is not None and self.increase_stat(stat):
+            return True
         return False
@@ -0,0 +1,116 @@
+import numpy as np
+
+CELL_KEY_OFFSET = 2 ** 30  # Dời tọa độ ô về số dương để ghép (ô x, ô y) thành một khóa int64
+CELL_KEY_STRIDE = 2 ** 31
+
+class SpatialGrid:
+    """Chỉ mục lưới đều cho nhiều điểm, dựng bằng sắp xếp NumPy
+    
+    Các điểm được sắp theo khóa ô; mỗi ô là một đoạn liên tiếp trong mảng đã
+    sắp. Truy vấn hàng xóm chỉ xét 9 ô quanh mỗi điểm nên tổng chi phí tỉ lệ
+    với số cặp gần nhau, không phải O(n²).
+    """
+    def __init__(self, xs, ys, cell_size):
+        self.cell_size = cell_size
+        self.cell_x = np.floor(xs / cell_size).astype(np.int64)
+        self.cell_y = np.floor(ys / cell_size).astype(np.int64)
+        keys = self.get_keys(self.cell_x, self.cell_y)
+        self.order = np.argsort(keys, kind='stable')
+        self.cell_keys, self.cell_starts, self.cell_counts = np.unique(keys[self.order], return_index=True,
+                                                                       return_counts=True)
+                                                                       
+    def get_keys(self, cell_x, cell_y):
+        return (cell_x + CELL_KEY_OFFSET) * CELL_KEY_STRIDE + (cell_y + CELL_KEY_OFFSET)
+        
+    def query_pairs(self):
+        """Tất cả cặp chỉ số (i, j), i khác j, nằm cùng ô hoặc ở hai ô kề nhau (mỗi cặp xuất hiện hai chiều)"""
+        firsts = []
+        seconds = []
+        for offset_x in (-1, 0, 1):
+            for offset_y in (-1, 0, 1):
+                keys = self.get_keys(self.cell_x + offset_x, self.cell_y + offset_y)
+                slots = np.minimum(np.searchsorted(self.cell_keys, keys), len(self.cell_keys) - 1)
+                points = np.nonzero(self.cell_keys[slots] == keys)[0]
+                if points.size == 0:
+                    continue
+                    
+                # Ghép mỗi điểm với mọi điểm trong ô hàng xóm (nối các đoạn bằng repeat/cumsum)
+                counts = self.cell_counts[slots[points]]
+                starts = np.repeat(self.cell_starts[slots[points]], counts)
+                group_starts = np.repeat(np.cumsum(counts) - counts, counts)
+                firsts.append(np.repeat(points, counts))
+                seconds.append(self.order[starts + np.arange(counts.sum()) - group_starts])
+                
+        if not firsts:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+        firsts = np.concatenate(firsts)
+        seconds = np.concatenate(seconds)
+        different = firsts != seconds
+        return firsts[different], seconds[different]
+
+def steer_crowd(monsters, updated, spacing=0.75, strength=0.5, alignment=0.0):
+    """Đẩy các quái vật đứng quá gần nhau ra xa (tách đàn), tùy chọn cho đi cùng hướng (căn hàng)
+    
+    monsters là tất cả quái vật (dùng làm hàng xóm); updated là danh sách
+    (quái vật, ticks) vừa di chuyển trong frame này - chỉ chúng bị đẩy. Hai
+    quái vật giữ khoảng cách spacing x kích thước trung bình; lực đẩy của mỗi
+    lần cập nhật không vượt quá quãng đường quái vật đi được trong ticks frame.
+    """
+    if len(monsters) < 2 or not updated:
+        return
+        
+    centers_x = np.array([monster.x + monster.width / 2 for monster in monsters])
+    centers_y = np.array([monster.y + monster.height / 2 for monster in monsters])
+    sizes = np.array([monster.width for monster in monsters], dtype=np.float64)
+    grid = SpatialGrid(centers_x, centers_y, sizes.max() * spacing)
+    first, second = grid.query_pairs()
+    
+    dx = centers_x[first] - centers_x[second]
+    dy = centers_y[first] - centers_y[second]
+    distance = np.sqrt(dx * dx + dy * dy)
+    desired = (sizes[first] + sizes[second]) / 2 * spacing
+    close = distance < desired
+    first, second = first[close], second[close]
+    dx, dy, distance, desired = dx[close], dy[close], distance[close], desired[close]
+    
+    # Hai quái vật trùng vị trí: tách theo trục x, hướng theo thứ tự chỉ số để hai bên đi ngược nhau
+    overlapping = distance < 1e-6
+    dx[overlapping] = np.where(first[overlapping] < second[overlapping], 1.0, -1.0)
+    dy[overlapping] = 0.0
+    distance[overlapping] = 1.0
+    
+    # Mỗi bên tự lùi một nửa phần chồng lấn (nhân strength)
+    push = (desired - distance) / distance * (strength * 0.5)
+    count = len(monsters)
+    push_x = np.bincount(first, weights=dx * push, minlength=count)
+    push_y = np.bincount(first, weights=dy * push, minlength=count)
+    
+    if alignment > 0 and first.size:
+        # Căn hàng: hướng theo vận tốc trung bình của các quái vật lân cận
+        velocity_x = np.array([monster.x - getattr(monster, "prev_x", monster.x) for monster in monsters])
+        velocity_y = np.array([monster.y - getattr(monster, "prev_y", monster.y) for monster in monsters])
+        neighbours = np.bincount(first, minlength=count)
+        has_neighbours = neighbours > 0
+        neighbours = np.maximum(neighbours, 1)
+        average_x = np.bincount(first, weights=velocity_x[second], minlength=count) / neighbours
+        average_y = np.bincount(first, weights=velocity_y[second], minlength=count) / neighbours
+        push_x += np.where(has_neighbours, (average_x - velocity_x) * alignment, 0.0)
+        push_y += np.where(has_neighbours, (average_y - velocity_y) * alignment, 0.0)
+        
+    indices = {id(monster): i for i, monster in enumerate(monsters)}
+    for monster, ticks in updated:
+        i = indices.get(id(monster))
+        if i is None:
+            continue
+        step_x = push_x[i]
+        step_y = push_y[i]
+        if step_x == 0 and step_y == 0:
+            continue
+        length = (step_x * step_x + step_y * step_y) ** 0.5
+        limit = monster.speed * ticks
+        if length > limit:
+            step_x *= limit / length
+            step_y *= limit / length
+        monster.x += step_x
+        monster.y += step_y
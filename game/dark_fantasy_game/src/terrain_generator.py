@@ -0,0 +1,122 @@
+import numpy as np
+
+# Tăng khi thuật toán sinh địa hình thay đổi (kết quả từ cùng seed sẽ khác)
+GENERATOR_VERSION = 2
+
+# Id tile, trùng với palette TILE_TYPES trong map.py
+GRASS, DIRT, STONE, WATER, TREE, WALL = range(6)
+
+class TerrainGenerator:
+    """Sinh lưới id tile (uint8) từ seed bằng các phép toán vector NumPy
+    
+    Mỗi ô chỉ phụ thuộc vào seed và tọa độ thế giới của nó, nên có thể sinh
+    từng vùng (chunk) riêng lẻ theo bất kỳ thứ tự nào mà vẫn khớp nhau.
+    """
+    def __init__(self, seed, spawn_cell=(0, 0)):
+        self.seed = seed
+        self.spawn_cell = spawn_cell  # Ô người chơi xuất hiện
+        
+        # Các lớp địa hình: (id tile, kích thước ô noise, ngưỡng)
+        # Lớp sau ghi đè lên lớp trước, ngưỡng càng cao vùng càng nhỏ
+        self.layers = [
+            (DIRT, 24, 0.68),
+            (STONE, 16, 0.72),
+            (WATER, 32, 0.74),  # Nước không thể đi qua
+        ]
+        self.edge_roughness = 0.06  # Làm viền vùng không đều
+        self.tree_density = 0.0003  # Tỷ lệ ô có cây (~200 cây trên map 800x800)
+        self.spawn_clearing = 4  # Bán kính vùng trống quanh ô xuất hiện (ô)
+        
+    def hash_noise(self, xs, ys, salt):
+        """Giá trị ngẫu nhiên [0, 1) cố định cho mỗi tọa độ nguyên (xs, ys)"""
+        h = xs.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+        h = h ^ (ys.astype(np.uint64) * np.uint64(0xC2B2AE3D27D4EB4F))
+        h ^= np.uint64((self.seed * 0x165667B1 + salt * 0x27D4EB2F) & 0xFFFFFFFFFFFFFFFF)
+        
+        # Trộn bit kiểu splitmix64
+        h ^= h >> np.uint64(30)
+        h *= np.uint64(0xBF58476D1CE4E5B9)
+        h ^= h >> np.uint64(27)
+        h *= np.uint64(0x94D049BB133111EB)
+        h ^= h >> np.uint64(31)
+        return (h >> np.uint64(40)).astype(np.float32) / np.float32(1 << 24)
+        
+    def interpolation_coords(self, start, size, cell_size):
+        """Chỉ số điểm lưới và hệ số smoothstep cho các ô start..start+size"""
+        grid_start = start // cell_size
+        grid_size = (start + size - 1) // cell_size - grid_start + 2
+        
+        coords = np.arange(start, start + size, dtype=np.int64) - grid_start * cell_size
+        index = coords // cell_size
+        t = (coords - index * cell_size).astype(np.float32) / np.float32(cell_size)
+        t = t * t * (3 - 2 * t)
+        return grid_start, grid_size, index, t
+        
+    def value_noise(self, x, y, width, height, cell_size, salt):
+        """Tạo value noise mượt trong khoảng [0, 1] cho vùng (x, y, width, height)"""
+        grid_x, grid_width, index_x, tx = self.interpolation_coords(x, width, cell_size)
+        grid_y, grid_height, index_y, ty = self.interpolation_coords(y, height, cell_size)
+        
+        # Giá trị tại các điểm lưới lấy từ hash tọa độ lưới
+        lattice_xs = np.arange(grid_x, grid_x + grid_width, dtype=np.int64)
+        lattice_ys = np.arange(grid_y, grid_y + grid_height, dtype=np.int64)
+        lattice = self.hash_noise(lattice_xs[None, :], lattice_ys[:, None], salt)
+        
+        # Nội suy tách theo trục: trước theo x trên lưới thưa, sau theo y cho cả vùng
+        rows = lattice[:, index_x] * (1 - tx) + lattice[:, index_x + 1] * tx
+        ty = ty[:, None]
+        return rows[index_y] * (1 - ty) + rows[index_y + 1] * ty
+        
+    def fractal_noise(self, x, y, width, height, cell_size, salt, octaves=2):
+        """Cộng nhiều tầng value noise để có hình dạng tự nhiên hơn"""
+        noise = np.zeros((height, width), dtype=np.float32)
+        amplitude = 1.0
+        total = 0.0
+        for octave in range(octaves):
+            noise += self.value_noise(x, y, width, height, max(1, cell_size), salt * 16 + octave) * amplitude
+            total += amplitude
+            amplitude *= 0.5
+            cell_size //= 2
+        noise /= total
+        return noise
+        
+    def generate_region(self, x, y, width, height):
+        """Sinh lưới id tile (height, width) cho vùng bắt đầu từ ô (x, y)"""
+        tile_ids = np.full((height, width), GRASS, dtype=np.uint8)
+        xs = np.arange(x, x + width, dtype=np.int64)[None, :]
+        ys = np.arange(y, y + height, dtype=np.int64)[:, None]
+        
+        # Nhiễu nhỏ dùng chung để viền các vùng không đều
+        roughness = self.hash_noise(xs, ys, 1)
+        roughness *= self.edge_roughness
+        
+        # Đóng dấu từng lớp vùng đất/đá/nước theo ngưỡng noise
+        for salt, (tile_id, cell_size, threshold) in enumerate(self.layers, 2):
+            noise = self.fractal_noise(x, y, width, height, cell_size, salt)
+            noise += roughness
+            tile_ids[noise > threshold + self.edge_roughness / 2] = tile_id
+            
+        # Thêm cây (không thể đi qua) - chỉ đặt trên cỏ hoặc đất
+        trees = self.hash_noise(xs, ys, 15) < self.tree_density
+        trees &= (tile_ids == GRASS) | (tile_ids == DIRT)
+        tile_ids[trees] = TREE
+        
+        # Chừa vùng trống quanh ô xuất hiện của người chơi
+        r = self.spawn_clearing
+        spawn_x, spawn_y = self.spawn_cell
+        left = max(spawn_x - r - x, 0)
+        top = max(spawn_y - r - y, 0)
+        right = min(spawn_x + r + 1 - x, width)
+        bottom = min(spawn_y + r + 1 - y, height)
+        if left < right and top < bottom:
+            tile_ids[top:bottom, left:right] = GRASS
+            
+        return tile_ids
+        
+    def generate(self, width, height):
+        """Sinh lưới id tile (height, width) từ gốc tọa độ - cùng seed luôn cho cùng kết quả"""
+        return self.generate_region(0, 0, width, height)
+        
+    def generate_chunk(self, chunk_x, chunk_y, chunk_size):
+        """Sinh một chunk vuông tại tọa độ chunk (chunk_x, chunk_y)"""
+        return self.generate_region(chunk_x * chunk_size, chunk_y * chunk_size, chunk_size, chunk_size)
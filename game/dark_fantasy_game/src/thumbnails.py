@@ -0,0 +1,184 @@
+import os
+import queue
+import struct
+import threading
+import pygame
+from dark_fantasy_game.src.save_writer import write_atomic
+
+# Thumbnails are stored at the size the save/load menu draws them, as raw RGB
+# pixels behind a small header: no decoding or scaling when they are shown
+THUMBNAIL_SIZE = (80, 60)
+THUMBNAIL_MAGIC = b"DFTH"
+THUMBNAIL_HEADER = struct.Struct("<4sHH")  # magic, width, height
+
+def write_thumbnail(path, surface):
+    """Write a surface as a raw thumbnail file (through a temp file)"""
+    width, height = surface.get_size()
+    pixels = pygame.image.tobytes(surface, "RGB")
+    write_atomic(path, lambda f: f.write(THUMBNAIL_HEADER.pack(THUMBNAIL_MAGIC, width, height) + pixels))
+
+def read_thumbnail(path):
+    """Read a raw thumbnail file into a surface"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, width, height = THUMBNAIL_HEADER.unpack_from(data)
+    if magic != THUMBNAIL_MAGIC or len(data) != THUMBNAIL_HEADER.size + width * height * 3:
+        raise ValueError(f"Not a thumbnail file: {path}")
+    return pygame.image.frombytes(data[THUMBNAIL_HEADER.size:], (width, height), "RGB")
+
+class ThumbnailLoader:
+    """Load save slot thumbnails on a background thread the first time they are shown
+    
+    request() is cheap and can be called every time the menu is drawn: each
+    slot is only loaded once until forget() is called for it. Older saves
+    only have a full-size PNG screenshot; it is decoded and scaled to
+    THUMBNAIL_SIZE, and collect_ready() flags it so the caller can have it
+    written as a raw thumbnail for the next start.
+    """
+    def __init__(self):
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.requested = set()
+        self.worker = None
+        
+    def start_worker(self):
+        """Start the loader thread if it is not running"""
+        if self.worker is None or not self.worker.is_alive():
+            self.worker = threading.Thread(target=self.worker_loop, daemon=True)
+            self.worker.start()
+            
+    def stop_worker(self):
+        if self.worker is not None and self.worker.is_alive():
+            self.requests.put(None)
+            self.worker.join(timeout=1.0)
+        self.worker = None
+        
+    def request(self, slot_id, thumbnail_file, screenshot_file):
+        """Queue a slot's thumbnail to be loaded, unless it already was"""
+        if slot_id in self.requested:
+            return
+        self.requested.add(slot_id)
+        self.requests.put((slot_id, thumbnail_file, screenshot_file))
+        self.start_worker()
+        
+    def forget(self, slot_id):
+        """Load the slot's thumbnail again on its next request (after a save or delete)"""
+        self.requested.discard(slot_id)
+        
+    def worker_loop(self):
+        while True:
+            job = self.requests.get()
+            if job is None:
+                break
+            slot_id, thumbnail_file, screenshot_file = job
+            try:
+                self.results.put((slot_id, *self.load(thumbnail_file, screenshot_file)))
+            except Exception as e:
+                print(f"Error loading thumbnail for slot {slot_id}: {e}")
+                self.results.put((slot_id, None, False))
+                
+    def load(self, thumbnail_file, screenshot_file):
+        """Return the thumbnail surface (or None) and whether it came from an old PNG screenshot"""
+        if os.path.exists(thumbnail_file):
+            return read_thumbnail(thumbnail_file), False
+        if os.path.exists(screenshot_file):
+            return pygame.transform.scale(pygame.image.load(screenshot_file), THUMBNAIL_SIZE), True
+        return None, False
+        
+    def collect_ready(self):
+        """Return (slot_id, surface or None, converted) for every thumbnail loaded since the last call"""
+        ready = []
+        while True:
+            try:
+                ready.append(self.results.get_nowait())
+            except queue.Empty:
+                break
+        return ready
+
+def capture_thumbnail(screen, size=(THUMBNAIL_SIZE[0] * 2, THUMBNAIL_SIZE[1] * 2)):
+    """Take a small copy of the screen for a save thumbnail (game thread)
+    
+    The screen is cropped to the thumbnail's aspect ratio with a subsurface
+    (no pixels copied) so fullscreen widescreen modes are not squashed, then
+    nearest-neighbour scaled to twice the thumbnail size. The smooth scale
+    down to THUMBNAIL_SIZE is left to ThumbnailEncoder.
+    """
+    screen_width, screen_height = screen.get_size()
+    crop_width = min(screen_width, screen_height * THUMBNAIL_SIZE[0] // THUMBNAIL_SIZE[1])
+    crop_height = min(screen_height, screen_width * THUMBNAIL_SIZE[1] // THUMBNAIL_SIZE[0])
+    crop = screen.subsurface(((screen_width - crop_width) // 2, (screen_height - crop_height) // 2,
+                              crop_width, crop_height))
+    return pygame.transform.scale(crop, size)
+
+class ThumbnailEncoder:
+    """Scale and write save thumbnails on a background thread
+    
+    The queue is bounded so that saving over and over cannot pile up
+    captures in memory: submit() never blocks and returns False when the
+    queue is full, in which case the caller handles the thumbnail itself.
+    Finished thumbnails come back through collect_ready() together with the
+    token they were submitted with.
+    """
+    def __init__(self, max_queued=2):
+        self.requests = queue.Queue(maxsize=max_queued)
+        self.results = queue.Queue()
+        self.worker = None
+        
+    def start_worker(self):
+        """Start the encoder thread if it is not running"""
+        if self.worker is None or not self.worker.is_alive():
+            self.worker = threading.Thread(target=self.worker_loop, daemon=True)
+            self.worker.start()
+            
+    def stop_worker(self):
+        if self.worker is not None and self.worker.is_alive():
+            self.requests.put(None)
+            self.worker.join(timeout=1.0)
+        self.worker = None
+        
+    def submit(self, token, thumbnail_file, capture):
+        """Queue a capture to be scaled and written to thumbnail_file; False if the queue is full"""
+        try:
+            self.requests.put_nowait((token, thumbnail_file, capture))
+        except queue.Full:
+            return False
+        self.start_worker()
+        return True
+        
+    def wait(self):
+        """Block until every queued thumbnail has been written (used before deleting files)"""
+        if self.worker is not None and self.worker.is_alive():
+            self.requests.join()
+            
+    def worker_loop(self):
+        while True:
+            job = self.requests.get()
+            if job is None:
+                self.requests.task_done()
+                break
+            token, thumbnail_file, capture = job
+            try:
+                self.results.put((token, self.encode(thumbnail_file, capture)))
+            except Exception as e:
+                print(f"Error writing thumbnail: {e}")
+                self.results.put((token, None))
+            self.requests.task_done()
+            
+    def encode(self, thumbnail_file, capture):
+        """Scale a capture to THUMBNAIL_SIZE, write it and return the thumbnail surface"""
+        if capture.get_size() == THUMBNAIL_SIZE:
+            thumbnail = capture
+        else:
+            thumbnail = pygame.transform.smoothscale(capture, THUMBNAIL_SIZE)
+        write_thumbnail(thumbnail_file, thumbnail)
+        return thumbnail
+        
+    def collect_ready(self):
+        """Return (token, surface or None) for every thumbnail written since the last call"""
+        ready = []
+        while True:
+            try:
+                ready.append(self.results.get_nowait())
+            except queue.Empty:
+                break
+        return ready
@@ -0,0 +1,60 @@
+import pygame
+
+class CachedPanel:
+    """Retained-mode UI panel rendered once to an off-screen surface.
+
+    The owner supplies a state key describing everything the panel shows
+    (data, selection, size). The panel is only re-rendered when that key
+    changes or invalidate() is called; otherwise drawing is a single blit.
+    Layout rects produced by the render function are kept in panel-local
+    coordinates and reused for hit-testing.
+    """
+    def __init__(self):
+        self.surface = None
+        self.rects = {}
+        self.state_key = None
+        self.position = (0, 0)
+        self.render_count = 0
+
+    def invalidate(self):
+        """Force the panel to re-render on the next draw"""
+        self.surface = None
+
+    def is_valid(self, state_key):
+        """Check if the cached surface still matches the given state"""
+        return self.surface is not None and self.state_key == state_key
+
+    def update(self, state_key, render):
+        """Re-render the panel if needed. render() must return (surface, rects)"""
+        if not self.is_valid(state_key):
+            self.surface, self.rects = render()
+            self.state_key = state_key
+            self.render_count += 1
+        return self.surface
+
+    def draw(self, screen, x, y, state_key, render):
+        """Draw the cached panel at (x, y), re-rendering only on state change"""
+        surface = self.update(state_key, render)
+        self.position = (x, y)
+        screen.blit(surface, self.position)
+
+    def get_rect(self, name):
+        """Get a cached layout rect in screen coordinates"""
+        rect = self.rects.get(name)
+        if rect is None:
+            return None
+        return rect.move(self.position)
+
+    def get_screen_rects(self):
+        """Get all cached layout rects in screen coordinates"""
+        return {name: rect.move(self.position) for name, rect in self.rects.items()}
+
+    def hit_test(self, pos):
+        """Return the name of the cached layout rect under pos, or None"""
+        if self.surface is None:
+            return None
+        local_pos = (pos[0] - self.position[0], pos[1] - self.position[1])
+        for name, rect in self.rects.items():
+            if rect.collidepoint(local_pos):
+                return name
+        return None
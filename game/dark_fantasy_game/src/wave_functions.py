@@ -1,56 +1,70 @@
+import os
+import json
 from dark_fantasy_game.src.monster import MonsterType
 
-def get_wave_config(wave_number):
-    """Get the configuration for a specific wave"""
-    wave_configs = {
-        1: {
-            "monsters": {
-                MonsterType.GOBLIN: 5,
-                MonsterType.SKELETON: 2
-            },
-            "boss": None
-        },
-        2: {
-            "monsters": {
-                MonsterType.GOBLIN: 8,
-                MonsterType.SKELETON: 5,
-                MonsterType.ORC: 1
-            },
-            "boss": None
-        },
-        3: {
-            "monsters": {
-                MonsterType.GOBLIN: 6,
-                MonsterType.SKELETON: 8,
-                MonsterType.ORC: 3
-            },
-            "boss": MonsterType.DEMON
-        },
-        4: {
-            "monsters": {
-                MonsterType.SKELETON: 10,
-                MonsterType.ORC: 6,
-                MonsterType.DEMON: 2
-            },
-            "boss": None
-        },
-        5: {
-            "monsters": {
-                MonsterType.ORC: 8,
-                MonsterType.DEMON: 5
-            },
-            "boss": MonsterType.DRAGON
+WAVES_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets", "waves.json")
+DEFAULT_SPAWN_DELAY = 45
+
+# Used when the wave file cannot be loaded
+FALLBACK_WAVE = {
+    "spawns": [
+        {"type": "Goblin", "at": 45, "count": 5, "interval": 90},
+        {"type": "Skeleton", "at": 90, "count": 5, "interval": 90}
+    ]
+}
+
+def compile_wave(spec, spawn_delay=DEFAULT_SPAWN_DELAY):
+    """Compile a wave definition into a spawn timeline sorted by time
+
+    Each spawn entry has a type and optional "at" (frames after the wave
+    starts), "count", "interval" (frames between monsters of the entry) and
+    "level" (added to the wave number). Entries with an interval are spread
+    into one timeline event per monster; without one, the whole count spawns
+    as a burst. Timeline events are (offset, monster_type, level, count) tuples.
+    """
+    timeline = []
+    for entry in spec.get("spawns", []):
+        monster_type = MonsterType(entry["type"])
+        offset = entry.get("at", spawn_delay)
+        count = entry.get("count", 1)
+        level = entry.get("level", 0)
+        interval = entry.get("interval")
+        if interval and count > 1:
+            timeline.extend((offset + i * interval, monster_type, level, 1) for i in range(count))
+        else:
+            timeline.append((offset, monster_type, level, count))
+    timeline.sort(key=lambda event: event[0])
+    return tuple(timeline)
+
+def load_wave_schedule(path=WAVES_FILE):
+    """Load and compile every wave in a wave file"""
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        spawn_delay = data.get("spawn_delay", DEFAULT_SPAWN_DELAY)
+        return {
+            "spawn_delay": spawn_delay,
+            "waves": {int(number): compile_wave(spec, spawn_delay) for number, spec in data.get("waves", {}).items()},
+            "default": compile_wave(data.get("default", FALLBACK_WAVE), spawn_delay)
         }
-    }
-    
-    # Return default wave if wave number is not defined
-    if wave_number not in wave_configs:
+    except Exception as e:
+        print(f"Error loading wave schedule: {e}")
         return {
-            "monsters": {
-                MonsterType.GOBLIN: 5,
-                MonsterType.SKELETON: 5
-            },
-            "boss": None
+            "spawn_delay": DEFAULT_SPAWN_DELAY,
+            "waves": {},
+            "default": compile_wave(FALLBACK_WAVE)
         }
-        
-    return wave_configs[wave_number]
+
+wave_schedule = None
+
+def get_wave_schedule():
+    """Compiled wave schedule, loaded on first use"""
+    global wave_schedule
+    if wave_schedule is None:
+        wave_schedule = load_wave_schedule()
+    return wave_schedule
+
+def get_wave_config(wave_number):
+    """Get the compiled spawn timeline for a specific wave"""
+    schedule = get_wave_schedule()
+    return schedule["waves"].get(wave_number, schedule["default"])
@@ -1,10 +1,11 @@
 import pygame
 import random
 import math
-from dark_fantasy_game.src.monster import Monster
-from dark_fantasy_game.src.boss_monster import BossMonster
+from dark_fantasy_game.src.monster_pool import MonsterPool
+from dark_fantasy_game.src.spawn_director import SpawnDirector
+from dark_fantasy_game.src.wave_prefetch import WavePrefetcher
 from dark_fantasy_game.src.monster_types import MonsterType, MonsterAbility, MonsterBehavior
-from dark_fantasy_game.src.wave_functions import get_wave_config
+from dark_fantasy_game.src.wave_functions import get_wave_config, get_wave_schedule, compile_wave
 
 class WaveManager:
     def __init__(self):
@@ -12,46 +13,74 @@ class WaveManager:
         self.max_waves = 5
         self.wave_timer = 0
         self.wave_complete = False
-        self.monsters_to_spawn = []
-        # Tăng thời gian chờ giữa các lần spawn quái
-        self.spawn_delay = 45  # frames between monster spawns
-        self.spawn_timer = 0
+        # Timeline spawn của wave hiện tại: các sự kiện (thời điểm, loại, cấp cộng thêm, số lượng)
+        self.timeline = ()
+        self.timeline_index = 0
+        self.spawned_from_event = 0
+        self.infinity_waves = {}  # Timeline đã sinh cho các wave vô hạn
+        # Khoảng cách mặc định giữa các lần spawn (frame), lấy từ file wave
+        self.spawn_delay = get_wave_schedule()["spawn_delay"]
         # Luôn bật chế độ vô hạn
         self.infinity_mode = True
         # Thêm biến để tự động spawn quái
         self.auto_spawn_timer = 0
         # Giảm thời gian spawn quái xuống để quái xuất hiện thường xuyên hơn
         self.auto_spawn_delay = 120  # Tự động spawn quái mỗi 2 giây (120 frames ở 60fps)
+        # Quái vật chết được trả về kho và tái sử dụng cho lần spawn sau
+        self.monster_pool = MonsterPool()
+        # Giãn nhịp spawn khi game quá tải (GameState báo thời gian cập nhật cho director)
+        self.director = SpawnDirector()
+        # Tạo sẵn quái vật của wave hiện tại và wave kế tiếp trong các frame rảnh
+        self.prefetcher = WavePrefetcher(self.monster_pool)
         
     def start_wave(self, wave_number):
         """Start a new wave"""
         self.current_wave = wave_number
         self.wave_timer = 0
         self.wave_complete = False
-        self.monsters_to_spawn = []
         
-        # Số lượng quái vật trong mỗi wave tăng theo cấp độ
-        monsters_count = 10 + (wave_number - 1) * 2
+        # Timeline đã biên dịch sẵn: bắt đầu wave chỉ cần đặt lại con trỏ
+        self.timeline = self.get_timeline(wave_number)
+        self.timeline_index = 0
+        self.spawned_from_event = 0
         
-        # Get wave configuration
+        # Làm nóng quái vật cho wave này (trước lần spawn đầu) và cho wave kế tiếp
+        self.prefetcher.queue_wave(self.timeline, wave_number)
+        self.prefetcher.queue_wave(self.get_timeline(wave_number + 1), wave_number + 1)
+        
+    def to_dict(self):
+        """Vị trí hiện tại trên timeline của wave để lưu game (timeline được biên dịch lại từ số wave)"""
+        return {
+            "current_wave": self.current_wave,
+            "wave_timer": self.wave_timer,
+            "wave_complete": self.wave_complete,
+            "timeline_index": self.timeline_index,
+            "spawned_from_event": self.spawned_from_event,
+            "auto_spawn_timer": self.auto_spawn_timer,
+            "cadence": self.director.cadence
+        }
+        
+    def restore(self, data):
+        """Tiếp tục wave đã lưu từ đúng vị trí trên timeline"""
+        self.start_wave(data["current_wave"])
+        self.wave_timer = data["wave_timer"]
+        self.wave_complete = data["wave_complete"]
+        self.timeline_index = min(data["timeline_index"], len(self.timeline))
+        self.spawned_from_event = data["spawned_from_event"]
+        self.auto_spawn_timer = data["auto_spawn_timer"]
+        self.director.cadence = data["cadence"]
+        
+    def get_timeline(self, wave_number):
+        """Timeline spawn đã biên dịch của một wave"""
         if self.infinity_mode and wave_number > self.max_waves:
             # Generate infinity wave with increasing difficulty
-            self.generate_infinity_wave(wave_number, monsters_count)
-        else:
-            # Get normal wave configuration
-            wave_config = get_wave_config(wave_number)
-            
-            # Create monster spawn list
-            for monster_type, count in wave_config["monsters"].items():
-                for _ in range(count):
-                    self.monsters_to_spawn.append(monster_type)
-                    
-            # Shuffle monster spawn order
-            random.shuffle(self.monsters_to_spawn)
-            
-            # Add boss at the end if this wave has one
-            if wave_config["boss"]:
-                self.monsters_to_spawn.append(wave_config["boss"])
+            if wave_number not in self.infinity_waves:
+                # Số lượng quái vật trong mỗi wave tăng theo cấp độ
+                monsters_count = 10 + (wave_number - 1) * 2
+                self.infinity_waves[wave_number] = self.generate_infinity_wave(wave_number, monsters_count)
+            return self.infinity_waves[wave_number]
+        # Get normal wave configuration
+        return get_wave_config(wave_number)
         
     def generate_infinity_wave(self, wave_number, monsters_count):
         """Generate an infinity wave with increasing difficulty"""
@@ -64,33 +93,33 @@ class WaveManager:
         # Monster distribution changes with difficulty
         if difficulty <= 3:
             # Early infinity waves: mostly goblins and skeletons
-            self.monsters_to_spawn.extend([MonsterType.GOBLIN] * (base_count // 2))
-            self.monsters_to_spawn.extend([MonsterType.SKELETON] * (base_count // 3))
-            self.monsters_to_spawn.extend([MonsterType.ORC] * (difficulty))
+            counts = [(MonsterType.GOBLIN, base_count // 2), (MonsterType.SKELETON, base_count // 3),
+                      (MonsterType.ORC, difficulty)]
         elif difficulty <= 6:
             # Mid infinity waves: more orcs and some demons
-            self.monsters_to_spawn.extend([MonsterType.GOBLIN] * (base_count // 4))
-            self.monsters_to_spawn.extend([MonsterType.SKELETON] * (base_count // 3))
-            self.monsters_to_spawn.extend([MonsterType.ORC] * (base_count // 3))
-            self.monsters_to_spawn.extend([MonsterType.DEMON] * (difficulty - 2))
+            counts = [(MonsterType.GOBLIN, base_count // 4), (MonsterType.SKELETON, base_count // 3),
+                      (MonsterType.ORC, base_count // 3), (MonsterType.DEMON, difficulty - 2)]
         else:
             # Late infinity waves: all monster types with more powerful ones
-            self.monsters_to_spawn.extend([MonsterType.GOBLIN] * (base_count // 5))
-            self.monsters_to_spawn.extend([MonsterType.SKELETON] * (base_count // 4))
-            self.monsters_to_spawn.extend([MonsterType.ORC] * (base_count // 3))
-            self.monsters_to_spawn.extend([MonsterType.DEMON] * (difficulty - 1))
-        
-        # Add boss every 5 waves in infinity mode
+            counts = [(MonsterType.GOBLIN, base_count // 5), (MonsterType.SKELETON, base_count // 4),
+                      (MonsterType.ORC, base_count // 3), (MonsterType.DEMON, difficulty - 1)]
+            
+        # Xen kẽ các loại quái: mỗi loại rải đều trên cả wave
+        total = sum(count for _, count in counts)
+        duration = total * self.spawn_delay
+        spawns = []
+        for i, (monster_type, count) in enumerate(counts):
+            if count > 0:
+                spawns.append({"type": monster_type.value, "at": self.spawn_delay * (i + 1),
+                               "count": count, "interval": max(1, duration // count)})
+                
+        # Add boss every 5 waves in infinity mode (at the end of the wave)
         if difficulty % 5 == 0:
-            if difficulty % 10 == 0:
-                # Dragon boss every 10 waves
-                self.monsters_to_spawn.append(MonsterType.DRAGON)
-            else:
-                # Demon boss every 5 waves
-                self.monsters_to_spawn.append(MonsterType.DEMON)
-        
-        # Shuffle monster spawn order (but keep boss at the end)
-        random.shuffle(self.monsters_to_spawn)
+            # Dragon boss every 10 waves, demon boss every 5 waves
+            boss = MonsterType.DRAGON if difficulty % 10 == 0 else MonsterType.DEMON
+            spawns.append({"type": boss.value, "at": duration + self.spawn_delay * (len(counts) + 1)})
+            
+        return compile_wave({"spawns": spawns}, self.spawn_delay)
         
     def toggle_infinity_mode(self):
         """Toggle infinity wave mode"""
@@ -101,30 +130,44 @@ class WaveManager:
         
     def update(self):
         """Update wave state and spawn monsters"""
-        # Spawn từ danh sách quái vật
-        if not self.wave_complete and len(self.monsters_to_spawn) > 0:
-            self.spawn_timer += 1
-            if self.spawn_timer >= self.spawn_delay:
-                self.spawn_timer = 0
-                return self.spawn_monster()
+        self.prefetcher.update()
+        
+        # Đã đủ số quái vật tối đa: giữ bộ đếm, spawn tiếp khi có chỗ
+        if not self.director.can_spawn():
+            return None
+            
+        # Spawn theo timeline của wave (director giãn nhịp thì thời gian của wave trôi chậm lại)
+        if not self.wave_complete:
+            self.wave_timer += 1 / self.director.cadence
+            monster = self.spawn_monster()
+            if monster:
+                return monster
         
         # Tự động spawn quái vật mới nếu ở chế độ vô hạn
         if self.infinity_mode:
             self.auto_spawn_timer += 1
-            if self.auto_spawn_timer >= self.auto_spawn_delay:
+            if self.auto_spawn_timer >= self.director.get_delay(self.auto_spawn_delay):
                 self.auto_spawn_timer = 0
                 return self.spawn_random_monster()
             
         return None
         
     def spawn_monster(self):
-        """Spawn a monster from the queue"""
-        if not self.monsters_to_spawn:
+        """Spawn the next monster of the wave timeline if its time has come"""
+        if self.timeline_index >= len(self.timeline):
             self.wave_complete = True
             return None
             
-        monster_type = self.monsters_to_spawn.pop(0)
-        return self.create_monster(monster_type)
+        offset, monster_type, level, count = self.timeline[self.timeline_index]
+        if offset > self.wave_timer:
+            return None
+            
+        # Sự kiện có nhiều quái vật spawn lần lượt qua các frame
+        self.spawned_from_event += 1
+        if self.spawned_from_event >= count:
+            self.timeline_index += 1
+            self.spawned_from_event = 0
+        return self.create_monster(monster_type, self.current_wave + level)
     
     def spawn_random_monster(self):
         """Spawn a random monster based on current wave difficulty"""
@@ -199,29 +242,17 @@ class WaveManager:
         # Mặc định nếu có lỗi
         return self.create_monster(MonsterType.GOBLIN)
         
-    def create_monster(self, monster_type):
+    def create_monster(self, monster_type, level=None):
         """Create a monster of specified type at a random edge position"""
         # Vị trí spawn sẽ được xác định sau trong game_state.spawn_monster_at_valid_location
         # Tạm thời đặt vị trí là (0, 0)
         x = 0
         y = 0
-            
-        # Xác định xem có phải boss không
-        is_boss = monster_type in [
-            MonsterType.DRAGON, 
-            MonsterType.NECROMANCER, 
-            MonsterType.DEMON_LORD, 
-            MonsterType.LICH
-        ]
-        
-        # Tạo boss hoặc quái thường
-        if is_boss:
-            monster = BossMonster(monster_type, x, y, self.current_wave)
-        else:
-            # Create monster with level based on current wave
-            monster = Monster(monster_type, x, y, self.current_wave)
         
-        return monster
+        # Lấy boss hoặc quái thường từ kho, cấp độ theo wave hiện tại (director tăng cấp khi giãn nhịp)
+        if level is None:
+            level = self.current_wave
+        return self.monster_pool.acquire(monster_type, x, y, self.director.get_level(level))
         
     def is_wave_complete(self):
         """Check if the current wave is complete"""
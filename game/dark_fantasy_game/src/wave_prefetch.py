@@ -0,0 +1,42 @@
+import time
+from collections import deque
+
+class WavePrefetcher:
+    """Làm nóng sprite, bảng chỉ số và kho quái vật cho các wave sắp tới
+    
+    Khi một wave bắt đầu, WaveManager đưa timeline của wave đó và wave kế
+    tiếp vào đây. Mỗi frame update() tạo sẵn quái vật vào MonsterPool cho
+    tới khi hết budget_ms, nên sprite sheet được tải và cắt, chỉ số được
+    tính trước khi quái vật đầu tiên của loại đó xuất hiện giữa trận.
+    """
+    def __init__(self, pool, budget_ms=2.0, per_type=4):
+        self.pool = pool
+        self.budget_ms = budget_ms  # Thời gian tối đa dành cho làm nóng mỗi frame
+        self.per_type = per_type  # Số quái vật rảnh cần có sẵn cho mỗi loại
+        self.tasks = deque()  # (loại quái, cấp độ) cần tạo sẵn
+        
+    def queue_wave(self, timeline, wave_number):
+        """Xếp việc làm nóng cho các loại quái trong timeline của một wave"""
+        counts = {}
+        for _, monster_type, level, count in timeline:
+            key = (monster_type, wave_number + level)
+            counts[key] = counts.get(key, 0) + count
+            
+        queued = {}
+        for (monster_type, level), count in counts.items():
+            # Chỉ tạo phần còn thiếu so với số quái vật rảnh đã có (kể cả việc đã xếp hàng)
+            wanted = min(count, self.per_type) - self.pool.get_free_count(monster_type) - queued.get(monster_type, 0)
+            if wanted > 0:
+                self.tasks.extend([(monster_type, level)] * wanted)
+                queued[monster_type] = queued.get(monster_type, 0) + wanted
+                
+    def update(self):
+        """Làm các việc đang chờ cho tới khi hết ngân sách của frame"""
+        if not self.tasks:
+            return
+        start = time.perf_counter()
+        while self.tasks:
+            monster_type, level = self.tasks.popleft()
+            self.pool.prewarm(monster_type, level)
+            if (time.perf_counter() - start) * 1000 >= self.budget_ms:
+                break
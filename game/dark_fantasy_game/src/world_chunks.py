@@ -0,0 +1,204 @@
+import threading
+import queue
+from collections import OrderedDict
+import numpy as np
+
+class Chunk:
+    """Một khối tile vuông của thế giới"""
+    def __init__(self, chunk_x, chunk_y, tile_ids, passable_mask):
+        self.chunk_x = chunk_x
+        self.chunk_y = chunk_y
+        self.tile_ids = tile_ids
+        self.passable_mask = passable_mask
+        
+    @property
+    def memory_size(self):
+        return self.tile_ids.nbytes + self.passable_mask.nbytes
+
+class ChunkManager:
+    """Sinh chunk theo yêu cầu trong luồng nền và giữ chúng trong bộ nhớ đệm LRU
+    
+    Chunk gần camera được yêu cầu trước qua request_area(); luồng nền sinh
+    chúng từ seed. Nếu cần một chunk chưa có (vd. kiểm tra va chạm), chunk
+    được sinh ngay trên luồng chính. Khi vượt ngân sách bộ nhớ, chunk ít dùng
+    nhất bị bỏ đi và sẽ được sinh lại giống hệt khi cần.
+    """
+    def __init__(self, generator, passable_table, chunk_size=64, memory_budget=8 * 1024 * 1024):
+        self.generator = generator
+        self.passable_table = passable_table
+        self.chunk_size = chunk_size
+        self.memory_budget = memory_budget
+        self.max_chunks = max(16, memory_budget // (chunk_size * chunk_size * 2))
+        
+        self.chunks = OrderedDict()  # (chunk_x, chunk_y) -> Chunk, cũ nhất ở đầu
+        self.overrides = {}  # (tile_x, tile_y) -> (tile_id, passable) do game thay đổi
+        self.pending = set()
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.worker = None
+        self.load_count = 0  # Tăng mỗi khi có chunk mới được nạp
+        self.base_grid = None  # Lưới vùng khởi đầu đọc từ cache trên đĩa (memory-map)
+        
+    def start_worker(self):
+        """Khởi động luồng sinh chunk nếu chưa chạy"""
+        if self.worker is None or not self.worker.is_alive():
+            self.worker = threading.Thread(target=self.worker_loop, daemon=True)
+            self.worker.start()
+            
+    def stop_worker(self):
+        """Dừng luồng sinh chunk"""
+        if self.worker is not None and self.worker.is_alive():
+            self.requests.put(None)
+            self.worker.join(timeout=1.0)
+        self.worker = None
+        
+    def set_base_grid(self, base_grid):
+        """Dùng lưới đã sinh sẵn (bắt đầu từ ô (0, 0)) thay vì sinh lại các chunk nằm trong nó"""
+        self.base_grid = base_grid
+        
+    def load_tiles(self, chunk_x, chunk_y):
+        """Lấy id tile của chunk từ lưới cache nếu có, nếu không thì sinh từ seed"""
+        base_grid = self.base_grid
+        left = chunk_x * self.chunk_size
+        top = chunk_y * self.chunk_size
+        if (base_grid is not None and left >= 0 and top >= 0 and
+                left + self.chunk_size <= base_grid.shape[1] and
+                top + self.chunk_size <= base_grid.shape[0]):
+            return np.array(base_grid[top:top + self.chunk_size, left:left + self.chunk_size])
+        return self.generator.generate_chunk(chunk_x, chunk_y, self.chunk_size)
+        
+    def worker_loop(self):
+        while True:
+            key = self.requests.get()
+            if key is None:
+                break
+            try:
+                tile_ids = self.load_tiles(key[0], key[1])
+                self.results.put((key, tile_ids))
+            except Exception as e:
+                print(f"Error generating chunk {key}: {e}")
+                self.results.put((key, None))
+                
+    def collect_ready(self):
+        """Nhận các chunk luồng nền đã sinh xong"""
+        while True:
+            try:
+                key, tile_ids = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending.discard(key)
+            if tile_ids is not None and key not in self.chunks:
+                self.store(key, tile_ids)
+                
+    def store(self, key, tile_ids):
+        """Đưa chunk vào bộ nhớ đệm, áp dụng thay đổi của game và bỏ chunk cũ nếu cần"""
+        passable_mask = self.passable_table[tile_ids]
+        chunk_left = key[0] * self.chunk_size
+        chunk_top = key[1] * self.chunk_size
+        for (tile_x, tile_y), (tile_id, passable) in self.overrides.items():
+            local_x = tile_x - chunk_left
+            local_y = tile_y - chunk_top
+            if 0 <= local_x < self.chunk_size and 0 <= local_y < self.chunk_size:
+                tile_ids[local_y, local_x] = tile_id
+                passable_mask[local_y, local_x] = passable
+                
+        chunk = Chunk(key[0], key[1], tile_ids, passable_mask)
+        self.chunks[key] = chunk
+        self.load_count += 1
+        while len(self.chunks) > self.max_chunks:
+            self.chunks.popitem(last=False)
+        return chunk
+        
+    def get_chunk(self, chunk_x, chunk_y):
+        """Lấy chunk, sinh ngay trên luồng chính nếu chưa có"""
+        key = (chunk_x, chunk_y)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            self.collect_ready()
+            chunk = self.chunks.get(key)
+            if chunk is None:
+                chunk = self.store(key, self.load_tiles(chunk_x, chunk_y))
+        self.chunks.move_to_end(key)
+        return chunk
+        
+    def peek_chunk(self, chunk_x, chunk_y):
+        """Lấy chunk nếu đã được nạp, không sinh mới"""
+        return self.chunks.get((chunk_x, chunk_y))
+        
+    def request_area(self, tile_x, tile_y, radius):
+        """Yêu cầu luồng nền sinh các chunk trong bán kính radius (chunk) quanh ô (tile_x, tile_y)"""
+        self.collect_ready()
+        center_x = tile_x // self.chunk_size
+        center_y = tile_y // self.chunk_size
+        
+        # Chunk gần tâm được yêu cầu trước
+        keys = [(center_x + dx, center_y + dy)
+                for dy in range(-radius, radius + 1)
+                for dx in range(-radius, radius + 1)]
+        keys.sort(key=lambda key: abs(key[0] - center_x) + abs(key[1] - center_y))
+        for key in keys:
+            if key in self.chunks:
+                self.chunks.move_to_end(key)
+            elif key not in self.pending:
+                self.pending.add(key)
+                self.start_worker()
+                self.requests.put(key)
+                
+    def set_tile(self, tile_x, tile_y, tile_id, passable):
+        """Thay đổi một ô; thay đổi được giữ lại kể cả khi chunk bị bỏ khỏi bộ nhớ"""
+        self.overrides[(tile_x, tile_y)] = (tile_id, passable)
+        chunk = self.get_chunk(tile_x // self.chunk_size, tile_y // self.chunk_size)
+        chunk.tile_ids[tile_y % self.chunk_size, tile_x % self.chunk_size] = tile_id
+        chunk.passable_mask[tile_y % self.chunk_size, tile_x % self.chunk_size] = passable
+        
+    def get_window(self, tile_x, tile_y, width, height, load=True, missing=255, layer="tile_ids"):
+        """Ghép lưới (height, width) bắt đầu từ ô (tile_x, tile_y) từ các chunk
+        
+        layer là "tile_ids" hoặc "passable_mask". Nếu load=False, ô thuộc chunk
+        chưa nạp được điền giá trị missing.
+        """
+        dtype = np.uint8 if layer == "tile_ids" else bool
+        window = np.full((height, width), missing, dtype=dtype)
+        size = self.chunk_size
+        first_chunk_x = tile_x // size
+        first_chunk_y = tile_y // size
+        last_chunk_x = (tile_x + width - 1) // size
+        last_chunk_y = (tile_y + height - 1) // size
+        
+        for chunk_y in range(first_chunk_y, last_chunk_y + 1):
+            for chunk_x in range(first_chunk_x, last_chunk_x + 1):
+                chunk = self.get_chunk(chunk_x, chunk_y) if load else self.peek_chunk(chunk_x, chunk_y)
+                if chunk is None:
+                    continue
+                    
+                # Phần giao giữa chunk và cửa sổ
+                left = max(tile_x, chunk_x * size)
+                top = max(tile_y, chunk_y * size)
+                right = min(tile_x + width, (chunk_x + 1) * size)
+                bottom = min(tile_y + height, (chunk_y + 1) * size)
+                window[top - tile_y:bottom - tile_y, left - tile_x:right - tile_x] = \
+                    getattr(chunk, layer)[top - chunk_y * size:bottom - chunk_y * size,
+                                         left - chunk_x * size:right - chunk_x * size]
+        return window
+        
+    def lookup(self, tile_x, tile_y, layer="passable_mask"):
+        """Tra giá trị của nhiều ô cùng lúc (tile_x, tile_y là mảng số nguyên cùng hình dạng)"""
+        size = self.chunk_size
+        chunk_x = tile_x // size
+        chunk_y = tile_y // size
+        dtype = np.uint8 if layer == "tile_ids" else bool
+        result = np.empty(tile_x.shape, dtype=dtype)
+        
+        # Các ô thường chỉ nằm trong một vài chunk: tra theo từng chunk bằng chỉ số mảng
+        for key_y in range(int(chunk_y.min()), int(chunk_y.max()) + 1):
+            for key_x in range(int(chunk_x.min()), int(chunk_x.max()) + 1):
+                inside = (chunk_x == key_x) & (chunk_y == key_y)
+                if not inside.any():
+                    continue
+                chunk = self.get_chunk(key_x, key_y)
+                result[inside] = getattr(chunk, layer)[tile_y[inside] - key_y * size, tile_x[inside] - key_x * size]
+        return result
+        
+    def memory_usage(self):
+        """Tổng bộ nhớ (byte) các chunk đang giữ"""
+        return sum(chunk.memory_size for chunk in self.chunks.values())
@@ -0,0 +1,73 @@
+import sys
+import os
+import math
+import random
+import time
+import cProfile
+import pstats
+
+# Add the game directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Run without opening a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from dark_fantasy_game.src.map import Map
+from dark_fantasy_game.src.player import Player
+from dark_fantasy_game.src.monster import Monster, MonsterType
+from dark_fantasy_game.src.ai_scheduler import AIScheduler
+
+SEED = 12345
+MONSTER_COUNT = 300
+MAX_DISTANCE = 2500
+FRAMES = 300
+
+def create_world():
+    """Build a map, a player at the spawn point and monsters scattered around it"""
+    random.seed(SEED)
+    game_map = Map(200, 200, seed=SEED)
+    player = Player(game_map.width * game_map.tile_size / 2, game_map.height * game_map.tile_size / 2)
+    monsters = []
+    for _ in range(MONSTER_COUNT):
+        angle = random.uniform(0, 2 * math.pi)
+        distance = random.uniform(100, MAX_DISTANCE)
+        monster_type = random.choice([MonsterType.GOBLIN, MonsterType.SKELETON, MonsterType.ORC])
+        monsters.append(Monster(monster_type, player.x + distance * math.cos(angle),
+                                player.y + distance * math.sin(angle)))
+    return game_map, player, monsters
+
+def run(scheduler, game_map, player, monsters):
+    """Run the monster AI for FRAMES frames with the player standing still"""
+    for _ in range(FRAMES):
+        game_map.flow_field.update(player.x + player.width / 2, player.y + player.height / 2)
+        game_map.pathfinder.update()
+        scheduler.update(monsters, player, game_map)
+
+def time_run(scheduler):
+    """Return the average frame time for a fresh world with the given scheduler"""
+    game_map, player, monsters = create_world()
+    start = time.perf_counter()
+    run(scheduler, game_map, player, monsters)
+    return (time.perf_counter() - start) / FRAMES
+
+if __name__ == "__main__":
+    pygame.init()
+    pygame.display.set_mode((800, 600))
+    every_frame = time_run(AIScheduler(near_distance=float("inf"), far_distance=float("inf")))
+    tiered = time_run(AIScheduler())
+    print(f"{MONSTER_COUNT} monsters, full AI every frame: {every_frame * 1000:.2f} ms/frame")
+    print(f"{MONSTER_COUNT} monsters, distance tiers: {tiered * 1000:.2f} ms/frame")
+    
+    game_map, player, monsters = create_world()
+    scheduler = AIScheduler()
+    
+    profiler = cProfile.Profile()
+    profiler.enable()
+    run(scheduler, game_map, player, monsters)
+    profiler.disable()
+    
+    print(f"Monsters per tier (near, mid, far): {scheduler.tier_counts}")
+    print(f"Updated last frame (near, mid, far): {scheduler.update_counts}")
+    stats = pstats.Stats(profiler)
+    stats.sort_stats("cumulative").print_stats("ai_scheduler|update_behavior|update_coarse|update_state|steering")
@@ -0,0 +1,207 @@
+import sys
+import os
+import csv
+import math
+import random
+import shutil
+import tempfile
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Add the game directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Run without opening a window or audio device
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+
+FPS = 60
+FIELDS = ["session", "seed", "map_seed", "character_class", "survived", "time_to_death", "wave_reached",
+          "player_level", "kills", "score", "damage_dealt", "dps", "xp_curve"]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run headless bot sessions in parallel and collect balance statistics")
+    parser.add_argument("--sessions", type=int, default=200, help="number of simulated sessions")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    parser.add_argument("--minutes", type=float, default=5.0, help="game time limit per session")
+    parser.add_argument("--seed", type=int, default=12345, help="base seed; session i uses seed + i")
+    parser.add_argument("--maps", type=int, default=8, help="number of distinct maps (each map is cached on disk)")
+    parser.add_argument("--output", default="balance_results.csv", help="CSV file, one row per finished session")
+    parser.add_argument("--exp-growth", type=float, help="override ExperienceSystem.exp_growth_factor")
+    parser.add_argument("--drop-chance", type=float, help="override GameState.item_drop_chance")
+    parser.add_argument("--level-scaling", type=float, help="override the per-level monster stat scaling")
+    parser.add_argument("--auto-spawn-delay", type=int, help="override WaveManager.auto_spawn_delay (frames)")
+    parser.add_argument("--waves", help="wave definition file to use instead of assets/waves.json")
+    return parser.parse_args()
+
+def init_worker(overrides):
+    """Set up pygame and the tuning overrides once per worker process"""
+    import pygame
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    if overrides.get("level_scaling") is not None:
+        # Must be set before any stat template is built; the spawn director keeps its own copy
+        from dark_fantasy_game.src import monster_types, spawn_director
+        monster_types.LEVEL_SCALING = overrides["level_scaling"]
+        spawn_director.LEVEL_SCALING = overrides["level_scaling"]
+    if overrides.get("waves"):
+        from dark_fantasy_game.src import wave_functions
+        wave_functions.wave_schedule = wave_functions.load_wave_schedule(overrides["waves"])
+
+def steer_bot(game_state):
+    """Scripted player: chase the nearest monster and attack it, back off and grab items when hurt"""
+    player = game_state.player
+    center_x = player.x + player.width / 2
+    center_y = player.y + player.height / 2
+    hurt = player.stats.current_health < player.stats.max_health * 0.35
+
+    target = None
+    nearest = float("inf")
+    for monster in game_state.monsters:
+        distance = math.hypot(monster.x + monster.width / 2 - center_x, monster.y + monster.height / 2 - center_y)
+        if distance < nearest:
+            target, nearest = monster, distance
+
+    move_x = move_y = 0
+    player.attacking = False
+    if hurt and game_state.items:
+        item = min(game_state.items, key=lambda item: math.hypot(item.x - center_x, item.y - center_y))
+        move_x, move_y = item.x - center_x, item.y - center_y
+    elif target is not None:
+        dx = target.x + target.width / 2 - center_x
+        dy = target.y + target.height / 2 - center_y
+        if hurt and nearest < player.attack_range * 2:
+            move_x, move_y = -dx, -dy
+        elif nearest > player.attack_range * 0.7:
+            move_x, move_y = dx, dy
+        player.attacking = nearest <= player.attack_range
+
+    player.moving_left = move_x < -4
+    player.moving_right = move_x > 4
+    player.moving_up = move_y < -4
+    player.moving_down = move_y > 4
+
+def run_session(session, seed, map_seed, minutes, overrides):
+    """Play one headless session with the bot and return its summary row"""
+    from dark_fantasy_game.src.game_state import GameState, State
+    from dark_fantasy_game.src.stats import CharacterClass
+
+    game_state = GameState(seed=map_seed)
+    random.seed(seed)
+
+    # Never touch the player's saves: no autosave, and anything else goes to a throwaway directory
+    save_directory = tempfile.mkdtemp(prefix="dfg_sim_saves_")
+    game_state.save_system.save_directory = save_directory
+    game_state.save_system.autosave.enabled = False
+
+    character_class = CharacterClass.WARRIOR if seed % 2 == 0 else CharacterClass.MAGE
+    game_state.player.set_class(list(CharacterClass).index(character_class))
+    if overrides.get("exp_growth") is not None:
+        game_state.player.exp_system.exp_growth_factor = overrides["exp_growth"]
+    if overrides.get("drop_chance") is not None:
+        game_state.item_drop_chance = overrides["drop_chance"]
+    if overrides.get("auto_spawn_delay") is not None:
+        game_state.wave_manager.auto_spawn_delay = overrides["auto_spawn_delay"]
+    game_state.state = State.PLAYING
+    game_state.start_game()
+
+    max_frames = int(minutes * 60 * FPS)
+    xp_curve = []
+    frame = 0
+    try:
+        while frame < max_frames and game_state.state == State.PLAYING:
+            steer_bot(game_state)
+            game_state.update()
+            frame += 1
+            if frame % (60 * FPS) == 0:
+                xp_curve.append(game_state.player.exp_system.level)
+    finally:
+        game_state.save_system.writer.stop_worker()
+        shutil.rmtree(save_directory, ignore_errors=True)
+
+    seconds = frame / FPS
+    # Kills and damage are counted by GameState where the player's attacks land
+    kills = game_state.total_kills
+    damage_dealt = game_state.damage_dealt
+    survived = game_state.state == State.PLAYING
+    return {
+        "session": session,
+        "seed": seed,
+        "map_seed": map_seed,
+        "character_class": character_class.name,
+        "survived": int(survived),
+        "time_to_death": "" if survived else round(seconds, 2),
+        "wave_reached": game_state.level,
+        "player_level": game_state.player.exp_system.level,
+        "kills": kills,
+        "score": game_state.score,
+        "damage_dealt": round(damage_dealt, 1),
+        "dps": round(damage_dealt / seconds, 3) if seconds else 0,
+        "xp_curve": ";".join(str(level) for level in xp_curve),
+    }
+
+def print_summary(rows, minutes):
+    """Aggregate finished sessions into time-to-death, wave, XP curve and DPS statistics"""
+    def percentiles(values):
+        p10, p50, p90 = np.percentile(values, [10, 50, 90])
+        return f"p10 {p10:.1f}  median {p50:.1f}  p90 {p90:.1f}  mean {np.mean(values):.1f}"
+
+    deaths = [row["time_to_death"] for row in rows if not row["survived"]]
+    print(f"\n{len(rows)} sessions, {len(deaths)} deaths within {minutes:g} minutes")
+    if deaths:
+        print(f"Time to death (s): {percentiles(deaths)}")
+    waves = np.bincount([row["wave_reached"] for row in rows])
+    print("Wave reached: " + ", ".join(f"{wave}: {count}" for wave, count in enumerate(waves) if count))
+
+    curves = [[int(level) for level in row["xp_curve"].split(";")] for row in rows if row["xp_curve"]]
+    if curves:
+        length = max(len(curve) for curve in curves)
+        means = []
+        for minute in range(length):
+            levels = [curve[minute] for curve in curves if len(curve) > minute]
+            means.append(f"{minute + 1}m: {np.mean(levels):.2f} (n={len(levels)})")
+        print("Player level by minute: " + ", ".join(means))
+
+    for character_class in sorted({row["character_class"] for row in rows}):
+        dps = [row["dps"] for row in rows if row["character_class"] == character_class]
+        print(f"DPS {character_class}: {percentiles(dps)}")
+
+if __name__ == "__main__":
+    args = parse_args()
+    overrides = {
+        "exp_growth": args.exp_growth,
+        "drop_chance": args.drop_chance,
+        "level_scaling": args.level_scaling,
+        "auto_spawn_delay": args.auto_spawn_delay,
+        "waves": args.waves,
+    }
+
+    rows = []
+    with open(args.output, "w", newline="") as f, \
+            ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker, initargs=(overrides,)) as pool:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        futures = []
+        for session in range(args.sessions):
+            seed = args.seed + session
+            map_seed = args.seed + session % args.maps
+            futures.append(pool.submit(run_session, session, seed, map_seed, args.minutes, overrides))
+
+        # Write each session as soon as it finishes so partial runs are still usable
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                row = future.result()
+            except Exception as e:
+                print(f"Error in simulated session: {e}")
+                continue
+            writer.writerow(row)
+            f.flush()
+            rows.append(row)
+            print(f"\r{done}/{args.sessions} sessions", end="", flush=True)
+
+    if rows:
+        print_summary(rows, args.minutes)
+    print(f"Results written to {args.output}")